@@ -0,0 +1,407 @@
+"""
+Query count benchmarks for the REST API.
+
+A dataset is seeded with django_dynamic_fixture, and every list endpoint registered
+on the shared API router is requested, along with the detail endpoint of its first
+result. Query count and response size of each endpoint are compared against a
+baseline file, so N+1 queries and other regressions are caught by the test suite.
+Wall time is measured and reported by the benchmark_api command, but is not
+compared, since it depends on the machine.
+The baseline is written with 'manage.py benchmark_api --write-baseline'.
+"""
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+
+from chunks.models import Chunk
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, get_resolver, reverse
+from django.utils import timezone
+from django_dynamic_fixture import G
+from oidc_provider.models import Client as OIDCClient
+from oidc_provider.models import ResponseType, UserConsent
+
+from apps.api.utils import SharedAPIRootRouter
+from apps.approval.models import (
+    CommitteeApplication,
+    CommitteeApplicationPeriod,
+    MembershipApproval,
+)
+from apps.article.models import Article
+from apps.authentication.constants import GroupType, RoleType
+from apps.authentication.models import (
+    Email,
+    GroupMember,
+    GroupRole,
+    OnlineGroup,
+    OnlineUser,
+    Position,
+    SpecialPosition,
+)
+from apps.careeropportunity.models import CareerOpportunity
+from apps.companyprofile.models import Company
+from apps.contribution.models import Repository
+from apps.events.constants import EventType
+from apps.events.models import (
+    AttendanceEvent,
+    Attendee,
+    CompanyEvent,
+    Event,
+    Extras,
+    FieldOfStudyRule,
+    GradeRule,
+    RuleBundle,
+    UserGroupRule,
+)
+from apps.feedback.models import (
+    Feedback,
+    FeedbackRelation,
+    GenericSurvey,
+    MultipleChoiceRelation,
+    RatingQuestion,
+    TextQuestion,
+)
+from apps.gallery.models import ResponsiveImage
+from apps.hobbygroups.models import Hobby
+from apps.inventory.models import Item
+from apps.mailinglists.models import MailEntity, MailGroup
+from apps.marks.models import MarkUser, RuleAcceptance, Suspension
+from apps.notifications.models import Notification
+from apps.notifications.models import Permission as NotificationPermission
+from apps.notifications.models import Subscription
+from apps.offline.models import Issue
+from apps.payment import status
+from apps.payment.models import (
+    Payment,
+    PaymentDelay,
+    PaymentPrice,
+    PaymentRelation,
+    PaymentTransaction,
+)
+from apps.payment.transaction_constants import TransactionSource
+from apps.photoalbum.models import Album, Photo, UserTag
+from apps.profiles.models import Privacy
+from apps.resourcecenter.models import Resource
+from apps.shop.models import OrderLine as ShopOrderLine
+from apps.splash.models import SplashEvent
+from apps.webshop.models import Order as WebshopOrder
+from apps.webshop.models import OrderLine as WebshopOrderLine
+from apps.webshop.models import Product
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "query_baseline.json")
+
+# The baseline is recorded on a dataset small enough for the test suite,
+# which is still large enough to fill the first page of every endpoint
+TEST_DATASET = {
+    "users": 30,
+    "events": 15,
+    "attendees_per_event": 5,
+    "transactions_per_user": 2,
+}
+REALISTIC_DATASET = {
+    "users": 3000,
+    "events": 300,
+    "attendees_per_event": 20,
+    "transactions_per_user": 2,
+}
+
+# Regressions are only reported beyond these margins, since generated data varies.
+# The query margin is absolute, so one more query per row of a page is always caught,
+# also on endpoints which already run many queries.
+QUERY_MARGIN = 2
+SIZE_MARGIN = 0.25
+
+Metrics = Dict[str, float]
+
+
+def create_user(username: str) -> OnlineUser:
+    user = G(
+        OnlineUser, username=username, ntnu_username=username, phone_number="12345678"
+    )
+    G(Email, user=user)
+    G(Privacy, user=user)
+    return user
+
+
+def create_admin(username: str = "api_benchmark_admin") -> OnlineUser:
+    """
+    A superuser, which is allowed to list the objects of every endpoint.
+    """
+    user = create_user(username)
+    user.is_superuser = True
+    user.is_staff = True
+    user.save()
+    return user
+
+
+def seed_dataset(
+    owner: OnlineUser,
+    users: int,
+    events: int,
+    attendees_per_event: int,
+    transactions_per_user: int,
+):
+    """
+    Create users with wallet transactions, and events with attendees, companies,
+    career opportunities and feedback.
+    The owner is the user requesting the endpoints. Endpoints which only list the
+    objects of the requesting user are filled with objects owned by it, and it
+    attends every event, so there is feedback for it to answer.
+    """
+    now = timezone.now()
+    created_users = [create_user(f"api-benchmark-{index}") for index in range(users)]
+    for user in created_users:
+        for _ in range(transactions_per_user):
+            PaymentTransaction.objects.create(
+                user=user,
+                amount=100,
+                source=TransactionSource.CASH,
+                status=status.SUCCEEDED,
+                create_receipt=False,
+            )
+
+    organizer = G(Group)
+    G(OnlineGroup, group=organizer, group_type=GroupType.COMMITTEE)
+    companies = [
+        G(Company, image=G(ResponsiveImage)) for _ in range(max(events // 3, 1))
+    ]
+    for company in companies:
+        G(
+            CareerOpportunity,
+            company=company,
+            start=now - timezone.timedelta(days=1),
+            end=now + timezone.timedelta(days=30),
+        )
+
+    feedback = G(Feedback)
+    rule_bundle = G(
+        RuleBundle,
+        field_of_study_rules=[G(FieldOfStudyRule)],
+        grade_rules=[G(GradeRule)],
+        user_group_rules=[G(UserGroupRule, group=organizer)],
+    )
+    extras = [G(Extras) for _ in range(2)]
+    for index in range(events):
+        event = G(Event, event_type=EventType.BEDPRES, organizer=organizer)
+        attendance_event = G(
+            AttendanceEvent, event=event, rule_bundles=[rule_bundle], extras=extras
+        )
+        G(CompanyEvent, company=companies[index % len(companies)], event=event)
+        for offset in range(min(attendees_per_event, users)):
+            user = created_users[(index * attendees_per_event + offset) % users]
+            G(Attendee, event=attendance_event, user=user)
+        G(Attendee, event=attendance_event, user=owner, attended=True)
+        FeedbackRelation.objects.create(
+            feedback=feedback,
+            content_object=event,
+            deadline=(now + timezone.timedelta(days=7)).date(),
+            active=True,
+        )
+
+    _seed_owned_objects(owner, organizer, attendance_event, now)
+    _seed_content(owner, now)
+    return created_users
+
+
+def _seed_owned_objects(
+    owner: OnlineUser, organizer: Group, attendance_event: AttendanceEvent, now
+):
+    """
+    Objects of the endpoints which only list the objects of the requesting user.
+    """
+    for _ in range(2):
+        PaymentTransaction.objects.create(
+            user=owner,
+            amount=100,
+            source=TransactionSource.CASH,
+            status=status.SUCCEEDED,
+            create_receipt=False,
+        )
+    payment = G(
+        Payment,
+        object_id=attendance_event.pk,
+        content_type=ContentType.objects.get_for_model(AttendanceEvent),
+    )
+    G(PaymentPrice, payment=payment)
+    G(PaymentRelation, payment=payment, user=owner)
+    G(
+        PaymentDelay,
+        payment=payment,
+        user=owner,
+        valid_to=now + timezone.timedelta(days=1),
+    )
+
+    membership = G(GroupMember, user=owner, group=G(OnlineGroup, group=organizer))
+    membership.roles.add(GroupRole.get_for_type(RoleType.LEADER))
+    G(Position, user=owner)
+    G(SpecialPosition, user=owner)
+    G(MembershipApproval, applicant=owner)
+    G(RuleAcceptance, user=owner)
+    G(MarkUser, user=owner)
+    G(Suspension, user=owner)
+    G(Notification, recipient=owner, permission=G(NotificationPermission))
+    G(Subscription, user=owner)
+    G(UserConsent, user=owner, client=G(OIDCClient, owner=owner))
+    G(ShopOrderLine, user=owner)
+    G(WebshopOrder, order_line=G(WebshopOrderLine, user=owner))
+
+
+def _seed_content(owner: OnlineUser, now):
+    """
+    Objects of the endpoints which list the same objects for every user.
+    """
+    published = now - timezone.timedelta(days=1)
+    G(Article, published_date=published)
+    album = G(Album, published_date=published)
+    G(UserTag, user=owner, photo=G(Photo, album=album, image=G(ResponsiveImage)))
+    G(CommitteeApplicationPeriod)
+    G(CommitteeApplication)
+    G(GenericSurvey)
+    G(TextQuestion)
+    G(RatingQuestion)
+    G(MultipleChoiceRelation)
+    G(Hobby, active=True)
+    G(Issue, image=G(ResponsiveImage))
+    G(MailEntity)
+    G(MailGroup)
+    G(Repository)
+    G(Resource)
+    G(SplashEvent)
+    G(Chunk)
+    G(Item, available=True)
+    G(Product, active=True)
+    # Created by a data migration, which the test database does not run
+    ResponseType.objects.get_or_create(value="code")
+
+
+def get_endpoints() -> List[Tuple[str, str]]:
+    """
+    The basename and url of every list endpoint on the shared API router.
+    Nested endpoints which need url arguments are skipped.
+    """
+    # Resolving the urls imports every url module, which registers the viewsets
+    get_resolver().url_patterns
+    endpoints = []
+    for _prefix, viewset, basename in SharedAPIRootRouter.shared_router.registry:
+        if not hasattr(viewset, "list"):
+            continue
+        try:
+            endpoints.append((basename, reverse(f"{basename}-list")))
+        except NoReverseMatch:
+            continue
+    return sorted(endpoints)
+
+
+def measure(client, url: str) -> Tuple[Metrics, object]:
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = client.get(url, HTTP_ACCEPT="application/json")
+        elapsed = time.perf_counter() - start
+
+    metrics = {
+        "status": response.status_code,
+        "queries": len(queries),
+        "time": round(elapsed, 4),
+        "size": len(response.content),
+        "rows": len(_get_rows(response)),
+    }
+    return metrics, response
+
+
+def _get_rows(response) -> list:
+    """
+    Objects in a response, where an endpoint returning a single object has one row.
+    """
+    if response.status_code != 200:
+        return []
+    data = response.json()
+    if isinstance(data, dict):
+        return data.get("results", [data])
+    if not isinstance(data, list):
+        return []
+    return data
+
+
+def _get_first_id(response):
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    if isinstance(data, dict):
+        data = data.get("results")
+    if not data or not isinstance(data, list) or not isinstance(data[0], dict):
+        return None
+    return data[0].get("id", data[0].get("pk"))
+
+
+def run_benchmark(client) -> Dict[str, Metrics]:
+    """
+    Request every list endpoint and the detail endpoint of its first result.
+    """
+    results = {}
+    for basename, url in get_endpoints():
+        results[f"{basename}-list"], response = measure(client, url)
+
+        first_id = _get_first_id(response)
+        if first_id is None:
+            continue
+        try:
+            detail_url = reverse(f"{basename}-detail", args=[first_id])
+        except NoReverseMatch:
+            continue
+        results[f"{basename}-detail"], _ = measure(client, detail_url)
+    return results
+
+
+def compare_to_baseline(
+    results: Dict[str, Metrics], baseline: Dict[str, Metrics]
+) -> List[str]:
+    """
+    Describe every endpoint which runs more queries or responds with more data than
+    in the baseline, beyond the margins. Endpoints which are not in the baseline are
+    not compared.
+    """
+    regressions = []
+    for name, metrics in sorted(results.items()):
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+
+        if expected["status"] < 400 <= metrics["status"]:
+            regressions.append(
+                f"{name} responded with {metrics['status']}, was {expected['status']}"
+            )
+            continue
+
+        if metrics["queries"] > expected["queries"] + QUERY_MARGIN:
+            regressions.append(
+                f"{name} ran {metrics['queries']} queries, was {expected['queries']}"
+            )
+
+        allowed_size = expected["size"] * (1 + SIZE_MARGIN)
+        if metrics["size"] > allowed_size:
+            regressions.append(
+                f"{name} responded with {metrics['size']} bytes, was {expected['size']}"
+            )
+    return regressions
+
+
+def load_baseline(path: str = BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def write_baseline(dataset: dict, results: Dict[str, Metrics], path=BASELINE_PATH):
+    with open(path, "w") as baseline_file:
+        json.dump(
+            {"dataset": dataset, "endpoints": results},
+            baseline_file,
+            indent=2,
+            sort_keys=True,
+        )
+        baseline_file.write("\n")
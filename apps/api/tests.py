@@ -1,6 +1,8 @@
+from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 
+from apps.api import benchmark
 from apps.online_oidc_provider.test import OIDCTestCase
 
 
@@ -42,3 +44,73 @@ class SwaggerUITestCase(OIDCTestCase):
     def test_can_generate_schema_as_regular_user(self):
         response = self.client.get(self.url, **self.headers)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class BaselineComparisonTestCase(TestCase):
+    def test_only_queries_and_size_are_compared(self):
+        baseline = {
+            "events-list": {"status": 200, "queries": 10, "time": 0.01, "size": 100}
+        }
+        slower = {"events-list": {"status": 200, "queries": 10, "time": 5, "size": 100}}
+        more_queries = {
+            "events-list": {"status": 200, "queries": 25, "time": 0.01, "size": 100}
+        }
+
+        self.assertEqual(benchmark.compare_to_baseline(slower, baseline), [])
+        self.assertEqual(
+            benchmark.compare_to_baseline(more_queries, baseline),
+            ["events-list ran 25 queries, was 10"],
+        )
+
+    def test_one_more_query_per_row_is_caught_on_busy_endpoints(self):
+        baseline = {
+            "events-list": {"status": 200, "queries": 184, "time": 0.1, "size": 100}
+        }
+        # One more query for each of the ten rows of a page
+        per_row = {
+            "events-list": {"status": 200, "queries": 194, "time": 0.1, "size": 100}
+        }
+        within_margin = {
+            "events-list": {"status": 200, "queries": 186, "time": 0.1, "size": 100}
+        }
+
+        self.assertEqual(
+            benchmark.compare_to_baseline(per_row, baseline),
+            ["events-list ran 194 queries, was 184"],
+        )
+        self.assertEqual(benchmark.compare_to_baseline(within_margin, baseline), [])
+
+
+class QueryCountRegressionTestCase(TestCase):
+    """
+    Compare query counts and response sizes of the API against the recorded baseline.
+    """
+
+    def setUp(self):
+        self.baseline = benchmark.load_baseline()
+        if self.baseline is None:
+            self.skipTest(
+                "No API query baseline, "
+                "record it with 'manage.py benchmark_api --write-baseline'"
+            )
+        admin = benchmark.create_admin()
+        benchmark.seed_dataset(admin, **self.baseline["dataset"])
+        self.client.force_login(admin)
+
+    def test_api_does_not_regress_from_baseline(self):
+        results = benchmark.run_benchmark(self.client)
+
+        regressions = benchmark.compare_to_baseline(results, self.baseline["endpoints"])
+
+        self.assertEqual(regressions, [], "\n".join(regressions))
+
+    def test_baseline_list_endpoints_are_not_empty(self):
+        empty = [
+            name
+            for name, metrics in self.baseline["endpoints"].items()
+            if name.endswith("-list")
+            and metrics["status"] == 200
+            and metrics["rows"] == 0
+        ]
+
+        self.assertEqual(empty, [], "List endpoints without rows in the baseline")
@@ -10,6 +10,18 @@ class ArticleConfig(AppConfig):
 
         from watson import search as watson
 
+        import apps.article.signals  # noqa: F401
         from apps.article.models import Article
+        from utils import search
 
         watson.register(Article)
+        search.register(
+            Article,
+            fields=[
+                ("heading", "A"),
+                ("ingress_short", "B"),
+                ("ingress", "B"),
+                ("content", "C"),
+            ],
+            config="norwegian",
+        )
@@ -1,5 +1,6 @@
 import django_filters
-from watson import search as watson_search
+
+from utils.search import SearchFilter
 
 
 class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
@@ -13,9 +14,4 @@ class ArticlesFilter(django_filters.FilterSet):
     )
     tags = django_filters.CharFilter(field_name="tags__name")
     tags_in = CharInFilter(field_name="tags__name", lookup_expr="in")
-    query = django_filters.CharFilter(method="watson_filter")
-
-    def watson_filter(self, queryset, name, value):
-        if value and value != "":
-            queryset = watson_search.filter(queryset, value)
-        return queryset
+    query = SearchFilter()
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from utils.search import AddSearchVector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0013_auto_20200229_1046"),
+    ]
+
+    operations = [
+        AddSearchVector(
+            model_name="article",
+            fields=[
+                ("heading", "A"),
+                ("ingress_short", "B"),
+                ("ingress", "B"),
+                ("content", "C"),
+            ],
+            config="norwegian",
+        ),
+    ]
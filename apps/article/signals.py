@@ -0,0 +1,22 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from apps.article.models import Article
+from apps.article.utils import invalidate_archive_sidebar
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_archive_sidebar_on_change(sender, **kwargs):
+    invalidate_archive_sidebar()
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def invalidate_archive_sidebar_on_tagging(sender, instance: TaggedItem, **kwargs):
+    if instance.content_type_id == ContentType.objects.get_for_model(Article).id:
+        invalidate_archive_sidebar()
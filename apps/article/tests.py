@@ -2,6 +2,7 @@ import datetime
 import logging
 
 import pytz
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django_dynamic_fixture import G
@@ -9,6 +10,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from apps.article.models import Article
+from apps.article.utils import get_archive_sidebar
 
 
 class ArticleTests(TestCase):
@@ -89,6 +91,53 @@ class ArticleURLTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+class ArchiveSidebarTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @staticmethod
+    def create_article(year, month, tags=()):
+        published_date = datetime.datetime(year, month, 10, 12, 0, 0, 0, pytz.UTC)
+        article = G(Article, created_date=published_date, published_date=published_date)
+        article.tags.add(*tags)
+        return article
+
+    def test_dates_are_grouped_by_year_and_month(self):
+        self.create_article(2013, 3)
+        self.create_article(2013, 1)
+        self.create_article(2013, 3)
+        self.create_article(2014, 12)
+
+        dates = get_archive_sidebar()["dates"]
+
+        self.assertEqual(
+            list(dates.items()), [("2014", ["Desember"]), ("2013", ["Januar", "Mars"])],
+        )
+
+    def test_tags_are_ordered_by_popularity(self):
+        self.create_article(2013, 1, tags=["bedpres", "kurs"])
+        self.create_article(2013, 2, tags=["kurs"])
+
+        tags = get_archive_sidebar()["tags"]
+
+        self.assertEqual(
+            [(tag.name, count) for tag, count in tags], [("kurs", 2), ("bedpres", 1)]
+        )
+
+    def test_sidebar_is_cached_until_articles_change(self):
+        self.create_article(2013, 1)
+        get_archive_sidebar()
+
+        with self.assertNumQueries(0):
+            get_archive_sidebar()
+
+        self.create_article(2015, 6, tags=["ny"])
+        sidebar = get_archive_sidebar()
+
+        self.assertIn("2015", sidebar["dates"])
+        self.assertEqual(sidebar["tags"][0][0].name, "ny")
+
+
 class ArticleAPIURLTestCase(APITestCase):
     def test_article_list_empty(self):
         url = reverse("article-list")
@@ -1,4 +1,15 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
 from filebrowser.settings import VERSIONS
+from taggit.models import Tag, TaggedItem
+
+from apps.article.models import Article
+
+ARCHIVE_SIDEBAR_CACHE_KEY = "article:archive_sidebar"
+ARCHIVE_SIDEBAR_TIMEOUT = 60 * 60 * 24
 
 MONTH_STRINGS = {
     "1": "Januar",
@@ -28,35 +39,76 @@ def find_image_versions(article):
 
 
 def create_article_filters(articles):
-    rev_month_strings = dict((v, k) for k, v in MONTH_STRINGS.items())
+    """
+    The years and months with published articles, as a dict from year to month names.
+    Years are ordered newest first, and months in calendar order.
+    """
+    months = (
+        articles.annotate(month=TruncMonth("published_date"))
+        .order_by()
+        .values_list("month", flat=True)
+        .distinct()
+    )
 
-    # For creating the date filters.
     dates = {}
-    for article in articles:
-        d_year = str(article.published_date.year)
-        if d_year not in dates:
-            dates[d_year] = []
-        dates = _create_months(article, dates)
-    # Now sort months
-    for year in dates:
-        sorted_months = [""] * 12
-        for month in dates[year]:
-            sorted_months[int(rev_month_strings[month]) - 1] = month
-        remove_these = []
-        for n, m in enumerate(sorted_months):
-            if m == "":
-                remove_these.append(n)
-        for i in reversed(remove_these):
-            del sorted_months[i]
-        dates[year] = sorted_months
+    for month in sorted(months, key=lambda m: (-m.year, m.month)):
+        dates.setdefault(str(month.year), []).append(MONTH_STRINGS[str(month.month)])
     return dates
 
 
-def _create_months(article, dates):
-    d_year = str(article.published_date.year)
-    d_month = str(article.published_date.month)
-    for y in dates:
-        if d_year == y:
-            if MONTH_STRINGS[d_month] not in dates[d_year]:
-                dates[d_year].append(MONTH_STRINGS[d_month])
-    return dates
+def get_popular_tags(limit=30, name=None):
+    """
+    The most used tags on articles, as a list of (tag, count) tuples.
+    """
+    queryset = TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(Article)
+    )
+    if name:
+        queryset = queryset.filter(tag__name=name)
+    counts = (
+        queryset.values("tag_id")
+        .annotate(count=Count("id"))
+        .order_by("-count", "tag_id")[:limit]
+    )
+    counts = [(count["tag_id"], count["count"]) for count in counts]
+    tags = Tag.objects.in_bulk([tag_id for tag_id, _ in counts])
+    return [(tags[tag_id], count) for tag_id, count in counts]
+
+
+def _get_archive_sidebar_timeout(now):
+    # Articles scheduled for publishing appear in the archive without being saved again
+    next_published_date = (
+        Article.objects.filter(published_date__gt=now)
+        .order_by("published_date")
+        .values_list("published_date", flat=True)
+        .first()
+    )
+    if next_published_date is None:
+        return ARCHIVE_SIDEBAR_TIMEOUT
+    seconds_left = (next_published_date - now).total_seconds()
+    return max(1, min(ARCHIVE_SIDEBAR_TIMEOUT, int(seconds_left)))
+
+
+def get_archive_sidebar():
+    """
+    The date filters and popular tags shown next to the article archive.
+    Cached until an article or tag changes, or the next scheduled article is published.
+    """
+    sidebar = cache.get(ARCHIVE_SIDEBAR_CACHE_KEY)
+    if sidebar is None:
+        now = timezone.now()
+        articles = Article.objects.filter(published_date__lte=now)
+        sidebar = {
+            "dates": create_article_filters(articles),
+            "tags": get_popular_tags(),
+        }
+        cache.set(
+            ARCHIVE_SIDEBAR_CACHE_KEY,
+            sidebar,
+            timeout=_get_archive_sidebar_timeout(now),
+        )
+    return sidebar
+
+
+def invalidate_archive_sidebar():
+    cache.delete(ARCHIVE_SIDEBAR_CACHE_KEY)
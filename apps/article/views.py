@@ -1,18 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from collections import Counter
-
-from django.contrib.contenttypes.models import ContentType
 from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny
-from taggit.models import TaggedItem
 
 from apps.article.filters import ArticlesFilter
 from apps.article.models import Article
 from apps.article.serializers import ArticleSerializer
-from apps.article.utils import create_article_filters
+from apps.article.utils import get_archive_sidebar, get_popular_tags
 
 
 def archive(request, name=None, slug=None, year=None, month=None):
@@ -29,21 +25,14 @@ def archive(request, name=None, slug=None, year=None, month=None):
         Article month (published_date), most likely in norwegian written format.
     """
 
-    articles = Article.objects.filter(published_date__lte=timezone.now()).order_by(
-        "-published_date"
-    )
-
-    dates = create_article_filters(articles)
-
-    # Fetch 30 most popular tags from the Django-taggit registry, using a Counter
-    queryset = TaggedItem.objects.filter(
-        content_type=ContentType.objects.get_for_model(Article)
-    )
+    sidebar = get_archive_sidebar()
+    tags = sidebar["tags"]
     if name and slug:
-        queryset = queryset.filter(tag__name=name)
-    tags = Counter(map(lambda item: item.tag, queryset)).most_common(30)
+        tags = get_popular_tags(name=name)
 
-    return render(request, "article/archive.html", {"tags": tags, "dates": dates})
+    return render(
+        request, "article/archive.html", {"tags": tags, "dates": sidebar["dates"]}
+    )
 
 
 def archive_tag(request, slug):
@@ -1,16 +1,12 @@
 import django_filters
-from watson import search as watson_search
+
+from utils.search import SearchFilter
 
 from ..models import OnlineGroup, OnlineUser
 
 
 class UserFilter(django_filters.FilterSet):
-    query = django_filters.CharFilter(method="watson_filter")
-
-    def watson_filter(self, queryset, name, value):
-        if value and value != "":
-            queryset = watson_search.filter(queryset, value)
-        return queryset
+    query = SearchFilter()
 
     class Meta:
         model = OnlineUser
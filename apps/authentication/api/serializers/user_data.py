@@ -504,3 +504,10 @@ class UserDataSerializer(serializers.ModelSerializer):
             "magictoken_set",
             "object_revisions",
         )
+
+
+class UserDataExportStatusSerializer(serializers.Serializer):
+    status = serializers.CharField(read_only=True, allow_null=True)
+    requested = serializers.DateTimeField(read_only=True, required=False)
+    started = serializers.DateTimeField(read_only=True, required=False)
+    finished = serializers.DateTimeField(read_only=True, required=False)
@@ -1,5 +1,10 @@
+import gzip
+import json
+import tempfile
 from datetime import date, timedelta
 
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from django_dynamic_fixture import G
 from rest_framework import status
@@ -346,3 +351,57 @@ class TestDumpData(OIDCTestCase):
             response.json().get("attendees")[0].get("companies"),
             [{"name": "onlinecorp"}],
         )
+
+
+class TestDataExport(OIDCTestCase):
+    def setUp(self):
+        cache.clear()
+        export_root = tempfile.TemporaryDirectory()
+        self.addCleanup(export_root.cleanup)
+        settings_override = override_settings(USER_DATA_EXPORT_ROOT=export_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user: User = generate_user(username="test_user")
+        self.other_user: User = generate_user(username="other_user")
+        self.token = self.generate_access_token(self.user)
+        self.headers = {**self.generate_headers(), **self.bare_headers}
+
+        self.export_url = lambda _id: f"/api/v1/users/{_id}/data-export/"
+        self.download_url = lambda _id: f"/api/v1/users/{_id}/data-export/download/"
+
+    def test_export_can_be_downloaded_when_done(self):
+        attend_user_to_event(user=self.user, event=generate_event())
+
+        response = self.client.post(self.export_url(self.user.id), **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        response = self.client.get(self.export_url(self.user.id), **self.headers)
+        self.assertEqual(response.json().get("status"), "done")
+
+        response = self.client.get(self.download_url(self.user.id), **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(gzip.decompress(b"".join(response.streaming_content)))
+        self.assertEqual(data.get("name"), self.user.get_full_name())
+        self.assertEqual(len(data.get("attendees")), 1)
+
+    def test_export_matches_dump_data(self):
+        self.client.post(self.export_url(self.user.id), **self.headers)
+
+        response = self.client.get(self.download_url(self.user.id), **self.headers)
+        exported = json.loads(gzip.decompress(b"".join(response.streaming_content)))
+        dumped = self.client.get(
+            f"/api/v1/users/{self.user.id}/dump-data/", **self.headers
+        ).json()
+
+        self.assertEqual(exported, dumped)
+
+    def test_download_is_not_found_before_export(self):
+        response = self.client.get(self.download_url(self.user.id), **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_user_cannot_export_data_of_other_users(self):
+        response = self.client.post(self.export_url(self.other_user.id), **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
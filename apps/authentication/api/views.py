@@ -1,9 +1,19 @@
+import os
+
 from django.contrib.auth.models import Group, Permission
+from django.http import FileResponse
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from apps.authentication.data_export import (
+    DONE,
+    get_export_path,
+    get_export_status,
+    request_export,
+)
 from apps.authentication.models import Email, GroupMember, GroupRole, OnlineGroup
 from apps.authentication.models import OnlineUser as User
 from apps.authentication.models import Position, SpecialPosition
@@ -28,12 +38,13 @@ from apps.authentication.serializers import (
     UserReadOnlySerializer,
     UserUpdateSerializer,
 )
+from apps.authentication.tasks import export_user_data_task
 from apps.common.rest_framework.mixins import MultiSerializerMixin
 from apps.permissions.drf_permissions import DjangoObjectPermissionOrAnonReadOnly
 
 from .filters import OnlineGroupFilter, UserFilter
 from .permissions import IsSelfOrSuperUser
-from .serializers.user_data import UserDataSerializer
+from .serializers.user_data import UserDataExportStatusSerializer, UserDataSerializer
 
 
 class UserViewSet(
@@ -58,6 +69,8 @@ class UserViewSet(
         "change_password": PasswordUpdateSerializer,
         "anonymize_user": AnonymizeUserSerializer,
         "dump_data": UserDataSerializer,
+        "data_export": UserDataExportStatusSerializer,
+        "data_export_download": UserDataExportStatusSerializer,
         "user_permissions": PermissionReadOnlySerializer,
     }
 
@@ -85,6 +98,37 @@ class UserViewSet(
         serializer = self.get_serializer(user)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=["get", "post"], url_path="data-export")
+    def data_export(self, request, pk=None):
+        """
+        Start an export of all data about the user in the background with POST, and poll
+        the status of the export with GET. Finished exports are downloaded from
+        data-export/download/.
+        """
+        user: User = self.get_object()
+        if request.method == "GET":
+            serializer = self.get_serializer(get_export_status(user.pk))
+            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        if request_export(user.pk):
+            export_user_data_task.delay(user.pk)
+        serializer = self.get_serializer(get_export_status(user.pk))
+        return Response(data=serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["get"], url_path="data-export/download")
+    def data_export_download(self, request, pk=None):
+        user: User = self.get_object()
+        path = get_export_path(user.pk)
+        if get_export_status(user.pk)["status"] != DONE or not os.path.exists(path):
+            raise NotFound("Det finnes ingen ferdig eksport av dataene dine.")
+
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=f"online-user-data-{user.pk}.json.gz",
+            content_type="application/gzip",
+        )
+
     @action(detail=True, methods=["get"], url_path="permissions")
     def user_permissions(self, request, pk):
         """
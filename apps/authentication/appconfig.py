@@ -13,8 +13,18 @@ class AuthenticationConfig(AppConfig):
 
         import apps.authentication.signals  # noqa: F401
         from apps.authentication.models import OnlineUser, RegisterToken
+        from utils import search
 
         reversion.register(RegisterToken)
         watson.register(
             OnlineUser, fields=("first_name", "last_name", "ntnu_username", "nickname")
         )
+        search.register(
+            OnlineUser,
+            fields=[
+                ("first_name", "A"),
+                ("last_name", "A"),
+                ("ntnu_username", "B"),
+                ("nickname", "B"),
+            ],
+        )
@@ -0,0 +1,214 @@
+"""
+Export of all data stored about a user, as required by GDPR.
+
+The export contains the same data as UserDataSerializer, but is written in the
+background to a gzipped JSON file, one section at a time. Sections with many objects
+are read in chunks with their related objects prefetched, so memory use is bounded
+by the chunk size rather than by how long the user has been a member.
+"""
+import gzip
+import json
+import logging
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+EXPORT_STATUS_CACHE_KEY = "authentication:user_data_export:{}"
+EXPORT_STATUS_TIMEOUT = 60 * 60 * 24 * 7
+EXPORT_CHUNK_SIZE = 200
+# Exports which have been pending or running for longer than this are assumed to be lost
+EXPORT_STALE_AFTER = timezone.timedelta(hours=1)
+# Finished exports are deleted when they are older than this
+EXPORT_EXPIRES_AFTER = timezone.timedelta(days=7)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def get_export_path(user_id: int) -> str:
+    return os.path.join(settings.USER_DATA_EXPORT_ROOT, f"user-{user_id}.json.gz")
+
+
+def _set_status(user_id: int, status: str, **extra):
+    state = cache.get(EXPORT_STATUS_CACHE_KEY.format(user_id)) or {}
+    state.update(status=status, **extra)
+    cache.set(EXPORT_STATUS_CACHE_KEY.format(user_id), state, EXPORT_STATUS_TIMEOUT)
+
+
+def _is_stale(state: dict) -> bool:
+    if state["status"] not in (PENDING, RUNNING):
+        return False
+    since = state.get("started") or state.get("requested")
+    return since is None or since < timezone.now() - EXPORT_STALE_AFTER
+
+
+def get_export_status(user_id: int) -> dict:
+    """
+    The state of the latest data export of a user.
+    Exports which were lost by the task queue or a worker are reported as failed.
+    """
+    state = cache.get(EXPORT_STATUS_CACHE_KEY.format(user_id))
+    exists = os.path.exists(get_export_path(user_id))
+    if state is None and exists:
+        # The status has expired, but the finished export is still on disk
+        state = {"status": DONE}
+    elif state is not None and state["status"] == DONE and not exists:
+        # The finished export has been deleted
+        state = None
+    elif state is not None and _is_stale(state):
+        state = {**state, "status": FAILED}
+    return state or {"status": None}
+
+
+def request_export(user_id: int) -> bool:
+    """
+    Mark a data export of a user as pending, unless one is already in progress.
+    Returns whether a new export should be started.
+    """
+    if get_export_status(user_id)["status"] in (PENDING, RUNNING):
+        return False
+    cache.set(
+        EXPORT_STATUS_CACHE_KEY.format(user_id),
+        {"status": PENDING, "requested": timezone.now(), "finished": None},
+        EXPORT_STATUS_TIMEOUT,
+    )
+    return True
+
+
+def _get_related_lookups(serializer: serializers.ModelSerializer):
+    """
+    The relations of the serializer's model used by nested serializers, split into the
+    ones which can be fetched with select_related and the ones which have to be
+    prefetched.
+    """
+    select, prefetch = [], []
+    model = serializer.Meta.model
+    for field in serializer.fields.values():
+        if not isinstance(field, serializers.BaseSerializer) or "." in field.source:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if model_field.many_to_one or model_field.one_to_one:
+            select.append(field.source)
+        elif model_field.is_relation:
+            prefetch.append(field.source)
+    return select, prefetch
+
+
+def _iterate_in_chunks(queryset, child: serializers.BaseSerializer):
+    if isinstance(child, serializers.ModelSerializer):
+        select, prefetch = _get_related_lookups(child)
+        queryset = queryset.select_related(*select).prefetch_related(*prefetch)
+
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        chunk = list(chunk[:EXPORT_CHUNK_SIZE])
+        yield from chunk
+        if len(chunk) < EXPORT_CHUNK_SIZE:
+            return
+        last_pk = chunk[-1].pk
+
+
+def _write_list(file, field: serializers.ListSerializer, data):
+    if isinstance(data, models.Manager):
+        data = data.all()
+    items = (
+        _iterate_in_chunks(data, field.child)
+        if isinstance(data, models.QuerySet)
+        else data
+    )
+
+    file.write("[")
+    for index, item in enumerate(items):
+        if index:
+            file.write(", ")
+        json.dump(field.child.to_representation(item), file, cls=JSONEncoder)
+    file.write("]")
+
+
+def _write_field(file, field, attribute):
+    if isinstance(field, serializers.ListSerializer):
+        _write_list(file, field, attribute)
+        return
+
+    # Same check for empty values as in Serializer.to_representation
+    check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+    value = None if check_for_none is None else field.to_representation(attribute)
+    json.dump(value, file, cls=JSONEncoder)
+
+
+def write_user_data(user, path: str):
+    """
+    Write the data of a user to a gzipped JSON file, section by section.
+    The file is written next to the path and moved in place when finished.
+    """
+    from apps.authentication.api.serializers.user_data import UserDataSerializer
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial_path = f"{path}.partial"
+    serializer = UserDataSerializer(user)
+    with gzip.open(partial_path, "wt", encoding="utf-8") as file:
+        file.write("{")
+        separator = ""
+        for field in serializer._readable_fields:
+            try:
+                attribute = field.get_attribute(user)
+            except SkipField:
+                continue
+            file.write(f"{separator}{json.dumps(field.field_name)}: ")
+            _write_field(file, field, attribute)
+            separator = ", "
+        file.write("}")
+    os.replace(partial_path, path)
+
+
+def export_user_data(user):
+    """
+    Export the data of a user to USER_DATA_EXPORT_ROOT, keeping track of the status.
+    """
+    _set_status(user.pk, RUNNING, started=timezone.now())
+    try:
+        write_user_data(user, get_export_path(user.pk))
+    except Exception:
+        logger.exception(f"Exporting the data of user {user.pk} failed")
+        _set_status(user.pk, FAILED, finished=timezone.now())
+        return
+    _set_status(user.pk, DONE, finished=timezone.now())
+
+
+def delete_expired_exports() -> int:
+    """
+    Delete finished and partial exports older than EXPORT_EXPIRES_AFTER.
+    Returns the number of deleted files.
+    """
+    root = settings.USER_DATA_EXPORT_ROOT
+    if not os.path.isdir(root):
+        return 0
+
+    expired_before = (timezone.now() - EXPORT_EXPIRES_AFTER).timestamp()
+    deleted = 0
+    for entry in os.scandir(root):
+        if (
+            entry.is_file()
+            and entry.name.startswith("user-")
+            and entry.stat().st_mtime < expired_before
+        ):
+            os.remove(entry.path)
+            deleted += 1
+    return deleted
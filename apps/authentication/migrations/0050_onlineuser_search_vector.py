@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from utils.search import AddSearchVector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0049_merge_20200819_1838"),
+    ]
+
+    operations = [
+        AddSearchVector(
+            model_name="onlineuser",
+            fields=[
+                ("first_name", "A"),
+                ("last_name", "A"),
+                ("ntnu_username", "B"),
+                ("nickname", "B"),
+            ],
+            config="simple",
+        ),
+    ]
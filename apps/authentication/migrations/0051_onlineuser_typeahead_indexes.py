@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# Columns searched by prefix in the user typeahead, see apps.profiles.typeahead
+TYPEAHEAD_COLUMNS = ("first_name", "last_name", "username", "ntnu_username")
+
+
+def _index_name(column):
+    return f"authentication_onlineuser_{column}_upper_like"
+
+
+def create_indexes(apps, schema_editor):
+    # istartswith lookups are UPPER(column::text) LIKE UPPER('prefix%') on PostgreSQL,
+    # which can use a text_pattern_ops index on the same expression regardless of collation.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in TYPEAHEAD_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX "{_index_name(column)}" ON "authentication_onlineuser" '
+            f'(UPPER("{column}"::text) text_pattern_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in TYPEAHEAD_COLUMNS:
+        schema_editor.execute(f'DROP INDEX "{_index_name(column)}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0050_onlineuser_search_vector"),
+    ]
+
+    operations = [migrations.RunPython(create_indexes, drop_indexes)]
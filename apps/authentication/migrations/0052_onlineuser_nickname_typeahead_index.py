@@ -0,0 +1,28 @@
+from django.db import migrations
+
+INDEX_NAME = "authentication_onlineuser_nickname_upper_like"
+
+
+def create_index(apps, schema_editor):
+    # Same prefix index as the other typeahead columns, see 0051_onlineuser_typeahead_indexes
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f'CREATE INDEX "{INDEX_NAME}" ON "authentication_onlineuser" '
+        f'(UPPER("nickname"::text) text_pattern_ops)'
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f'DROP INDEX "{INDEX_NAME}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0051_onlineuser_typeahead_indexes"),
+    ]
+
+    operations = [migrations.RunPython(create_index, drop_index)]
@@ -15,9 +15,9 @@ from django.utils.html import strip_tags
 from django.utils.translation import gettext as _
 
 from apps.authentication.constants import FieldOfStudyType, GroupType, RoleType
+from apps.authentication.user_cache import cached_user_fact
 from apps.authentication.validators import validate_rfid
 from apps.gallery.models import ResponsiveImage
-from apps.payment import status as PaymentStatus
 from apps.permissions.models import ObjectPermissionModel
 
 logger = logging.getLogger(__name__)
@@ -159,6 +159,7 @@ class OnlineUser(AbstractUser):
     # TODO checkbox for forwarding of @online.ntnu.no mail
 
     @property
+    @cached_user_fact
     def is_member(self):
         """
         Returns true if the User object is associated with Online.
@@ -174,25 +175,25 @@ class OnlineUser(AbstractUser):
         return False
 
     @property
+    @cached_user_fact
     def is_committee(self):
         # New check for committee membership
-        memberships = GroupMember.objects.filter(user=self)
-        for membership in memberships:
-            if (
-                membership.group.group_type == GroupType.COMMITTEE
-                or membership.group.group_type == GroupType.NODE_COMMITTEE
-            ):
-                return True
+        if GroupMember.objects.filter(
+            user=self,
+            group__group_type__in=[GroupType.COMMITTEE, GroupType.NODE_COMMITTEE],
+        ).exists():
+            return True
 
         # Old check for committee membership for backwards compatibility
         try:
             committee_group = Group.objects.get(name="Komiteer")
-            return self in committee_group.user_set.all() or self.is_staff
+            return committee_group.user_set.filter(pk=self.pk).exists() or self.is_staff
         except Group.DoesNotExist:
             # This probably means that a developer does not have the Komiteer group set up, so let's fail silently
             return False
 
     @property
+    @cached_user_fact
     def has_expiring_membership(self):
         if self.ntnu_username:
             expiration_threshold = timezone.now() + datetime.timedelta(days=60)
@@ -214,6 +215,7 @@ class OnlineUser(AbstractUser):
         return full_name.strip()
 
     @property
+    @cached_user_fact
     def primary_email(self) -> str:
         email_object = self.email_object
         if email_object:
@@ -235,6 +237,7 @@ class OnlineUser(AbstractUser):
     def get_active_suspensions(self):
         return self.suspension_set.filter(active=True)
 
+    @cached_user_fact
     def in_group(self, group_name):
         return reduce(lambda x, y: x or y.name == group_name, self.groups.all(), False)
 
@@ -244,13 +247,11 @@ class OnlineUser(AbstractUser):
         return Membership.objects.get(username=self.ntnu_username.lower())
 
     @property
+    @cached_user_fact
     def saldo(self) -> int:
-        value = (
-            self.paymenttransaction_set.filter(status=PaymentStatus.DONE)
-            .aggregate(coins=models.Sum("amount"))
-            .get("coins")
-        )
-        return value if value is not None else 0
+        from apps.payment.models import WalletBalance
+
+        return WalletBalance.objects.get_balance(self.pk)
 
     @property
     def year(self):
@@ -0,0 +1,18 @@
+import logging
+
+from apps.authentication.data_export import delete_expired_exports
+from apps.mommy import schedule
+from apps.mommy.registry import Task
+
+
+class DeleteExpiredUserDataExports(Task):
+    @staticmethod
+    def run():
+        logger = logging.getLogger(__name__)
+        deleted = delete_expired_exports()
+        logger.info(f"Deleted {deleted} expired user data exports")
+
+
+schedule.register(
+    DeleteExpiredUserDataExports, day_of_week="mon-sun", hour=3, minute=30
+)
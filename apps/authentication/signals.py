@@ -14,11 +14,18 @@ from django.db.models.signals import (
 )
 from django.dispatch import receiver
 
-from apps.authentication.models import Email, GroupMember, GroupRole, OnlineGroup
+from apps.authentication.models import (
+    Email,
+    GroupMember,
+    GroupRole,
+    Membership,
+    OnlineGroup,
+)
 from apps.authentication.tasks import (
     SynchronizeGroups,
     assign_permission_from_group_admins,
 )
+from apps.authentication.user_cache import invalidate_user_facts
 from apps.gsuite.mail_syncer.main import update_g_suite_group, update_g_suite_user
 from apps.gsuite.mail_syncer.tasks import update_mailing_list
 
@@ -29,6 +36,36 @@ sync_uuid = uuid.uuid1()
 MAILING_LIST_USER_FIELDS_TO_LIST_NAME = settings.MAILING_LIST_USER_FIELDS_TO_LIST_NAME
 
 
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Email)
+@receiver(post_delete, sender=Email)
+@receiver(post_save, sender=GroupMember)
+@receiver(post_delete, sender=GroupMember)
+def invalidate_cached_user_facts(sender, instance, **kwargs):
+    invalidate_user_facts(instance.pk if sender == User else instance.user_id)
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def invalidate_cached_membership_facts(sender, instance: Membership, **kwargs):
+    user_ids = User.objects.filter(ntnu_username__iexact=instance.username).values_list(
+        "id", flat=True
+    )
+    invalidate_user_facts(*user_ids)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_cached_group_facts(sender, instance, action, pk_set=None, **kwargs):
+    if isinstance(instance, User):
+        if action.startswith("post_"):
+            invalidate_user_facts(instance.pk)
+    elif action == "pre_clear":
+        # The members of the group are no longer known after it has been cleared
+        invalidate_user_facts(*instance.user_set.values_list("id", flat=True))
+    elif action.startswith("post_") and pk_set:
+        invalidate_user_facts(*pk_set)
+
+
 def run_group_syncer(user: User) -> None:
     """
     Tasks to run after User is changed.
@@ -4,6 +4,7 @@ import logging
 from django.conf import settings
 from django.contrib.auth.models import Group
 
+from apps.authentication.data_export import export_user_data
 from apps.authentication.models import OnlineGroup
 from apps.authentication.models import OnlineUser as User
 from apps.mommy.registry import Task
@@ -124,3 +125,9 @@ def assign_permission_from_group_admins(self, group_id: int):
 
     origin_group = OnlineGroup.objects.get(pk=group_id)
     assign_perms(group=origin_group)
+
+
+@app.task(ignore_result=True)
+def export_user_data_task(user_id: int):
+    user = User.objects.get(pk=user_id)
+    export_user_data(user)
@@ -1,24 +1,32 @@
 import logging
+import os
+import tempfile
+import time
 from copy import deepcopy
 from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.test import TestCase, override_settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django_dynamic_fixture import G
 from rest_framework import status
 
+from apps.authentication import data_export
 from apps.authentication.constants import GroupType, RoleType
 from apps.authentication.models import (
     Email,
     GroupRole,
+    Membership,
     OnlineGroup,
     OnlineUser,
     RegisterToken,
 )
+from apps.authentication.user_cache import UserFactCacheMiddleware
 from apps.authentication.validators import validate_rfid
 
 
@@ -259,3 +267,117 @@ class GroupPermissionTestCase(TestCase):
         sub_group.save()
 
         self.assertTrue(user.has_perm(self.test_perm, sub_group))
+
+
+class UserFactCacheTestCase(TestCase):
+    def setUp(self):
+        self.user = G(OnlineUser, username="testuser", ntnu_username="testuser")
+        G(
+            Membership,
+            username="testuser",
+            expiration_date=timezone.now() + timedelta(days=30),
+        )
+
+    def run_in_request(self, view):
+        middleware = UserFactCacheMiddleware(lambda request: view())
+        return middleware(RequestFactory().get("/"))
+
+    def test_facts_are_cached_for_the_request(self):
+        def view():
+            self.assertTrue(self.user.is_member)
+            with self.assertNumQueries(0):
+                self.assertTrue(self.user.is_member)
+            return HttpResponse()
+
+        self.run_in_request(view)
+
+    def test_facts_are_invalidated_when_membership_changes(self):
+        def view():
+            self.assertTrue(self.user.is_member)
+            Membership.objects.get(username="testuser").delete()
+            self.assertFalse(self.user.is_member)
+            return HttpResponse()
+
+        self.run_in_request(view)
+
+    def test_facts_are_not_cached_outside_requests(self):
+        self.assertTrue(self.user.is_member)
+        Membership.objects.filter(username="testuser").delete()
+        self.assertFalse(self.user.is_member)
+
+    @override_settings(DEBUG=True)
+    def test_cache_hits_are_exposed_in_debug(self):
+        def view():
+            for _ in range(3):
+                self.user.is_member
+            return HttpResponse()
+
+        response = self.run_in_request(view)
+
+        self.assertEqual(response["X-User-Fact-Cache-Hits"], "2")
+
+
+class UserDataExportTestCase(TestCase):
+    def setUp(self):
+        export_root = tempfile.TemporaryDirectory()
+        self.addCleanup(export_root.cleanup)
+        settings_override = override_settings(USER_DATA_EXPORT_ROOT=export_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = G(OnlineUser)
+        self.status_key = data_export.EXPORT_STATUS_CACHE_KEY.format(self.user.pk)
+        self.addCleanup(cache.delete, self.status_key)
+
+    def write_export(self, name: str, age: timedelta) -> str:
+        path = os.path.join(settings.USER_DATA_EXPORT_ROOT, name)
+        with open(path, "w"):
+            pass
+        modified = time.time() - age.total_seconds()
+        os.utime(path, (modified, modified))
+        return path
+
+    def test_export_in_progress_blocks_new_exports(self):
+        self.assertTrue(data_export.request_export(self.user.pk))
+        self.assertFalse(data_export.request_export(self.user.pk))
+
+    def test_stale_pending_export_is_failed_and_can_be_restarted(self):
+        cache.set(
+            self.status_key,
+            {
+                "status": data_export.PENDING,
+                "requested": timezone.now() - timedelta(hours=2),
+            },
+        )
+
+        status = data_export.get_export_status(self.user.pk)
+
+        self.assertEqual(status["status"], data_export.FAILED)
+        self.assertTrue(data_export.request_export(self.user.pk))
+
+    def test_stale_running_export_is_failed(self):
+        cache.set(
+            self.status_key,
+            {
+                "status": data_export.RUNNING,
+                "requested": timezone.now() - timedelta(hours=3),
+                "started": timezone.now() - timedelta(hours=2),
+            },
+        )
+
+        status = data_export.get_export_status(self.user.pk)
+
+        self.assertEqual(status["status"], data_export.FAILED)
+
+    def test_expired_exports_are_deleted(self):
+        expired = self.write_export(f"user-{self.user.pk}.json.gz", timedelta(days=8))
+        partial = self.write_export("user-0.json.gz.partial", timedelta(days=8))
+        recent = self.write_export("user-1.json.gz", timedelta(days=1))
+        cache.set(self.status_key, {"status": data_export.DONE})
+
+        self.assertEqual(data_export.delete_expired_exports(), 2)
+
+        self.assertFalse(os.path.exists(expired))
+        self.assertFalse(os.path.exists(partial))
+        self.assertTrue(os.path.exists(recent))
+        self.assertIsNone(data_export.get_export_status(self.user.pk)["status"])
@@ -0,0 +1,100 @@
+"""
+Memoization of facts derived from an OnlineUser, like membership and committee status.
+
+Values are cached for the duration of a request by UserFactCacheMiddleware, and can
+optionally be shared between requests for OW4_USER_FACT_CACHE_TIMEOUT seconds.
+Outside of a request nothing is cached unless the shared cache is enabled.
+Cached values are invalidated from the signals of the models they are derived from.
+"""
+import logging
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "authentication:user_facts"
+
+_request_cache = ContextVar("user_fact_request_cache", default=None)
+_fact_names = set()
+
+
+def _get_shared_timeout() -> int:
+    return getattr(settings, "OW4_USER_FACT_CACHE_TIMEOUT", 0)
+
+
+def _shared_key(user_id: int, name: str) -> str:
+    return "%s:%s:%s" % (CACHE_KEY_PREFIX, user_id, name)
+
+
+def cached_user_fact(method):
+    """
+    Memoize a method on OnlineUser for the current request.
+    Arguments to the method are part of the key, but are not shared between requests.
+    """
+    name = method.__name__
+    _fact_names.add(name)
+
+    @wraps(method)
+    def wrapper(user, *args):
+        if user.pk is None:
+            return method(user, *args)
+
+        request_cache = _request_cache.get()
+        key = (user.pk, name, args)
+        if request_cache is not None and key in request_cache["facts"]:
+            request_cache["hits"] += 1
+            return request_cache["facts"][key]
+
+        shared_timeout = _get_shared_timeout() if not args else 0
+        value = cache.get(_shared_key(user.pk, name)) if shared_timeout else None
+        if value is None:
+            value = method(user, *args)
+            if shared_timeout:
+                cache.set(_shared_key(user.pk, name), value, timeout=shared_timeout)
+
+        if request_cache is not None:
+            request_cache["facts"][key] = value
+        return value
+
+    return wrapper
+
+
+def invalidate_user_facts(*user_ids: int):
+    """Forget all cached facts about the given users"""
+    request_cache = _request_cache.get()
+    if request_cache is not None:
+        for key in list(request_cache["facts"]):
+            if key[0] in user_ids:
+                del request_cache["facts"][key]
+
+    if _get_shared_timeout():
+        cache.delete_many(
+            [_shared_key(user_id, name) for user_id in user_ids for name in _fact_names]
+        )
+
+
+class UserFactCacheMiddleware:
+    """
+    Enables the user fact cache for the duration of a request.
+    When DEBUG is on, the number of lookups served by the cache is added to the response
+    in the X-User-Fact-Cache-Hits header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_cache.set({"facts": {}, "hits": 0})
+        try:
+            response = self.get_response(request)
+            hits = _request_cache.get()["hits"]
+        finally:
+            _request_cache.reset(token)
+
+        if settings.DEBUG:
+            logger.debug("User fact cache saved %d lookups for %s", hits, request.path)
+            response["X-User-Fact-Cache-Hits"] = str(hits)
+        return response
@@ -21,6 +21,7 @@ class CareerSerializer(TaggitSerializer, serializers.ModelSerializer):
 
     class Meta:
         model = CareerOpportunity
+        prefetch_related = ("location",)
         fields = (
             "id",
             "company",
@@ -3,6 +3,7 @@ from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.permissions import DjangoModelPermissionsOrAnonReadOnly
 
+from apps.common.rest_framework.mixins import AnnotatedSerializerMixin
 from utils.pagination import PageNumberPagination
 
 from .filters import CareerOpportunityFilter
@@ -24,7 +25,7 @@ class HundredItemsPaginator(PageNumberPagination):
     max_page_size = 100
 
 
-class CareerViewSet(viewsets.ModelViewSet):
+class CareerViewSet(AnnotatedSerializerMixin, viewsets.ModelViewSet):
     queryset = CareerOpportunity.objects.all()
     serializer_class = CareerSerializer
     permission_classes = (DjangoModelPermissionsOrAnonReadOnly,)
@@ -0,0 +1,76 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from rest_framework import serializers
+
+
+class AnnotatedMethodField(serializers.SerializerMethodField):
+    """
+    A method field which can be satisfied by an annotation on the queryset instead of a
+    query per object.
+    Querysets prepared with 'annotate_for_serializer' are annotated with the expression
+    under the name of the field.
+    Objects without the annotation fall back to the 'get_<field_name>' method of the
+    serializer.
+    """
+
+    def __init__(self, annotation, method_name=None, **kwargs):
+        self.annotation = annotation
+        super().__init__(method_name=method_name, **kwargs)
+
+    def to_representation(self, value):
+        if hasattr(value, self.field_name):
+            return getattr(value, self.field_name)
+        return super().to_representation(value)
+
+
+def _get_nested_serializer(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    return field
+
+
+def annotate_for_serializer(queryset: QuerySet, serializer_class) -> QuerySet:
+    """
+    Prepare a queryset for being serialized by the serializer class in a constant number
+    of queries.
+
+    Annotations of 'AnnotatedMethodField's are added, along with the 'select_related'
+    and 'prefetch_related' lookups declared in the Meta of the serializer. Nested
+    serializers of relations which are not selected are prefetched and prepared the
+    same way, so the queryset should not prefetch those relations itself.
+    """
+    serializer = serializer_class()
+    meta = getattr(serializer_class, "Meta", None)
+
+    annotations = {}
+    select_related = getattr(meta, "select_related", ())
+    prefetches = list(getattr(meta, "prefetch_related", ()))
+    for field_name, field in serializer.fields.items():
+        if isinstance(field, AnnotatedMethodField):
+            annotations[field_name] = field.annotation
+            continue
+
+        nested_serializer = _get_nested_serializer(field)
+        if (
+            not isinstance(nested_serializer, serializers.ModelSerializer)
+            or field.source in select_related
+        ):
+            continue
+        try:
+            relation = queryset.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if not relation.is_relation:
+            continue
+        nested_queryset = annotate_for_serializer(
+            relation.related_model.objects.all(), type(nested_serializer)
+        )
+        prefetches.append(Prefetch(field.source, queryset=nested_queryset))
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if annotations:
+        queryset = queryset.annotate(**annotations)
+    return queryset
@@ -1,6 +1,7 @@
 from django.core.exceptions import ImproperlyConfigured
 from rest_framework import serializers, viewsets
 
+from apps.common.rest_framework.annotations import annotate_for_serializer
 from utils.metadata import ActionMeta
 
 
@@ -54,3 +55,16 @@ class MultiSerializerMixin(viewsets.GenericViewSet):
     def get_serializer_class(self):
         serializer_class = self.get_serializer_class_by_action(self.action)
         return serializer_class if serializer_class else super().get_serializer_class()
+
+
+class AnnotatedSerializerMixin:
+    """
+    Prepares the queryset of a viewset for its serializer with
+    'annotate_for_serializer', so counts and related objects used by the serializer are
+    loaded with the queryset.
+    """
+
+    def get_queryset(self):
+        return annotate_for_serializer(
+            super().get_queryset(), self.get_serializer_class()
+        )
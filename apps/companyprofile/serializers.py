@@ -1,14 +1,25 @@
+from django.db.models import Count, Q
+from django.db.models.functions import Now
 from django.utils import timezone
 from rest_framework import serializers
 
+from apps.common.rest_framework.annotations import AnnotatedMethodField
 from apps.companyprofile.models import Company
 from apps.gallery.serializers import ResponsiveImageSerializer
 
 
 class CompanySerializer(serializers.ModelSerializer):
     image = ResponsiveImageSerializer()
-    event_count = serializers.SerializerMethodField()
-    career_opportunity_count = serializers.SerializerMethodField()
+    event_count = AnnotatedMethodField(
+        Count("events", filter=Q(events__visible=True), distinct=True)
+    )
+    career_opportunity_count = AnnotatedMethodField(
+        Count(
+            "career_opportunities",
+            filter=Q(career_opportunities__start__lte=Now()),
+            distinct=True,
+        )
+    )
 
     def get_event_count(self, company: Company):
         return company.events.filter(visible=True).count()
@@ -18,6 +29,8 @@ class CompanySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Company
+        select_related = ("image",)
+        prefetch_related = ("image__tags",)
 
         fields = (
             "id",
@@ -2,12 +2,19 @@
 
 import logging
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from django_dynamic_fixture import G
 from rest_framework import status
 
+from apps.careeropportunity.models import CareerOpportunity
 from apps.companyprofile.models import Company
+from apps.companyprofile.serializers import CompanySerializer
+from apps.events.models import CompanyEvent, Event
+from apps.gallery.models import ResponsiveImage
 from apps.online_oidc_provider.test import OIDCTestCase
 
 
@@ -62,3 +69,47 @@ class CompanyAPITestCase(OIDCTestCase):
 
         self.assertIn(self.company.name, company_names)
         self.assertNotIn(other_company.name, company_names)
+
+    def _create_companies(self, count: int):
+        now = timezone.now()
+        for _ in range(count):
+            company = G(Company, image=G(ResponsiveImage))
+            G(CompanyEvent, company=company, event=G(Event, visible=True))
+            G(CompanyEvent, company=company, event=G(Event, visible=False))
+            G(
+                CareerOpportunity,
+                company=company,
+                start=now - timezone.timedelta(days=1),
+                end=now + timezone.timedelta(days=1),
+            )
+
+    def _count_list_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context)
+
+    def test_company_list_queries_do_not_grow_with_companies(self):
+        self._create_companies(2)
+        queries = self._count_list_queries()
+
+        self._create_companies(4)
+
+        self.assertEqual(self._count_list_queries(), queries)
+
+    def test_annotated_counts_match_serializer_methods(self):
+        self._create_companies(1)
+        company = Company.objects.exclude(pk=self.company.pk).get()
+
+        response = self.client.get(self.id_url(company.id))
+        plain_data = CompanySerializer(company).data
+
+        self.assertEqual(response.json().get("event_count"), 1)
+        self.assertEqual(response.json().get("career_opportunity_count"), 1)
+        self.assertEqual(
+            response.json().get("event_count"), plain_data.get("event_count")
+        )
+        self.assertEqual(
+            response.json().get("career_opportunity_count"),
+            plain_data.get("career_opportunity_count"),
+        )
@@ -2,6 +2,8 @@
 from django.shortcuts import get_object_or_404, render
 from rest_framework import permissions, viewsets
 
+from apps.common.rest_framework.mixins import AnnotatedSerializerMixin
+
 from .filters import CompanyFilter
 from .models import Company
 from .serializers import CompanySerializer
@@ -12,7 +14,7 @@ def details(request, company_id):
     return render(request, "company/details.html", {"company": company})
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(AnnotatedSerializerMixin, viewsets.ModelViewSet):
     permission_classes = (permissions.DjangoModelPermissionsOrAnonReadOnly,)
     serializer_class = CompanySerializer
     queryset = Company.objects.all()
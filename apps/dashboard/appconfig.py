@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     name = "apps.dashboard"
     verbose_name = "dashboard"
+
+    def ready(self):
+        super().ready()
+        import apps.dashboard.signals  # noqa: F401
@@ -0,0 +1,95 @@
+"""
+Counters for the badges in the dashboard sidebar.
+
+Counts are shared between users for BADGE_CACHE_TIMEOUT seconds, and are invalidated
+from the signals of the models they are counted from.
+"""
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.approval.models import MembershipApproval
+from apps.gallery.models import UnhandledImage
+from apps.inventory.models import Batch
+from apps.posters.models import Poster
+
+BADGE_CACHE_TIMEOUT = 60
+
+APPROVAL_PENDING_KEY = "dashboard:badges:approval_pending"
+INVENTORY_EXPIRED_KEY = "dashboard:badges:inventory_expired:{}"
+UNHANDLED_IMAGES_KEY = "dashboard:badges:unhandled_images"
+POSTER_ORDERS_KEY = "dashboard:badges:poster_orders:{}"
+POSTER_ORDERS_VERSION_KEY = "dashboard:badges:poster_orders_version"
+
+
+def _get_or_compute(key, compute, version=None):
+    value = cache.get(key, version=version)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=BADGE_CACHE_TIMEOUT, version=version)
+    return value
+
+
+def get_approval_pending_count() -> int:
+    return _get_or_compute(
+        APPROVAL_PENDING_KEY,
+        lambda: MembershipApproval.objects.filter(processed=False).count(),
+    )
+
+
+def has_expired_inventory() -> bool:
+    today = date.today()
+    return _get_or_compute(
+        INVENTORY_EXPIRED_KEY.format(today),
+        lambda: Batch.objects.filter(expiration_date__lt=today).exists(),
+    )
+
+
+def get_unhandled_image_count() -> int:
+    return _get_or_compute(UNHANDLED_IMAGES_KEY, UnhandledImage.objects.count)
+
+
+def _get_poster_orders_version() -> int:
+    cache.add(POSTER_ORDERS_VERSION_KEY, 1, timeout=None)
+    return cache.get(POSTER_ORDERS_VERSION_KEY, 1)
+
+
+def get_poster_order_count(user) -> int:
+    """
+    Unassigned poster orders, and unfinished orders assigned to the user.
+    Every change to a poster can change the count for all users, so the counts of all
+    users are invalidated together by bumping the version of their cache keys.
+    """
+
+    def count():
+        counts = Poster.objects.aggregate(
+            unassigned=Count("id", filter=Q(assigned_to=None)),
+            assigned=Count("id", filter=Q(assigned_to=user, finished=False)),
+        )
+        return counts["unassigned"] + counts["assigned"]
+
+    return _get_or_compute(
+        POSTER_ORDERS_KEY.format(user.pk), count, version=_get_poster_orders_version(),
+    )
+
+
+def invalidate_approval_pending_count():
+    cache.delete(APPROVAL_PENDING_KEY)
+
+
+def invalidate_expired_inventory():
+    cache.delete(INVENTORY_EXPIRED_KEY.format(date.today()))
+
+
+def invalidate_unhandled_image_count():
+    cache.delete(UNHANDLED_IMAGES_KEY)
+
+
+def invalidate_poster_order_counts():
+    cache.add(POSTER_ORDERS_VERSION_KEY, 1, timeout=None)
+    try:
+        cache.incr(POSTER_ORDERS_VERSION_KEY)
+    except ValueError:
+        # The version was evicted in between, which has invalidated the counts anyway
+        pass
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.approval.models import MembershipApproval
+from apps.dashboard import badges
+from apps.gallery.models import UnhandledImage
+from apps.inventory.models import Batch
+from apps.posters.models import Poster
+
+
+@receiver(post_save, sender=MembershipApproval)
+@receiver(post_delete, sender=MembershipApproval)
+def invalidate_approval_badge(sender, **kwargs):
+    badges.invalidate_approval_pending_count()
+
+
+@receiver(post_save, sender=Batch)
+@receiver(post_delete, sender=Batch)
+def invalidate_inventory_badge(sender, **kwargs):
+    badges.invalidate_expired_inventory()
+
+
+@receiver(post_save, sender=Poster)
+@receiver(post_delete, sender=Poster)
+def invalidate_poster_badge(sender, **kwargs):
+    badges.invalidate_poster_order_counts()
+
+
+@receiver(post_save, sender=UnhandledImage)
+@receiver(post_delete, sender=UnhandledImage)
+def invalidate_unhandled_image_badge(sender, **kwargs):
+    badges.invalidate_unhandled_image_count()
@@ -1,3 +1,47 @@
 # -*- encoding: utf-8 -*-
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from apps.authentication.models import OnlineUser as User
+from apps.dashboard import badges
+from apps.inventory.models import Batch
+from apps.posters.models import Poster
+
+
+class BadgeTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = G(User)
+
+    def create_poster(self, **kwargs):
+        return G(Poster, order_type=3, event=None, **kwargs)
+
+    def test_poster_orders_counts_unassigned_and_own_unfinished(self):
+        self.create_poster(assigned_to=None)
+        self.create_poster(assigned_to=self.user, finished=False)
+        self.create_poster(assigned_to=self.user, finished=True)
+        self.create_poster(assigned_to=G(User), finished=False)
+
+        self.assertEqual(badges.get_poster_order_count(self.user), 2)
+
+    def test_poster_orders_are_cached_until_a_poster_changes(self):
+        poster = self.create_poster(assigned_to=None)
+        badges.get_poster_order_count(self.user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(badges.get_poster_order_count(self.user), 1)
+
+        poster.assigned_to = G(User)
+        poster.save()
+
+        self.assertEqual(badges.get_poster_order_count(self.user), 0)
+
+    def test_expired_inventory_is_invalidated_by_batches(self):
+        self.assertFalse(badges.has_expired_inventory())
+
+        G(Batch, expiration_date=date.today() - timedelta(days=1))
+
+        self.assertTrue(badges.has_expired_inventory())
@@ -1,13 +1,8 @@
 # -*- encoding: utf-8 -*-
-from datetime import date
-
 from django.core.exceptions import PermissionDenied
 from guardian.mixins import PermissionRequiredMixin
 
-from apps.approval.models import MembershipApproval
-from apps.gallery.models import UnhandledImage
-from apps.inventory.models import Batch
-from apps.posters.models import Poster
+from apps.dashboard import badges
 
 
 def has_access(request):
@@ -30,6 +25,15 @@ def check_access_or_403(request):
         raise PermissionDenied
 
 
+def get_user_permissions(request):
+    """
+    The permissions of the logged in user, looked up once per request.
+    """
+    if not hasattr(request, "_user_permissions"):
+        request._user_permissions = set(request.user.get_all_permissions())
+    return request._user_permissions
+
+
 def get_base_context(request):
     """
     This function returns a dictionary with the proper context variables
@@ -37,37 +41,29 @@ def get_base_context(request):
     context for every dashboard view. For example, it is used for rendering
     badges in the dashboard menu.
 
-    Add your own if req.user.has_perm statements adding the context objects
-    of that you need.
+    Add your own checks against the user permissions adding the context objects
+    that you need. Counts shown in badges belong in apps.dashboard.badges.
     """
 
     context = {}
 
-    context["user_permissions"] = set(request.user.get_all_permissions())
+    permissions = get_user_permissions(request)
+    context["user_permissions"] = permissions
 
     # Check if we need approval count to display in template sidebar badge
-    if request.user.has_perm("approval.view_membershipapproval"):
-        context["approval_pending"] = MembershipApproval.objects.filter(
-            processed=False
-        ).count()
+    if "approval.view_membershipapproval" in permissions:
+        context["approval_pending"] = badges.get_approval_pending_count()
 
     # Check if there exists a batch in inventory that has expired
-    if request.user.has_perm("inventory.view_item"):
-        if Batch.objects.filter(expiration_date__lt=date.today()):
-            context["inventory_expired"] = True
-
-    if request.user.has_perm("posters.view_poster"):
-        if Poster.objects.filter(assigned_to=None) or Poster.objects.filter(
-            assigned_to=request.user
-        ):
-            context["poster_orders"] = Poster.objects.filter(assigned_to=None).count()
-            context["poster_orders"] += Poster.objects.filter(
-                assigned_to=request.user, finished=False
-            ).count()
+    if "inventory.view_item" in permissions and badges.has_expired_inventory():
+        context["inventory_expired"] = True
+
+    if "posters.view_poster" in permissions:
+        context["poster_orders"] = badges.get_poster_order_count(request.user)
 
     # Check if we have any unhandled images pending crop and save
-    if request.user.has_perm("gallery.view_unhandledimage"):
-        context["unhandled_images"] = UnhandledImage.objects.all()
+    if "gallery.view_unhandledimage" in permissions:
+        context["unhandled_images"] = badges.get_unhandled_image_count()
 
     return context
 
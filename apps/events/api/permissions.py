@@ -2,6 +2,7 @@ from django.utils import timezone
 from rest_framework import permissions
 
 from apps.authentication.models import OnlineUser as User
+from apps.payment import status as payment_status
 
 from ..models import AttendanceEvent, Attendee
 
@@ -49,6 +50,19 @@ class UnregisterPermission(permissions.IsAuthenticated):
         attendee = Attendee.objects.get(event=attendance_event, user=user)
         return attendee.has_paid
 
+    @staticmethod
+    def _has_payment_in_progress(attendance_event: AttendanceEvent, user: User):
+        """ Payments still processing or pending may complete after unregistering. """
+        attendee = Attendee.objects.get(event=attendance_event, user=user)
+        payment_relations = attendee.payment_relations
+        return (
+            payment_relations is not None
+            and payment_relations.filter(
+                refunded=False,
+                status__in=(payment_status.PROCESSING, payment_status.PENDING),
+            ).exists()
+        )
+
     def has_object_permission(self, request, view, obj: AttendanceEvent):
         user = request.user
 
@@ -70,6 +84,12 @@ class UnregisterPermission(permissions.IsAuthenticated):
             self.message = "Du må refundere betalingene dine før du kan melde deg av."
             return False
 
+        if self._has_payment_in_progress(obj, user):
+            self.message = (
+                "Betalingen din behandles fortsatt, prøv igjen når den er ferdig."
+            )
+            return False
+
         return True
 
 
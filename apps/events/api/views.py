@@ -1,8 +1,10 @@
+from django.db import transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from guardian.shortcuts import get_objects_for_user
 from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.response import Response
 
 from apps.payment.serializers import PaymentReadOnlySerializer
@@ -26,7 +28,7 @@ from ..models import (
     RuleBundle,
     UserGroupRule,
 )
-from ..utils import handle_attend_event_payment
+from ..tasks import handle_attend_event_payment_task
 from .permissions import (
     ChangeAttendeePermission,
     RegisterPermission,
@@ -64,7 +66,17 @@ class EventViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        return Event.by_registration.get_queryset_for_user(user)
+        return (
+            Event.by_registration.get_queryset_for_user(user)
+            .select_related("author", "image")
+            .prefetch_related(
+                "companies",
+                Prefetch(
+                    "attendance_event",
+                    queryset=AttendanceEvent.objects.with_seat_snapshot(),
+                ),
+            )
+        )
 
 
 class AttendanceEventViewSet(viewsets.ModelViewSet):
@@ -75,7 +87,7 @@ class AttendanceEventViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         events = Event.by_registration.get_queryset_for_user(user)
-        return super().get_queryset().filter(event__in=events)
+        return super().get_queryset().filter(event__in=events).with_seat_snapshot()
 
     @action(
         detail=True,
@@ -91,16 +103,21 @@ class AttendanceEventViewSet(viewsets.ModelViewSet):
         register_serializer.is_valid(raise_exception=True)
 
         data = register_serializer.validated_data
-        attendee = Attendee.objects.create(
-            event=attendance_event,
-            user=user,
+        attendee, message = attendance_event.reserve_seat(
+            user,
             show_as_attending_event=data.get("show_as_attending_event"),
             allow_pictures=data.get("allow_pictures"),
             note=data.get("note"),
         )
+        if not attendee:
+            raise PermissionDenied(message)
 
         if attendance_event.payment():
-            handle_attend_event_payment(attendance_event.event, user)
+            transaction.on_commit(
+                lambda: handle_attend_event_payment_task.delay(
+                    event_id=attendance_event.event_id, user_id=user.id
+                )
+            )
 
         attendee_serializer = AttendeeSerializer(attendee)
         return Response(data=attendee_serializer.data, status=status.HTTP_201_CREATED)
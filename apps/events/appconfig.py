@@ -12,6 +12,17 @@ class EventsConfig(AppConfig):
 
         import apps.events.signals  # noqa: F401
         from apps.events.models import Event, Extras
+        from utils import search
 
         watson.register(Event)
         watson.register(Extras)
+        search.register(
+            Event,
+            fields=[
+                ("title", "A"),
+                ("ingress_short", "B"),
+                ("ingress", "B"),
+                ("description", "C"),
+            ],
+            config="norwegian",
+        )
@@ -35,6 +35,7 @@ from apps.events.models import (
     Reservee,
 )
 from apps.feedback.models import FeedbackRelation
+from apps.payment import status as payment_status
 from apps.payment.models import Payment, PaymentPrice, PaymentRelation
 
 
@@ -298,7 +299,10 @@ def _payment_prices(attendance_event):
 
         for attendee in attendance_event.attending_attendees_qs:
             paymentRelation = PaymentRelation.objects.filter(
-                payment=attendance_event.payment(), user=attendee.user, refunded=False
+                payment=attendance_event.payment(),
+                user=attendee.user,
+                refunded=False,
+                status=payment_status.DONE,
             )
 
             if paymentRelation:
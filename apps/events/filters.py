@@ -1,7 +1,6 @@
 import django_filters
 from django_filters.filters import BaseInFilter, NumberFilter
 from guardian.shortcuts import get_objects_for_user
-from watson import search as watson_search
 
 from apps.events.models import (
     AttendanceEvent,
@@ -12,19 +11,13 @@ from apps.events.models import (
     RuleBundle,
     UserGroupRule,
 )
+from utils.search import SearchFilter
 
 
 class BaseNumberInFilter(BaseInFilter, NumberFilter):
     pass
 
 
-class WatsonFilter(django_filters.CharFilter):
-    def filter(self, queryset, value):
-        if value and value != "":
-            queryset = watson_search.filter(queryset, value)
-        return queryset
-
-
 class EventFilter(django_filters.FilterSet):
     event_start__gte = django_filters.DateTimeFilter(
         field_name="event_start", lookup_expr="gte"
@@ -48,7 +41,7 @@ class EventFilter(django_filters.FilterSet):
     can_attend = django_filters.BooleanFilter(method="filter_can_attend")
     event_type = BaseNumberInFilter(field_name="event_type", lookup_expr="in")
     companies = BaseNumberInFilter(field_name="companies", lookup_expr="in")
-    query = WatsonFilter()
+    query = SearchFilter()
 
     def filter_can_attend(self, queryset, name, value):
         """
@@ -62,15 +55,12 @@ class EventFilter(django_filters.FilterSet):
         if value:
             events_with_attendance = queryset.filter(attendance_event__isnull=False)
             events_without_attendance = queryset.filter(attendance_event__isnull=True)
-            user_attendable_event_pks = []
-            for event in events_with_attendance:
-                response = event.attendance_event.rules_satisfied(self.request.user)
-                can_attend = response.get("status", None)
-                if can_attend:
-                    user_attendable_event_pks.append(event.id)
+            attendable_attendance_events = AttendanceEvent.objects.filter(
+                event__in=events_with_attendance
+            ).filter_rules_satisfied(self.request.user)
 
             user_attendable_events = events_with_attendance.filter(
-                attendance_event__pk__in=user_attendable_event_pks
+                attendance_event__in=attendable_attendance_events
             )
             all_available_events = user_attendable_events | events_without_attendance
             return all_available_events
@@ -123,7 +113,7 @@ class ExtrasFilter(django_filters.FilterSet):
     event = django_filters.ModelChoiceFilter(
         field_name="attendanceevent", queryset=AttendanceEvent.objects.all()
     )
-    query = WatsonFilter()
+    query = SearchFilter()
 
 
 class RuleBundleFilter(django_filters.FilterSet):
@@ -0,0 +1,132 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from apps.authentication.models import OnlineUser as User
+from apps.events.constants import EventType
+from apps.events.models import AttendanceEvent, Attendee, Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay concurrent registrations for a single event against the configured "
+        "database, verify that the event is not oversold and report latencies. "
+        "All created objects are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--registrations", type=int, default=200)
+        parser.add_argument("--capacity", type=int, default=50)
+        parser.add_argument("--workers", type=int, default=32)
+        parser.add_argument(
+            "--waitlist", action="store_true", help="enable the waitlist on the event"
+        )
+        parser.add_argument(
+            "--allow-any-database",
+            action="store_true",
+            help="run even if the database does not support row level locks",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql" and not options["allow_any_database"]:
+            raise CommandError(
+                "Row level locks are only enforced on PostgreSQL, "
+                "use --allow-any-database to run anyway."
+            )
+
+        registrations = options["registrations"]
+        capacity = options["capacity"]
+        prefix = f"loadtest-{uuid.uuid4().hex[:8]}"
+
+        attendance_event = self.create_event(prefix, capacity, options["waitlist"])
+        users = self.create_users(prefix, registrations)
+        try:
+            latencies, rejected = self.replay(
+                attendance_event, users, options["workers"]
+            )
+            self.report(attendance_event, capacity, options["waitlist"], latencies)
+            self.stdout.write(f"Rejected registrations: {rejected}")
+        finally:
+            attendance_event.event.delete()
+            User.objects.filter(username__startswith=prefix).delete()
+
+    @staticmethod
+    def create_event(prefix: str, capacity: int, waitlist: bool) -> AttendanceEvent:
+        now = timezone.now()
+        event = Event.objects.create(
+            title=prefix,
+            event_start=now + timezone.timedelta(days=7),
+            event_end=now + timezone.timedelta(days=7, hours=2),
+            location="Load test",
+            ingress_short="Generated by the registration load test.",
+            ingress="Generated by the registration load test.",
+            description=(
+                "Generated by the registration load test, and deleted afterwards."
+            ),
+            event_type=EventType.SOSIALT,
+            visible=False,
+        )
+        return AttendanceEvent.objects.create(
+            event=event,
+            max_capacity=capacity,
+            waitlist=waitlist,
+            guest_attendance=True,
+            registration_start=now - timezone.timedelta(minutes=1),
+            registration_end=now + timezone.timedelta(days=1),
+            unattend_deadline=now + timezone.timedelta(days=1),
+        )
+
+    @staticmethod
+    def create_users(prefix: str, count: int):
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f"{prefix}-{index}", email=f"{prefix}-{index}@example.com"
+                )
+                for index in range(count)
+            ]
+        )
+        return list(User.objects.filter(username__startswith=prefix))
+
+    @staticmethod
+    def replay(attendance_event: AttendanceEvent, users, workers: int):
+        def register(user):
+            try:
+                event = AttendanceEvent.objects.get(pk=attendance_event.pk)
+                start = time.perf_counter()
+                attendee, _ = event.reserve_seat(user)
+                return time.perf_counter() - start, attendee is not None
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(register, users))
+
+        latencies = sorted(latency for latency, _ in results)
+        rejected = sum(1 for _, accepted in results if not accepted)
+        return latencies, rejected
+
+    def report(self, attendance_event, capacity: int, waitlist: bool, latencies):
+        attendees = Attendee.objects.filter(event=attendance_event)
+        total = attendees.count()
+        distinct_users = attendees.values("user").distinct().count()
+
+        if total != distinct_users:
+            raise CommandError(f"{total - distinct_users} duplicate registrations")
+        if not waitlist and total > capacity:
+            raise CommandError(f"Oversold: {total} attendees for {capacity} seats")
+
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"Attendees: {min(total, capacity)}, waitlist: {max(total - capacity, 0)}"
+        )
+        self.stdout.write(
+            f"Latency p50: {median(latencies) * 1000:.1f} ms, "
+            f"p99: {p99 * 1000:.1f} ms, max: {latencies[-1] * 1000:.1f} ms"
+        )
+        self.stdout.write(self.style.SUCCESS("No oversold seats"))
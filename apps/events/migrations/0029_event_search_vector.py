@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from utils.search import AddSearchVector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0028_auto_20200525_1440"),
+    ]
+
+    operations = [
+        AddSearchVector(
+            model_name="event",
+            fields=[
+                ("title", "A"),
+                ("ingress_short", "B"),
+                ("ingress", "B"),
+                ("description", "C"),
+            ],
+            config="norwegian",
+        ),
+    ]
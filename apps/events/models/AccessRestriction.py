@@ -11,6 +11,22 @@ from apps.authentication.constants import FieldOfStudyType
 from .Event import User
 
 
+class UserRuleFacts:
+    """
+    The facts about a user that access rules are evaluated against, loaded once.
+
+    Can be passed to rules and rule bundles in place of the user when the same user
+    is checked against the rules of many events.
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+        self.field_of_study = user.field_of_study
+        self.year = user.year
+        self.is_member = user.is_member
+        self.group_ids = set(user.groups.values_list("id", flat=True))
+
+
 class Rule(models.Model):
     """
     Super class for a rule object
@@ -146,7 +162,9 @@ class UserGroupRule(Rule):
     group = models.ForeignKey(Group, blank=False, null=False, on_delete=models.CASCADE)
 
     def satisfies_constraint(self, user: User) -> bool:
-        return self.group in user.groups.all()
+        if isinstance(user, UserRuleFacts):
+            return self.group_id in user.group_ids
+        return user.groups.filter(pk=self.group_id).exists()
 
     def __str__(self):
         if self.offset > 0:
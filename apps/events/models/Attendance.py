@@ -7,9 +7,11 @@ from django.contrib.auth.models import Group
 from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.core.mail import EmailMessage
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Prefetch
 from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 from guardian.shortcuts import assign_perm
 
@@ -19,15 +21,93 @@ from apps.marks.models import get_expiration_date
 from apps.payment import status as payment_status
 from apps.payment.mixins import PaymentMixin
 
+from .AccessRestriction import UserRuleFacts
 from .Event import User, logger
 from .Extras import Extras
 
 
+class SeatSnapshot:
+    """
+    Ordered user ids of all attendees of an attendance event, including the waitlist.
+
+    Seat counts and waitlist positions are derived from this without further queries.
+    The number of attendee seats is passed in on every lookup, since capacity and
+    reservations can be changed on the attendance event after the snapshot was taken.
+    """
+
+    def __init__(self, user_ids):
+        self.user_ids = list(user_ids)
+        self.positions = {user_id: index for index, user_id in enumerate(self.user_ids)}
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def number_of_attendees(self, seats):
+        return min(len(self.user_ids), max(seats, 0))
+
+    def number_on_waitlist(self, seats):
+        return len(self.user_ids) - self.number_of_attendees(seats)
+
+    def contains(self, user_id):
+        return user_id in self.positions
+
+    def waitlist_position(self, user_id, seats):
+        """1-indexed place on the waitlist, or 0 if the user is not on the waitlist"""
+        position = self.positions.get(user_id)
+        if position is None or position < max(seats, 0):
+            return 0
+        return position - max(seats, 0) + 1
+
+
+class AttendanceEventQuerySet(models.QuerySet):
+    def with_seat_snapshot(self):
+        """
+        Load everything needed for seat accounting for all events in the queryset
+        in a constant number of queries.
+        """
+        return (
+            self.select_related("reserved_seats")
+            .annotate(reservees_count=Count("reserved_seats__reservees"))
+            .prefetch_related(
+                Prefetch(
+                    "attendees",
+                    queryset=Attendee.objects.only("id", "event_id", "user_id"),
+                    to_attr="seat_snapshot_attendees",
+                )
+            )
+        )
+
+    def with_rules(self):
+        """Prefetch all rule bundles and their rules for the events in the queryset"""
+        return self.prefetch_related(
+            "rule_bundles__field_of_study_rules",
+            "rule_bundles__grade_rules",
+            "rule_bundles__user_group_rules",
+        )
+
+    def filter_rules_satisfied(self, user):
+        """
+        Attendance events in the queryset which the user satisfies the rules of.
+
+        The user's facts are loaded once and the rules of all events are prefetched,
+        so the number of queries does not grow with the number of events.
+        """
+        facts = UserRuleFacts(user)
+        satisfied_pks = []
+        for attendance_event in self.with_rules():
+            response = attendance_event.rules_satisfied(facts)
+            if response and response.get("status"):
+                satisfied_pks.append(attendance_event.pk)
+        return self.filter(pk__in=satisfied_pks)
+
+
 class AttendanceEvent(PaymentMixin, models.Model):
     """
     Events that require special considerations regarding attendance.
     """
 
+    objects = AttendanceEventQuerySet.as_manager()
+
     event = models.OneToOneField(
         "Event",
         primary_key=True,
@@ -118,17 +198,34 @@ class AttendanceEvent(PaymentMixin, models.Model):
         """List of attendees who haven't paid"""
         return list(self.attendees.filter(paid=False))
 
+    @cached_property
+    def seat_snapshot(self):
+        """Attendee order for this event, loaded once per instance"""
+        if hasattr(self, "seat_snapshot_attendees"):
+            attendees = self.seat_snapshot_attendees
+        elif "attendees" in getattr(self, "_prefetched_objects_cache", {}):
+            # The event archive prefetches all attendees
+            attendees = self.attendees.all()
+        else:
+            return SeatSnapshot(self.attendees.values_list("user_id", flat=True))
+        return SeatSnapshot(attendee.user_id for attendee in attendees)
+
+    def invalidate_seat_snapshot(self):
+        """Has to be called when attendees or reservees are added to or removed"""
+        self.__dict__.pop("seat_snapshot", None)
+        self.__dict__.pop("seat_snapshot_attendees", None)
+        self.__dict__.pop("reservees_count", None)
+        getattr(self, "_prefetched_objects_cache", {}).pop("attendees", None)
+
     @property
     def number_of_attendees(self):
         """ Count of all attendees not in waiting list """
-        # We need to use len() instead of .count() here, because of the prefetched event archive
-        return len(self.attending_attendees_qs)
+        return self.seat_snapshot.number_of_attendees(self.number_of_attendee_seats)
 
     @property
     def number_on_waitlist(self):
         """ Count of all attendees on waiting list """
-        # We need to use len() instead of .count() here, because of the prefetched event archive
-        return len(self.waitlist_qs)
+        return self.seat_snapshot.number_on_waitlist(self.number_of_attendee_seats)
 
     @property
     def number_of_attendee_seats(self):
@@ -143,7 +240,11 @@ class AttendanceEvent(PaymentMixin, models.Model):
     @property
     def number_of_reserved_seats_taken(self):
         """Returns number of reserved seats which have been filled"""
-        return self.reserved_seats.number_of_seats_taken if self.has_reservation else 0
+        if not self.has_reservation:
+            return 0
+        if hasattr(self, "reservees_count"):
+            return self.reservees_count
+        return self.reserved_seats.number_of_seats_taken
 
     @property
     def number_of_seats_taken(self):
@@ -297,7 +398,7 @@ class AttendanceEvent(PaymentMixin, models.Model):
         response = {"status": False, "message": "", "status_code": None}
 
         # User is already an attendee
-        if self.attendees.filter(user=user).exists():
+        if self.is_attendee(user):
             response["message"] = "Du er allerede meldt på dette arrangementet."
             response["status_code"] = 404
             return response
@@ -366,6 +467,33 @@ class AttendanceEvent(PaymentMixin, models.Model):
         response["status"] = True
         return response
 
+    def reserve_seat(self, user: User, **attendee_fields) -> ("Attendee", str):
+        """
+        Registers the user as an attendee while holding a lock on this attendance event.
+
+        Concurrent registrations for the same event are serialized by the row lock, so
+        the checks for duplicate registrations and free seats cannot race, and the
+        attendee's place on the event or the waitlist follows the order in which the
+        lock was acquired.
+        The transaction only covers the seat itself, side effects like payment handling
+        should be deferred until after it has been committed.
+        Full eligibility is not checked here, use is_eligible_for_signup for that.
+        """
+        with transaction.atomic():
+            locked_event = AttendanceEvent.objects.select_for_update().get(pk=self.pk)
+
+            if locked_event.is_attendee(user):
+                return None, _("Du er allerede meldt på dette arrangementet.")
+            if not locked_event.room_on_event:
+                return None, _("Det er ikke mer plass på dette arrangementet.")
+
+            attendee = Attendee.objects.create(
+                event=locked_event, user=user, **attendee_fields
+            )
+
+        self.invalidate_seat_snapshot()
+        return attendee, ""
+
     def get_minimum_rule_offset_for_user(self, user: User):
         offsets_deltas = [
             rule_bundle.get_minimum_offset_for_user(user)
@@ -429,11 +557,16 @@ class AttendanceEvent(PaymentMixin, models.Model):
     def rules_satisfied(self, user):
         """
         Checks a user against rules applied to an attendance event
+        The user can also be given as UserRuleFacts when checking many events.
         """
         # If the event has guest attendance, allow absolutely anyone
         if self.guest_attendance:
             return {"status": True, "status_code": 201}
 
+        # Evaluating every rule against the same facts avoids repeated user lookups
+        if not isinstance(user, UserRuleFacts):
+            user = UserRuleFacts(user)
+
         # If the user is not a member, return False right away
         # TODO check for guest list
         if not user.is_member:
@@ -443,33 +576,33 @@ class AttendanceEvent(PaymentMixin, models.Model):
                 "status_code": 400,
             }
 
+        rule_bundles = self.rule_bundles.all()
+
         # If there are no rule_bundles on this object, all members of Online are allowed.
-        if not self.rule_bundles.exists() and user.is_member:
+        if not rule_bundles and user.is_member:
             return {"status": True, "status_code": 200}
 
         # Check all rule bundles
         responses = []
 
         # If one satisfies, return true, else append to the error list
-        for rule_bundle in self.rule_bundles.all():
+        for rule_bundle in rule_bundles:
             responses.extend(rule_bundle.satisfied(user, self.registration_start))
 
         return self._process_rulebundle_satisfaction_responses(responses)
 
     def is_attendee(self, user):
-        return self.attendees.filter(user=user).exists()
+        return self.seat_snapshot.contains(user.id)
 
     def is_on_waitlist(self, user):
-        return any(a.user == user for a in self.waitlist_qs)
+        return self.what_place_is_user_on_wait_list(user, only_if_enabled=False) > 0
 
-    def what_place_is_user_on_wait_list(self, user):
-        if self.waitlist:
-            waitlist = self.waitlist_qs
-            if waitlist:
-                for attendee_object in waitlist:
-                    if attendee_object.user == user:
-                        return list(waitlist).index(attendee_object) + 1
-        return 0
+    def what_place_is_user_on_wait_list(self, user, only_if_enabled=True):
+        if only_if_enabled and not self.waitlist:
+            return 0
+        return self.seat_snapshot.waitlist_position(
+            user.id, self.number_of_attendee_seats
+        )
 
     def payment(self):
         try:
@@ -565,6 +698,7 @@ class AttendanceEvent(PaymentMixin, models.Model):
 
     def on_payment_refunded(self, payment_relation):
         Attendee.objects.get(event=self, user=payment_relation.user).delete()
+        self.invalidate_seat_snapshot()
 
     def get_payment_receipt_items(self, payment_relation) -> List[dict]:
         items = [
@@ -678,6 +812,7 @@ class Attendee(models.Model):
             self.event.bump_waitlist_for_x_users()
 
         super(Attendee, self).delete()
+        self.event.invalidate_seat_snapshot()
 
     @property
     def payment_relations(self):
@@ -729,7 +864,7 @@ class Attendee(models.Model):
         return delays.first().valid_to
 
     def is_on_waitlist(self):
-        return self in self.event.waitlist_qs
+        return self.event.is_on_waitlist(self.user)
 
     # Unattend user from event
     def unattend(self, admin_user):
@@ -779,6 +914,7 @@ class Attendee(models.Model):
             using=using,
             update_fields=update_fields,
         )
+        self.event.invalidate_seat_snapshot()
 
         if self.event.event.organizer:
             assign_perm("events.change_attendee", self.event.event.organizer, obj=self)
@@ -865,6 +1001,7 @@ class Reservee(models.Model):
             using=using,
             update_fields=update_fields,
         )
+        self.reservation.attendance_event.invalidate_seat_snapshot()
 
         if self.reservation.attendance_event.event.organizer:
             assign_perm(
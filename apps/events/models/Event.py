@@ -78,23 +78,31 @@ class EventOrderedByRegistration(models.Manager):
             event is visible AND (event has NO group restriction OR user having access to restricted event)
             OR the user is attending the event themselves
         """
-        group_restriction_query = Q(group_restriction__isnull=True) | Q(
-            group_restriction__groups__in=user.groups.all()
-        )
-        is_attending_query = (
-            (
-                Q(attendance_event__isnull=False)
-                & Q(attendance_event__attendees__user=user)
-            )
-            if not user.is_anonymous
-            else Q()
-        )
-        is_visible_query = Q(visible=True)
-        return (
-            self.get_queryset()
-            .filter(group_restriction_query & is_visible_query | is_attending_query)
-            .distinct()
-        )
+        return self.get_queryset().filter(_get_visibility_query(user)).distinct()
+
+
+class EventQuerySet(models.QuerySet):
+    def visible_for_user(self, user: User):
+        """
+        Events the user is allowed to see, like Event.can_display, but checked in the
+        database.
+        Visibility is checked in a subquery, so the queryset has no duplicates.
+        """
+        visible_events = self.model.objects.filter(_get_visibility_query(user))
+        return self.filter(pk__in=visible_events.values("pk"))
+
+
+def _get_visibility_query(user: User) -> Q:
+    group_restriction_query = Q(group_restriction__isnull=True) | Q(
+        group_restriction__groups__in=user.groups.all()
+    )
+    is_attending_query = (
+        (Q(attendance_event__isnull=False) & Q(attendance_event__attendees__user=user))
+        if not user.is_anonymous
+        else Q()
+    )
+    is_visible_query = Q(visible=True)
+    return group_restriction_query & is_visible_query | is_attending_query
 
 
 class Event(models.Model):
@@ -106,7 +114,7 @@ class Event(models.Model):
     IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".gif", ".png", ".tif", ".tiff"]
 
     # Managers
-    objects = models.Manager()
+    objects = EventQuerySet.as_manager()
     by_registration = EventOrderedByRegistration()
 
     author = models.ForeignKey(
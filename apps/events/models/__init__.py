@@ -4,6 +4,7 @@ from .AccessRestriction import (
     Rule,
     RuleBundle,
     UserGroupRule,
+    UserRuleFacts,
 )
 from .Attendance import (
     AttendanceEvent,
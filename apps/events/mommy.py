@@ -6,7 +6,7 @@ from django.core.mail import EmailMessage
 from django.utils import timezone
 
 from apps.events.models import AttendanceEvent
-from apps.marks.models import Mark, MarkUser
+from apps.marks.models import Mark
 from apps.mommy import schedule
 from apps.mommy.registry import Task
 
@@ -58,12 +58,8 @@ class SetEventMarks(Task):
         )
         mark.save()
 
-        for user in attendance_event.not_attended():
-            user_entry = MarkUser()
-            user_entry.user = user
-            user_entry.mark = mark
-            user_entry.save()
-            logger.info("Mark given to: " + str(user_entry.user))
+        for user in mark.give_to(attendance_event.not_attended()):
+            logger.info("Mark given to: " + str(user))
 
         attendance_event.marks_has_been_set = True
         attendance_event.save()
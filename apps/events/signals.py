@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Attendee, Event
+from .utils import invalidate_calendar, invalidate_calendar_event
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_calendar(sender, instance: Event, **kwargs):
+    invalidate_calendar_event(instance.id)
+
+
+@receiver(post_save, sender=Attendee)
+@receiver(post_delete, sender=Attendee)
+def invalidate_attendee_calendar(sender, instance: Attendee, **kwargs):
+    invalidate_calendar("user-%s" % instance.user.username)
@@ -0,0 +1,23 @@
+from django.core.exceptions import ObjectDoesNotExist
+
+from apps.authentication.models import OnlineUser as User
+from onlineweb4.celery import app as celery_app
+
+from .models import Event
+from .utils import handle_attend_event_payment
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(ObjectDoesNotExist,),
+    retry_kwargs={"max_retries": 3, "countdown": 60},
+)
+def handle_attend_event_payment_task(_, event_id: int, user_id: int):
+    """
+    Set up payment delays and notify the user about payment after registration.
+    Runs outside of the registration request, so the seat lock is held as briefly as
+    possible.
+    """
+    event = Event.objects.get(pk=event_id)
+    user = User.objects.get(pk=user_id)
+    handle_attend_event_payment(event, user)
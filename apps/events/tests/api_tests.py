@@ -1,4 +1,6 @@
 from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django_dynamic_fixture import G
@@ -6,7 +8,7 @@ from rest_framework import status
 
 from apps.authentication.models import OnlineUser
 from apps.companyprofile.models import Company
-from apps.events.models import CompanyEvent, GroupRestriction
+from apps.events.models import CompanyEvent, GroupRestriction, Reservation, Reservee
 from apps.online_oidc_provider.test import OIDCTestCase
 from apps.profiles.models import Privacy
 
@@ -61,6 +63,62 @@ class EventsAPITestCase(OIDCTestCase):
 
         self.assertIn(self.event.title, event_titles_list)
 
+    def test_events_list_queries_do_not_grow_with_attendees_and_reservations(self):
+        url = reverse("events_events-list")
+        # Warm up caches, like the content types, which are loaded by the first request
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as one_event:
+            self.client.get(url)
+        event = generate_event(organizer=self.committee)
+        event.attendance_event.max_capacity = 20
+        event.attendance_event.save()
+        G(CompanyEvent, company=G(Company), event=event)
+        generate_attendee(event, "test3", "5678")
+        generate_attendee(event, "test4", "8765")
+        reservation = G(Reservation, attendance_event=event.attendance_event, seats=5)
+        G(Reservee, reservation=reservation)
+
+        # Event.images is the only thing still fetched per event
+        with self.assertNumQueries(len(one_event) + 1):
+            response = self.client.get(url)
+
+        event_data = next(
+            event_data
+            for event_data in response.json().get("results")
+            if event_data.get("id") == event.id
+        )
+        # Two attendees and five reserved seats
+        self.assertEqual(event_data.get("number_of_seats_taken"), 7)
+
+    def test_legacy_events_list_queries_do_not_grow_with_attendees(self):
+        G(CompanyEvent, company=G(Company), event=self.event)
+        # Warm up caches, like the content types, which are loaded by the first request
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as one_event:
+            self.client.get(self.url)
+        event = generate_event(organizer=self.committee)
+        event.attendance_event.max_capacity = 20
+        event.attendance_event.save()
+        G(CompanyEvent, company=G(Company), event=event)
+        generate_attendee(event, "test3", "5678")
+        generate_attendee(event, "test4", "8765")
+        reservation = G(Reservation, attendance_event=event.attendance_event, seats=5)
+        G(Reservee, reservation=reservation)
+
+        with self.assertNumQueries(len(one_event)):
+            response = self.client.get(self.url)
+
+        event_data = next(
+            event_data
+            for event_data in response.json().get("results")
+            if event_data.get("id") == event.id
+        )
+        # Two attendees and five reserved seats
+        self.assertEqual(
+            event_data.get("attendance_event").get("number_of_seats_taken"), 7
+        )
+        self.assertEqual(len(event_data.get("company_event")), 1)
+
     def test_filter_companies_in_event_list(self):
         onlinecorp: Company = G(Company, name="onlinecorp")
         bedpres_with_onlinecorp = generate_event(organizer=self.committee)
@@ -47,6 +47,31 @@ class EventModelTest(TestCase):
         self.assertIn(company1, companies)
         self.assertIn(company2, companies)
 
+    def test_visible_for_user_matches_can_display(self):
+        allowed_group = G(Group)
+        allowed_user = G(User, groups=[allowed_group])
+        denied_user = G(User)
+
+        unrestricted_event = G(Event, visible=True)
+        restricted_event = G(Event, visible=True)
+        G(GroupRestriction, event=restricted_event, groups=[allowed_group])
+        G(AttendanceEvent, event=restricted_event)
+        G(Event, visible=False)
+
+        self.assertEqual(
+            set(Event.objects.visible_for_user(allowed_user)),
+            {unrestricted_event, restricted_event},
+        )
+        self.assertEqual(
+            set(Event.objects.visible_for_user(denied_user)), {unrestricted_event}
+        )
+
+        attend_user_to_event(restricted_event, denied_user)
+        self.assertEqual(
+            set(Event.objects.visible_for_user(denied_user)),
+            {unrestricted_event, restricted_event},
+        )
+
 
 class AttendanceEventModelTest(TestCase):
     def setUp(self):
@@ -137,6 +162,53 @@ class AttendanceEventModelTest(TestCase):
         self.assertEqual(self.attendance_event.number_of_attendees, 2)
         self.assertEqual(self.attendance_event.number_on_waitlist, 2)
 
+    def test_waitlist_positions(self):
+        self.attendance_event.waitlist = True
+        G(Attendee, event=self.attendance_event, user=self.user)
+        user1 = G(User, username="jan", first_name="jan")
+        G(Attendee, event=self.attendance_event, user=user1)
+        user2 = G(User, username="per", first_name="per")
+        G(Attendee, event=self.attendance_event, user=user2)
+        user3 = G(User, username="gro", first_name="gro")
+        G(Attendee, event=self.attendance_event, user=user3)
+
+        self.assertFalse(self.attendance_event.is_on_waitlist(user1))
+        self.assertTrue(self.attendance_event.is_on_waitlist(user3))
+        self.assertEqual(
+            self.attendance_event.what_place_is_user_on_wait_list(user1), 0
+        )
+        self.assertEqual(
+            self.attendance_event.what_place_is_user_on_wait_list(user2), 1
+        )
+        self.assertEqual(
+            self.attendance_event.what_place_is_user_on_wait_list(user3), 2
+        )
+
+        self.attendance_event.max_capacity = 3
+        self.assertEqual(self.attendance_event.number_of_attendees, 3)
+        self.assertEqual(
+            self.attendance_event.what_place_is_user_on_wait_list(user3), 1
+        )
+
+    def test_seat_accounting_with_seat_snapshot_is_query_free(self):
+        G(Attendee, event=self.attendance_event, user=self.user)
+        user1 = G(User, username="jan", first_name="jan")
+        G(Attendee, event=self.attendance_event, user=user1)
+        user2 = G(User, username="per", first_name="per")
+        G(Attendee, event=self.attendance_event, user=user2)
+
+        attendance_event = AttendanceEvent.objects.with_seat_snapshot().get(
+            pk=self.attendance_event.pk
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(attendance_event.number_of_attendees, 2)
+            self.assertEqual(attendance_event.number_on_waitlist, 1)
+            self.assertEqual(attendance_event.number_of_seats_taken, 2)
+            self.assertEqual(attendance_event.free_seats, 0)
+            self.assertTrue(attendance_event.is_attendee(user1))
+            self.assertTrue(attendance_event.is_on_waitlist(user2))
+
     def test_reserved_seats(self):
         reservation = G(Reservation, attendance_event=self.attendance_event, seats=2)
         G(
@@ -189,6 +261,39 @@ class AttendanceEventModelTest(TestCase):
         self.assertEqual(self.attendance_event.number_of_attendees, 2)
         self.assertEqual(self.attendance_event.number_of_seats_taken, 4)
 
+    def test_reserve_seat(self):
+        self.attendance_event.save()
+        attendee, message = self.attendance_event.reserve_seat(
+            self.user, note="Vegetar"
+        )
+
+        self.assertEqual(attendee.user, self.user)
+        self.assertEqual(attendee.note, "Vegetar")
+        self.assertEqual(message, "")
+        self.assertTrue(self.attendance_event.is_attendee(self.user))
+
+    def test_reserve_seat_twice(self):
+        self.attendance_event.save()
+        self.attendance_event.reserve_seat(self.user)
+
+        attendee, message = self.attendance_event.reserve_seat(self.user)
+
+        self.assertIsNone(attendee)
+        self.assertEqual(message, "Du er allerede meldt på dette arrangementet.")
+        self.assertEqual(self.attendance_event.attendees.count(), 1)
+
+    def test_reserve_seat_when_full_without_waitlist(self):
+        self.attendance_event.waitlist = False
+        self.attendance_event.save()
+        self.attendance_event.reserve_seat(G(User, username="jan"))
+        self.attendance_event.reserve_seat(G(User, username="per"))
+
+        attendee, message = self.attendance_event.reserve_seat(self.user)
+
+        self.assertIsNone(attendee)
+        self.assertEqual(message, "Det er ikke mer plass på dette arrangementet.")
+        self.assertEqual(self.attendance_event.number_of_attendees, 2)
+
     def test_sign_up_with_no_rules_no_marks(self):
         # The user should be able to attend now, since the event has no rule bundles.
         response = self.attendance_event.is_eligible_for_signup(self.user)
@@ -308,6 +413,31 @@ class AttendanceEventModelTest(TestCase):
         self.assertTrue(response["status"])
         self.assertEqual(212, response["status_code"])
 
+    def test_filter_rules_satisfied(self):
+        self.attendance_event.save()
+        group = G(Group, name="Testgroup")
+        group_rule = G(UserGroupRule, group=group, offset=0)
+        rule_bundle = G(RuleBundle, description="")
+        rule_bundle.user_group_rules.add(group_rule)
+        self.attendance_event.rule_bundles.add(rule_bundle)
+        open_attendance_event = G(
+            AttendanceEvent,
+            event=G(Event),
+            registration_start=self.now - datetime.timedelta(hours=1),
+        )
+        attendance_events = AttendanceEvent.objects.filter(
+            pk__in=[self.attendance_event.pk, open_attendance_event.pk]
+        )
+
+        satisfied = attendance_events.filter_rules_satisfied(self.user)
+        self.assertEqual(list(satisfied), [open_attendance_event])
+
+        self.user.groups.add(group)
+        satisfied = attendance_events.filter_rules_satisfied(self.user)
+        self.assertEqual(
+            list(satisfied), [self.attendance_event, open_attendance_event]
+        )
+
     def test_rule_offset_and_mark_offset(self):
         group: Group = G(Group, name="Testgroup")
         group_rule: GradeRule = G(UserGroupRule, group=group, offset=24)
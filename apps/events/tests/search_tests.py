@@ -0,0 +1,93 @@
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.db import NotSupportedError, connection
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from apps.events.models import Event
+from apps.events.tests.utils import generate_event
+from apps.gallery.models import ResponsiveImage
+from utils import search
+from utils.search import AddSearchVector, PostgresSearchBackend
+
+SEARCH_VECTOR_MIGRATIONS = (
+    ("article", "apps.article.migrations.0014_article_search_vector"),
+    ("authentication", "apps.authentication.migrations.0050_onlineuser_search_vector"),
+    ("events", "apps.events.migrations.0029_event_search_vector"),
+    ("mailinglists", "apps.mailinglists.migrations.0002_search_vector"),
+)
+
+
+class PostgresSearchQueryTestCase(TestCase):
+    def test_every_word_is_matched_as_a_prefix(self):
+        self.assertEqual(
+            PostgresSearchBackend._to_tsquery("Bedpres med: Online!"),
+            "Bedpres:* & med:* & Online:*",
+        )
+
+    def test_search_vectors_require_postgres_12(self):
+        operation = AddSearchVector(model_name="event", fields=[("title", "A")])
+        schema_editor = SimpleNamespace(
+            connection=SimpleNamespace(vendor="postgresql", pg_version=110000),
+            execute=mock.Mock(),
+        )
+
+        with self.assertRaisesMessage(NotSupportedError, "PostgreSQL 12"):
+            operation._add("events", schema_editor, state=None)
+        schema_editor.execute.assert_not_called()
+
+
+class SearchVectorRegistrationTestCase(TestCase):
+    def test_registered_search_vectors_match_the_migrations(self):
+        # The test database gets its search vectors from the registrations
+        for app_label, module in SEARCH_VECTOR_MIGRATIONS:
+            for operation in import_module(module).Migration.operations:
+                model = apps.get_model(app_label, operation.model_name)
+                self.assertEqual(
+                    search._search_vectors[model], (operation.fields, operation.config)
+                )
+
+
+@skipUnless(connection.vendor == "postgresql", "Search vectors require PostgreSQL")
+class PostgresSearchBackendTestCase(TestCase):
+    def setUp(self):
+        self.backend = PostgresSearchBackend()
+
+    def create_event(self, **kwargs) -> Event:
+        event = generate_event()
+        Event.objects.filter(pk=event.pk).update(
+            title="", ingress_short="", ingress="", description="", **kwargs
+        )
+        return event
+
+    def test_search_matches_word_prefixes(self):
+        event = self.create_event(title="Bedriftspresentasjon med Online")
+        self.create_event(title="Julebord")
+
+        results = self.backend.search(Event.objects.all(), "bedrift onl")
+
+        self.assertEqual(list(results), [event])
+
+    def test_results_are_ranked_by_field_weight(self):
+        in_description = self.create_event(description="Kurs i Python")
+        in_title = self.create_event(title="Python")
+
+        results = self.backend.search(Event.objects.all(), "python")
+
+        self.assertEqual(list(results), [in_title, in_description])
+
+    def test_search_without_words_matches_nothing(self):
+        self.create_event(title="Kurs")
+
+        self.assertEqual(list(self.backend.search(Event.objects.all(), "!?")), [])
+
+    def test_unregistered_models_fall_back_to_watson(self):
+        G(ResponsiveImage, name="Kurs")
+
+        with mock.patch("utils.search.WatsonSearchBackend.search") as watson_search:
+            self.backend.search(ResponsiveImage.objects.all(), "kurs")
+
+        watson_search.assert_called_once()
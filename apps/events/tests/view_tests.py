@@ -15,6 +15,7 @@ from apps.authentication.models import Membership, OnlineGroup
 from apps.marks.models import MarkRuleSet
 from apps.notifications.constants import PermissionType
 from apps.notifications.models import Permission
+from apps.payment import status as payment_status
 from apps.payment.models import PaymentDelay, PaymentPrice
 
 from ..constants import EventType
@@ -153,6 +154,19 @@ class EventsDetailPayment(EventsTestMixin, TestCase):
         self.assertEqual(context["payment_delay"], None)
         self.assertEqual(context["payment_relation_id"], payment_relation.id)
 
+    def test_payment_processing_is_not_paid(self):
+        generate_payment(self.event)
+        attend_user_to_event(self.event, self.user)
+        for relation_status in (payment_status.PROCESSING, payment_status.FAILED):
+            pay_for_event(self.event, self.user, status=relation_status)
+
+        response = self.client.get(self.event_url)
+        context = response.context
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(context["user_paid"], False)
+        self.assertEqual(context["payment_relation_id"], None)
+
     def test_payment_attended_with_delay(self):
         payment = generate_payment(self.event)
         payment_delay = add_payment_delay(payment, self.user)
@@ -361,8 +375,9 @@ class EventsAttend(EventsTestMixin, TestCase):
         self.assertRedirects(response, event.get_absolute_url())
         self.assertInMessages("Du er allerede meldt på dette arrangementet.", response)
 
+    @patch("django.db.transaction.on_commit", side_effect=lambda callback: callback())
     @patch("captcha.fields.client.submit")
-    def test_attend_with_payment_creates_paymentdelay(self, mocked_submit):
+    def test_attend_with_payment_creates_paymentdelay(self, mocked_submit, _):
         mocked_submit.return_value = RecaptchaResponse(is_valid=True)
         event = G(Event)
         G(
@@ -475,6 +490,47 @@ class EventsUnattend(EventsTestMixin, TestCase):
             response,
         )
 
+    def test_unattend_payment_processing(self):
+        event = G(Event, event_start=timezone.now() + timedelta(days=1))
+        G(
+            AttendanceEvent,
+            event=event,
+            unattend_deadline=timezone.now() + timedelta(days=1),
+        )
+        attend_user_to_event(event, self.user)
+        generate_payment(event)
+        url = reverse("unattend_event", args=(event.id,))
+
+        for relation_status in (payment_status.PROCESSING, payment_status.PENDING):
+            relation = pay_for_event(event, self.user, status=relation_status)
+
+            response = self.client.post(url, follow=True, HTTP_HOST="example.com")
+
+            self.assertRedirects(response, event.get_absolute_url())
+            self.assertInMessages(
+                "Du har betalt for arrangementet og må refundere "
+                "før du kan melde deg av",
+                response,
+            )
+            relation.delete()
+
+    def test_unattend_payment_failed(self):
+        event = G(Event, event_start=timezone.now() + timedelta(days=1))
+        G(
+            AttendanceEvent,
+            event=event,
+            unattend_deadline=timezone.now() + timedelta(days=1),
+        )
+        attend_user_to_event(event, self.user)
+        generate_payment(event)
+        pay_for_event(event, self.user, status=payment_status.FAILED)
+        url = reverse("unattend_event", args=(event.id,))
+
+        response = self.client.post(url, follow=True, HTTP_HOST="example.com")
+
+        self.assertRedirects(response, event.get_absolute_url())
+        self.assertInMessages("Du ble meldt av arrangementet.", response)
+
     def test_unattend_payment_removes_payment_delays(self):
         event = G(Event, event_start=timezone.now() + timedelta(days=1))
         G(
@@ -749,3 +805,36 @@ class EventsCalendar(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_events_ics_not_modified_with_etag(self):
+        event = generate_event()
+        url = reverse("event_ics", args=(event.id,))
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_events_ics_not_modified_since_last_modified(self):
+        event = generate_event()
+        url = reverse("event_ics", args=(event.id,))
+
+        response = self.client.get(url)
+        last_modified = response["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_events_ics_is_invalidated_when_event_changes(self):
+        event = generate_event()
+        url = reverse("event_ics", args=(event.id,))
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        event.title = "Endret tittel"
+        event.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b"SUMMARY:Endret tittel", response.content)
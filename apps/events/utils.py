@@ -1,15 +1,21 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import logging
+import uuid
+from typing import List
 
 import icalendar
 from django.conf import settings
 from django.contrib.humanize.templatetags.humanize import naturaltime
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.core.mail import EmailMessage
 from django.core.signing import BadSignature, Signer
 from django.http import HttpResponse
 from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from pytz import timezone as tz
 
 from apps.authentication.models import OnlineGroup
@@ -17,6 +23,7 @@ from apps.authentication.models import OnlineUser as User
 from apps.events.models import Attendee, Event, Extras
 from apps.notifications.constants import PermissionType
 from apps.notifications.utils import send_message_to_users
+from apps.payment import status as payment_status
 from apps.payment.models import PaymentDelay, PaymentRelation
 
 
@@ -118,7 +125,7 @@ class Calendar(object):
 
     def response(self):
         """Returns a response object"""
-        response = HttpResponse(self.cal.to_ical(), content_type="text/calendar")
+        response = HttpResponse(self.output(), content_type="text/calendar")
         response["Content-Type"] = "text/calendar; charset=utf-8"
         response["Content-Disposition"] = (
             "attachment; filename=" + self.filename + ".ics"
@@ -126,7 +133,49 @@ class Calendar(object):
         return response
 
 
+# Calendar clients poll the feeds every few minutes, so rendered feeds and the VEVENT of
+# each event are cached and invalidated from the signals in apps.events.signals.
+CALENDAR_CACHE_PREFIX = "events:ical"
+# Feeds are limited by time as well, so they are rendered again at least this often.
+CALENDAR_FEED_TIMEOUT = 15 * 60
+
+
+def _calendar_scope_key(scope: str) -> str:
+    return "%s:version:%s" % (CALENDAR_CACHE_PREFIX, scope)
+
+
+def _calendar_vevent_key(event_id: int) -> str:
+    return "%s:vevent:%s" % (CALENDAR_CACHE_PREFIX, event_id)
+
+
+def get_calendar_version(*scopes: str) -> str:
+    """Combined version of the given scopes, changes when any of them is invalidated"""
+    keys = [_calendar_scope_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+    return "-".join(str(versions[key]) for key in keys)
+
+
+def invalidate_calendar(scope: str):
+    cache.delete(_calendar_scope_key(scope))
+
+
+def invalidate_calendar_event(event_id: int):
+    cache.delete(_calendar_vevent_key(event_id))
+    invalidate_calendar("events")
+
+
 class EventCalendar(Calendar):
+    def __init__(self):
+        super().__init__()
+        self.feed_name = None
+        self.feed_scopes = []
+        self.feed_event_ids = None
+        self._feed = None
+
     def user(self, user):
         """
             Personalized calendar
@@ -135,34 +184,49 @@ class EventCalendar(Calendar):
         signer = Signer()
         try:
             username = signer.unsign(user)
-            user = User.objects.get(username=username)
-        except (BadSignature, User.DoesNotExist):
-            user = None
-        if user:
+        except BadSignature:
+            return
+
+        def user_event_ids():
             # Getting all events that the user has/is participating in
-            self.add_events(
-                Event.objects.filter(attendance_event__attendees__user=user)
+            return (
+                Event.objects.filter(
+                    attendance_event__attendees__user__username=username
+                )
                 .order_by("event_start")
-                .prefetch_related("attendance_event", "attendance_event__attendees")
+                .values_list("id", flat=True)
             )
-            self.filename = username
+
+        self.filename = username
+        self._set_feed(
+            "user-%s" % username, ["events", "user-%s" % username], user_event_ids
+        )
 
     def event(self, event_id):
         """Single event"""
-        try:
-            self.add_event(Event.objects.get(id=event_id))
-        except Event.DoesNotExist:
-            pass
         self.filename = str(event_id)
+        self._set_feed(
+            "event-%s" % event_id,
+            ["events"],
+            lambda: Event.objects.filter(id=event_id).values_list("id", flat=True),
+        )
 
     def events(self):
         """All events that haven't ended yet"""
-        self.add_events(
-            Event.objects.filter(event_end__gt=timezone.now()).order_by("event_start")
-        )
         self.filename = "events"
+        self._set_feed(
+            "events",
+            ["events"],
+            lambda: Event.objects.filter(event_end__gt=timezone.now())
+            .order_by("event_start")
+            .values_list("id", flat=True),
+        )
 
     def add_event(self, event):
+        self.cal.add_component(self.create_vevent(event))
+
+    @staticmethod
+    def create_vevent(event) -> icalendar.Event:
         cal_event = icalendar.Event()
 
         cal_event.add("dtstart", event.event_start)
@@ -172,7 +236,96 @@ class EventCalendar(Calendar):
         cal_event.add("description", event.ingress_short)
         cal_event.add("uid", "event-" + str(event.id) + "@online.ntnu.no")
 
-        self.cal.add_component(cal_event)
+        return cal_event
+
+    def _set_feed(self, name, scopes, event_ids):
+        self.feed_name = name
+        self.feed_scopes = scopes
+        self.feed_event_ids = event_ids
+
+    def _get_vevents(self, event_ids) -> List[bytes]:
+        """Rendered VEVENTs for the events, rendering and caching the uncached ones"""
+        cached = cache.get_many(
+            [_calendar_vevent_key(event_id) for event_id in event_ids]
+        )
+        missing_ids = [
+            event_id
+            for event_id in event_ids
+            if _calendar_vevent_key(event_id) not in cached
+        ]
+        if missing_ids:
+            rendered = {
+                _calendar_vevent_key(event.id): self.create_vevent(event).to_ical()
+                for event in Event.objects.filter(id__in=missing_ids).only(
+                    "id",
+                    "event_start",
+                    "event_end",
+                    "location",
+                    "title",
+                    "ingress_short",
+                )
+            }
+            cache.set_many(rendered, timeout=None)
+            cached.update(rendered)
+        return [
+            cached[_calendar_vevent_key(event_id)]
+            for event_id in event_ids
+            if _calendar_vevent_key(event_id) in cached
+        ]
+
+    def get_feed(self) -> dict:
+        """The rendered feed with its ETag and modification time, cached if possible"""
+        if self._feed:
+            return self._feed
+        if not self.feed_name:
+            # Nothing but the empty calendar
+            ical = super().output()
+            self._feed = {
+                "ical": ical,
+                "etag": '"%s"' % hashlib.md5(ical).hexdigest(),
+                "last_modified": None,
+            }
+            return self._feed
+
+        key = "%s:feed:%s:%s" % (
+            CALENDAR_CACHE_PREFIX,
+            self.feed_name,
+            get_calendar_version(*self.feed_scopes),
+        )
+        feed = cache.get(key)
+        if feed is None:
+            vevents = self._get_vevents(list(self.feed_event_ids()))
+            # Splice the cached events into the otherwise empty calendar
+            header, footer = super().output().rsplit(b"END:VCALENDAR", 1)
+            ical = header + b"".join(vevents) + b"END:VCALENDAR" + footer
+            feed = {
+                "ical": ical,
+                "etag": '"%s"' % hashlib.md5(ical).hexdigest(),
+                # Whole seconds, like the Last-Modified header it is compared against
+                "last_modified": int(timezone.now().timestamp()),
+            }
+            cache.set(key, feed, timeout=CALENDAR_FEED_TIMEOUT)
+        self._feed = feed
+        return feed
+
+    def output(self):
+        return self.get_feed()["ical"]
+
+    def response(self, request=None):
+        """Returns a response object, or a 304 response if the client is up to date"""
+        feed = self.get_feed()
+        if request:
+            not_modified = get_conditional_response(
+                request, etag=feed["etag"], last_modified=feed["last_modified"]
+            )
+            if not_modified:
+                return not_modified
+
+        response = super().response()
+        response["ETag"] = feed["etag"]
+        if feed["last_modified"]:
+            response["Last-Modified"] = http_date(feed["last_modified"])
+        return response
 
 
 def handle_attendance_event_detail(event, user, context):
@@ -252,7 +405,7 @@ def handle_event_payment(event, user, payment, context):
         return context
 
     payment_relations = PaymentRelation.objects.filter(
-        payment=payment, user=user, refunded=False
+        payment=payment, user=user, refunded=False, status=payment_status.DONE,
     )
     for payment_relation in payment_relations:
         user_paid = True
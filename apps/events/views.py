@@ -6,6 +6,8 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.contenttypes.models import ContentType
 from django.core.signing import Signer
+from django.db import transaction
+from django.db.models import Prefetch
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -13,21 +15,25 @@ from django.utils import timezone
 from django.utils.translation import gettext as _
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny
-from watson import search as watson
 
+from apps.common.rest_framework.annotations import annotate_for_serializer
+from apps.companyprofile.models import Company
+from apps.companyprofile.serializers import CompanySerializer
 from apps.events.filters import EventFilter
 from apps.events.forms import CaptchaForm
 from apps.events.models import AttendanceEvent, Attendee, Event
 from apps.events.pdf_generator import EventPDF
 from apps.events.serializers import EventSerializer
+from apps.events.tasks import handle_attend_event_payment_task
 from apps.events.utils import (
-    handle_attend_event_payment,
     handle_attendance_event_detail,
     handle_event_ajax,
     handle_event_payment,
     handle_mail_participants,
 )
+from apps.payment import status as payment_status
 from apps.payment.models import Payment, PaymentDelay, PaymentRelation
+from utils.search import search
 
 from .utils import EventCalendar
 
@@ -118,17 +124,26 @@ def attend_event(request, event_id):
     response = event.attendance_event.is_eligible_for_signup(request.user)
 
     if response["status"]:
-        attendee = Attendee(event=attendance_event, user=request.user)
+        attendee_fields = {
+            "show_as_attending_event": request.user.get_visible_as_attending_events()
+        }
         if "note" in form.cleaned_data:
-            attendee.note = form.cleaned_data["note"]
-        attendee.show_as_attending_event = (
-            request.user.get_visible_as_attending_events()
+            attendee_fields["note"] = form.cleaned_data["note"]
+        attendee, message = attendance_event.reserve_seat(
+            request.user, **attendee_fields
         )
-        attendee.save()
+        if not attendee:
+            messages.error(request, message)
+            return redirect(event)
         messages.success(request, _("Du er nå meldt på arrangementet."))
 
         if attendance_event.payment():
-            handle_attend_event_payment(event, request.user)
+            user_id = request.user.id
+            transaction.on_commit(
+                lambda: handle_attend_event_payment_task.delay(
+                    event_id=event.id, user_id=user_id
+                )
+            )
 
         return redirect(event)
     else:
@@ -175,9 +190,10 @@ def unattend_event(request, event_id):
     # Delete payment delays connected to the user and event
     if payment:
 
+        # Payments still processing or pending may complete after unattending
         payments = PaymentRelation.objects.filter(
             payment=payment, user=request.user, refunded=False
-        )
+        ).exclude(status__in=(payment_status.FAILED, payment_status.REMOVED))
 
         # Return if someone is trying to unatend without refunding
         if payments:
@@ -211,7 +227,6 @@ def search_events(request):
 
 
 def _search_indexed(request, query, filters):
-    results = []
     kwargs = {}
     order_by = "event_start"
 
@@ -224,8 +239,10 @@ def _search_indexed(request, query, filters):
     if filters["myevents"] == "true":
         kwargs["attendance_event__attendees__user"] = request.user
 
+    # Events that are restricted are filtered out in the database
     events = (
-        Event.objects.filter(**kwargs)
+        Event.objects.visible_for_user(request.user)
+        .filter(**kwargs)
         .order_by(order_by)
         .prefetch_related(
             "attendance_event",
@@ -235,19 +252,8 @@ def _search_indexed(request, query, filters):
         )
     )
 
-    # Filters events that are restricted
-    display_events = set()
-
-    for event in events:
-        if event.can_display(request.user):
-            display_events.add(event.pk)
-
-    events = events.filter(pk__in=display_events)
-
     if query:
-        for result in watson.search(query, models=(events,)):
-            results.append(result.object)
-        return results[:10]
+        return list(search(events, query)[:10])
 
     return events
 
@@ -342,7 +348,7 @@ def calendar_export(request, event_id=None, user=None):
     else:
         # All events that haven't ended yet
         calendar.events()
-    return calendar.response()
+    return calendar.response(request)
 
 
 @login_required
@@ -442,4 +448,23 @@ class EventViewSet(
 
     def get_queryset(self):
         user = self.request.user
-        return Event.by_registration.get_queryset_for_user(user)
+        attendance_events = AttendanceEvent.objects.with_seat_snapshot()
+        return (
+            Event.by_registration.get_queryset_for_user(user)
+            .select_related("image", "organizer")
+            .prefetch_related(
+                "image__tags",
+                Prefetch(
+                    "company_events__company",
+                    queryset=annotate_for_serializer(
+                        Company.objects.all(), CompanySerializer
+                    ),
+                ),
+                Prefetch(
+                    "attendance_event",
+                    queryset=attendance_events.prefetch_related(
+                        "rule_bundles", "extras"
+                    ),
+                ),
+            )
+        )
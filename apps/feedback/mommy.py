@@ -8,7 +8,7 @@ from django.core.mail import EmailMessage
 from django.utils import timezone
 
 from apps.feedback.models import FeedbackRelation
-from apps.marks.models import Mark, MarkUser
+from apps.marks.models import Mark
 from apps.mommy import schedule
 from apps.mommy.registry import Task
 
@@ -208,11 +208,7 @@ class FeedbackMail(Task):
         )
         mark.save()
 
-        for user in not_responded:
-            user_entry = MarkUser()
-            user_entry.user = user
-            user_entry.mark = mark
-            user_entry.save()
+        mark.give_to(not_responded)
 
 
 class Message(object):
@@ -1,9 +1,17 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from guardian.shortcuts import assign_perm
 
-from .models import FeedbackRelation, GenericSurvey, RegisterToken
+from .models import (
+    FeedbackRelation,
+    FieldOfStudyAnswer,
+    GenericSurvey,
+    MultipleChoiceAnswer,
+    RatingAnswer,
+    RegisterToken,
+)
+from .utils import invalidate_answer_summary
 
 
 @receiver(signal=post_save, sender=GenericSurvey)
@@ -41,3 +49,29 @@ def handle_generic_survey_permissions(sender, instance: GenericSurvey, **kwargs)
 def create_feedback_relation_token(sender, instance: FeedbackRelation, **kwargs):
     if not instance.token_objects.exists():
         RegisterToken.objects.create(fbr=instance)
+
+
+@receiver(signal=post_save, sender=RatingAnswer)
+@receiver(signal=post_delete, sender=RatingAnswer)
+@receiver(signal=post_save, sender=MultipleChoiceAnswer)
+@receiver(signal=post_delete, sender=MultipleChoiceAnswer)
+@receiver(signal=post_save, sender=FieldOfStudyAnswer)
+@receiver(signal=post_delete, sender=FieldOfStudyAnswer)
+def invalidate_answer_summary_on_answer(sender, instance, **kwargs):
+    invalidate_answer_summary(instance.feedback_relation_id)
+
+
+@receiver(signal=m2m_changed, sender=FeedbackRelation.answered.through)
+def invalidate_answer_summary_on_answered(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_answer_summary(instance.id)
+    elif action == "pre_clear":
+        # Clearing from the user side does not report which relations are affected.
+        for feedback_relation_id in instance.feedbacks.values_list("id", flat=True):
+            invalidate_answer_summary(feedback_relation_id)
+    elif action in ("post_add", "post_remove"):
+        for feedback_relation_id in pk_set:
+            invalidate_answer_summary(feedback_relation_id)
@@ -4,6 +4,7 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.test import TestCase
 from django.test.client import Client
 from django.urls import reverse
@@ -17,6 +18,8 @@ from apps.events.models import AttendanceEvent, Attendee, Event
 from apps.feedback.models import (
     Feedback,
     FeedbackRelation,
+    FieldOfStudyAnswer,
+    RatingAnswer,
     RatingQuestion,
     TextQuestion,
 )
@@ -335,3 +338,37 @@ class FeedbackViewTestCase(FeedbackTestCaseMixin, TestCase):
         self.assertEqual(
             response.status_code, 302
         )  # No access returns a redirect for feedback results
+
+    def test_chart_data_counts_answers(self):
+        cache.clear()
+        question = self.feedback_relation.feedback.rating_questions.get()
+        chart_url = reverse(
+            "chart_data",
+            args=(
+                "events",
+                "event",
+                str(self.event.id),
+                str(self.feedback_relation.id),
+            ),
+        )
+        for rating in (2, 2, 5):
+            RatingAnswer.objects.create(
+                feedback_relation=self.feedback_relation,
+                question=question,
+                answer=rating,
+            )
+        FieldOfStudyAnswer.objects.create(
+            feedback_relation=self.feedback_relation, answer=1
+        )
+
+        replies = self.client.get(chart_url).json()["replies"]
+        self.assertEqual(replies["ratings"], [[0, 2, 0, 0, 1, 0]])
+        self.assertEqual(len(replies["fos"]), 1)
+        self.assertEqual(replies["fos"][0][1], 1)
+
+        RatingAnswer.objects.create(
+            feedback_relation=self.feedback_relation, question=question, answer=6
+        )
+
+        replies = self.client.get(chart_url).json()["replies"]
+        self.assertEqual(replies["ratings"], [[0, 2, 0, 0, 1, 1]])
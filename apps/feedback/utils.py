@@ -1,11 +1,23 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import Count, Min
 from guardian.shortcuts import get_objects_for_user
 
 from apps.authentication.models import OnlineUser as User
 from apps.events.models import Event
-from apps.feedback.models import FeedbackRelation
+from apps.feedback.models import (
+    RATING_CHOICES,
+    FeedbackRelation,
+    FieldOfStudyAnswer,
+    MultipleChoiceAnswer,
+    RatingAnswer,
+)
+
+ANSWER_SUMMARY_CACHE_KEY = "feedback:answer_summary:{}"
+ANSWER_SUMMARY_TIMEOUT = 60 * 60
 
 
 def has_permission(feedback_relation, user: User):
@@ -42,3 +54,69 @@ def get_group_restricted_feedback_relations(user: User):
     return FeedbackRelation.objects.filter(
         object_id__in=events, content_type=ContentType.objects.get(model="event")
     )
+
+
+def _grouped_counts(queryset, *fields):
+    """
+    Count answers per distinct value of `fields`, in the order they were first answered.
+    """
+    return (
+        queryset.values(*fields)
+        .annotate(count=Count("id"), first_answered=Min("id"))
+        .order_by(*fields[:-1], "first_answered")
+    )
+
+
+def _build_answer_summary(feedback_relation):
+    rating_counts = defaultdict(lambda: [0] * (len(RATING_CHOICES) - 1))
+    ratings = _grouped_counts(
+        RatingAnswer.objects.filter(feedback_relation=feedback_relation),
+        "question_id",
+        "answer",
+    )
+    for row in ratings:
+        # Index 0 in RATING_CHOICES is the blank choice, so rating 1 lives at index 0.
+        if 1 <= row["answer"] < len(RATING_CHOICES):
+            rating_counts[row["question_id"]][row["answer"] - 1] += row["count"]
+
+    multiple_choice_counts = defaultdict(list)
+    multiple_choices = _grouped_counts(
+        MultipleChoiceAnswer.objects.filter(feedback_relation=feedback_relation),
+        "question_id",
+        "answer",
+    )
+    for row in multiple_choices:
+        multiple_choice_counts[row["question_id"]].append((row["answer"], row["count"]))
+
+    field_of_study_labels = dict(FieldOfStudyAnswer._meta.get_field("answer").choices)
+    field_of_study_counts = [
+        (str(field_of_study_labels.get(row["answer"], row["answer"])), row["count"])
+        for row in _grouped_counts(
+            FieldOfStudyAnswer.objects.filter(feedback_relation=feedback_relation),
+            "answer",
+        )
+    ]
+
+    return {
+        "ratings": dict(rating_counts),
+        "multiple_choice": dict(multiple_choice_counts),
+        "field_of_study": field_of_study_counts,
+        "answered": feedback_relation.answered.count(),
+    }
+
+
+def get_answer_summary(feedback_relation):
+    """
+    Aggregated answer counts for a FeedbackRelation, keyed by question id.
+    The summary is cached until an answer to the relation is added, changed or removed.
+    """
+    key = ANSWER_SUMMARY_CACHE_KEY.format(feedback_relation.id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = _build_answer_summary(feedback_relation)
+        cache.set(key, summary, ANSWER_SUMMARY_TIMEOUT)
+    return summary
+
+
+def invalidate_answer_summary(feedback_relation_id):
+    cache.delete(ANSWER_SUMMARY_CACHE_KEY.format(feedback_relation_id))
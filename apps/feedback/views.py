@@ -39,6 +39,7 @@ from apps.feedback.permissions import (
 )
 from apps.feedback.utils import (
     can_delete,
+    get_answer_summary,
     get_group_restricted_feedback_relations,
     has_permission,
 )
@@ -109,17 +110,24 @@ def feedback_results(request, feedback_relation, token=False):
     qa = namedtuple("Qa", "question, answers")
     question_and_answers = []
 
-    for question in feedback_relation.questions:
-        if (question.display or not token) and isinstance(question, TextQuestion):
-            question_and_answers.append(
-                qa(question, feedback_relation.answers_to_question(question))
-            )
+    text_questions = [
+        question
+        for question in feedback_relation.feedback.text_questions.order_by("order")
+        if question.display or not token
+    ]
+    text_answers = defaultdict(list)
+    for answer in TextAnswer.objects.filter(
+        feedback_relation=feedback_relation, question__in=text_questions
+    ):
+        text_answers[answer.question_id].append(answer)
+    for question in text_questions:
+        question_and_answers.append(qa(question, text_answers[question.id]))
 
     info = None
 
     if feedback_relation.feedback.display_info or not token:
         info = feedback_relation.content_info()
-        info[_("Besvarelser")] = feedback_relation.answered.count()
+        info[_("Besvarelser")] = get_answer_summary(feedback_relation)["answered"]
 
     register_token = get_object_or_404(RegisterToken, fbr=feedback_relation)
 
@@ -166,43 +174,38 @@ def chart_data_token(request, applabel, appmodel, object_id, feedback_id, token)
 
 
 def get_chart_data(request, feedback_relation, token=False):
+    summary = get_answer_summary(feedback_relation)
     rating_answers = []
     rating_titles = []
     answer_collection = dict()
     answer_collection["replies"] = dict()
-    answer_length = int(len(RATING_CHOICES))
+    empty_rating_count = [0] * (len(RATING_CHOICES) - 1)
     for question in feedback_relation.ratingquestion:
         if question.display or not token:
             rating_titles.append(str(question))
-            answers = feedback_relation.answers_to_question(question)
-            answer_count = [0] * answer_length
-            for answer in answers:
-                answer_count[int(answer.answer)] += 1
-            rating_answers.append(answer_count[1:])
+            rating_answers.append(
+                summary["ratings"].get(question.id, empty_rating_count)
+            )
 
-    fos_answer_count = defaultdict(int)
+    fos_answer_count = []
 
     if feedback_relation.feedback.display_field_of_study or not token:
-        fos = feedback_relation.field_of_study_answers.all()
-        for answer in fos:
-            fos_answer_count[str(answer)] += 1
+        fos_answer_count = summary["field_of_study"]
 
     mc_questions = []
     mc_answer_count = []
 
-    for question in feedback_relation.multiple_choice_question:
+    multiple_choice_questions = feedback_relation.feedback.multiple_choice_questions
+    for question in multiple_choice_questions.select_related("question"):
         if question.display or not token:
             mc_questions.append(str(question))
-            answer_count = defaultdict(int)
-            for answer in feedback_relation.answers_to_question(question):
-                answer_count[str(answer)] += 1
-            mc_answer_count.append(list(answer_count.items()))
+            mc_answer_count.append(summary["multiple_choice"].get(question.id, []))
 
     answer_collection["replies"]["ratings"] = rating_answers
     answer_collection["replies"]["titles"] = rating_titles
     answer_collection["replies"]["mc_questions"] = mc_questions
     answer_collection["replies"]["mc_answers"] = mc_answer_count
-    answer_collection["replies"]["fos"] = list(fos_answer_count.items())
+    answer_collection["replies"]["fos"] = fos_answer_count
 
     return HttpResponse(json.dumps(answer_collection), content_type="application/json")
 
@@ -0,0 +1,100 @@
+import os
+import resource
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image
+
+from apps.gallery import settings as gallery_settings
+from apps.gallery.util import BaseImageHandler, generate_image_variants
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure time and peak memory used to generate responsive image versions. "
+        "Without any image paths a set of large generated JPEG images is used."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("images", nargs="*", help="Paths to source images")
+        parser.add_argument("--preset", default="photoalbum")
+        parser.add_argument("--count", type=int, default=5)
+        parser.add_argument("--width", type=int, default=6000)
+        parser.add_argument("--height", type=int, default=4000)
+
+    def handle(self, *args, **options):
+        preset = gallery_settings.MODELS.get(options["preset"])
+        if not preset:
+            raise CommandError(f"Unknown preset {options['preset']}")
+
+        with tempfile.TemporaryDirectory() as directory:
+            images = options["images"] or self._create_fixtures(
+                directory, options["count"], (options["width"], options["height"])
+            )
+
+            total = 0
+            for path in images:
+                duration = self._generate(path, directory, preset)
+                total += duration
+                self.stdout.write(
+                    f"{os.path.basename(path)}: {duration:.2f} s, "
+                    f"peak RSS {self._peak_rss_mb():.0f} MB"
+                )
+
+        self.stdout.write(
+            f"{len(images)} images: {total:.2f} s total, "
+            f"{total / len(images):.2f} s per image, "
+            f"peak RSS {self._peak_rss_mb():.0f} MB"
+        )
+
+    def _create_fixtures(self, directory, count, size):
+        self.stdout.write(f"Generating {count} fixture images of {size[0]}x{size[1]}")
+        paths = []
+        for index in range(count):
+            path = os.path.join(directory, f"fixture-{index}.jpg")
+            image = Image.effect_mandelbrot(
+                size, (-2 + index * 0.1, -1.5, 1, 1.5), 100
+            ).convert("RGB")
+            image.save(path, "JPEG", quality=95)
+            paths.append(path)
+        return paths
+
+    def _generate(self, path, directory, preset):
+        output_directory = tempfile.mkdtemp(dir=directory)
+        start = time.perf_counter()
+
+        thumbnail = BaseImageHandler._generate_thumbnail_from_source(
+            path,
+            os.path.join(output_directory, f"thumbnail-{os.path.basename(path)}"),
+            gallery_settings.RESPONSIVE_THUMBNAIL_SIZE,
+        )
+        image = BaseImageHandler._open_image(path)
+        if not thumbnail or not image:
+            raise CommandError(f"Could not open {path}")
+
+        sizes = preset["sizes"]
+        extension = os.path.splitext(path)[1]
+        status = generate_image_variants(
+            image.data,
+            [
+                (os.path.join(output_directory, f"{name}{extension}"), sizes[size])
+                for name, size in (
+                    ("wide", "lg"),
+                    ("lg", "lg"),
+                    ("md", "md"),
+                    ("sm", "sm"),
+                    ("xs", "xs"),
+                )
+            ],
+            keep_aspect_ratio=not preset["aspect_ratio"],
+        )
+        if not status:
+            raise CommandError(status.message)
+
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _peak_rss_mb():
+        # ru_maxrss is reported in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
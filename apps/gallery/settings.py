@@ -23,6 +23,12 @@ RESPONSIVE_IMAGES_XS_PATH = os.path.join(RESPONSIVE_IMAGES_PATH, "xs")
 THUMBNAIL_QUALITY = 70
 RESPONSIVE_IMAGE_QUALITY = 100
 
+# Responsive image generation
+RESPONSIVE_IMAGE_WORKERS = 4
+# Intermediates are kept at least this many times larger than the next variant before
+# resampling
+RESPONSIVE_IMAGE_REDUCING_GAP = 2
+
 
 # Presets and aspect ratios. Active presets are defined in the PRESETS list
 ARTICLE = {
@@ -1,3 +1,50 @@
 # -*- encoding: utf-8 -*-
+import os
+import tempfile
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from PIL import Image
+
+from apps.gallery.util import generate_image_variants
+
+
+class GenerateImageVariantsTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.image = Image.new("RGB", (3200, 1800), "red")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_variants_are_fitted_to_their_sizes(self):
+        status = generate_image_variants(
+            self.image,
+            [
+                (self._path("wide.jpg"), (1280, 720)),
+                (self._path("lg.jpg"), (1280, 720)),
+                (self._path("xs.jpg"), (640, 360)),
+            ],
+        )
+
+        self.assertTrue(status)
+        self.assertEqual(len(status.data), 3)
+        for name, size in (
+            ("wide.jpg", (1280, 720)),
+            ("lg.jpg", (1280, 720)),
+            ("xs.jpg", (640, 360)),
+        ):
+            with Image.open(self._path(name)) as variant:
+                self.assertEqual(variant.size, size)
+                self.assertEqual(variant.format, "JPEG")
+
+    def test_keep_aspect_ratio_scales_to_height(self):
+        status = generate_image_variants(
+            self.image, [(self._path("md.png"), (1200, 900))], keep_aspect_ratio=True
+        )
+
+        self.assertTrue(status)
+        with Image.open(self._path("md.png")) as variant:
+            self.assertEqual(variant.size, (1600, 900))
@@ -5,6 +5,8 @@ import math
 import os
 import shutil
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings as django_settings
 from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
@@ -191,11 +193,14 @@ class BaseImageHandler(object):
             )
 
     @staticmethod
-    def _open_image(source):
+    def _open_image(source, draft_size=None):
         """
         Helper method that attempts to load an image from disk using PIL.
 
         :param source: The absolute path to an image stored on disk.
+        :param draft_size: An optional (width, height) tuple. JPEG images are then
+                           decoded at the smallest scale that is still at least this
+                           large, which is a lot cheaper than a full decode.
         :return: A GalleryStatus object with results and attached Image object as data
         """
 
@@ -210,6 +215,9 @@ class BaseImageHandler(object):
                 False, "IOError: File was not an image file, or could not be found.", e
             )
 
+        if draft_size and img.format == "JPEG":
+            img.draft(img.mode, draft_size)
+
         # If necessary, convert the image to RGB mode
         if img.mode not in ("L", "RGB", "RGBA"):
             img = img.convert("RGB")
@@ -226,7 +234,7 @@ class BaseImageHandler(object):
         :return: A GalleryStatus object
         """
 
-        img = BaseImageHandler._open_image(source)
+        img = BaseImageHandler._open_image(source, draft_size=thumb_size)
         if not img:
             logging.getLogger(__name__).error("Could not open %s" % source)
             return img
@@ -432,10 +440,11 @@ class ResponsiveImageHandler(BaseImageHandler):
             self._log.error(self.status)
             return self.status
 
+        cropped_image = self.status.data
         self._log.debug("generate: creating responsive image versions")
 
-        # Create downsized versions
-        self.status = self._generate_downsized_versions()
+        # Create downsized versions from the already decoded and cropped image
+        self.status = self._generate_downsized_versions(cropped_image)
         if not self.status:
             self._log.error(self.status)
             return self.status
@@ -461,7 +470,6 @@ class ResponsiveImageHandler(BaseImageHandler):
         # Define the paths we're going to need
         relative_source_path = self.image.image.name
         source_path = os.path.join(django_settings.MEDIA_ROOT, relative_source_path)
-        file_name, file_extension = os.path.splitext(source_path)
         destination_path = os.path.join(
             django_settings.MEDIA_ROOT,
             gallery_settings.RESPONSIVE_IMAGES_PATH,
@@ -487,7 +495,7 @@ class ResponsiveImageHandler(BaseImageHandler):
         image = image.crop((crop_x, crop_y, crop_x + crop_width, crop_y + crop_height))
         image.save(
             destination_path,
-            file_extension.replace(".", ""),
+            get_image_format(destination_path),
             quality=quality,
             optimize=True,
         )
@@ -499,70 +507,12 @@ class ResponsiveImageHandler(BaseImageHandler):
 
         return GalleryStatus(True, "success", image)
 
-    def _resize_image(self, image, destination_path, size):
-        """
-        Resize an image, given a source image path, a destination path and a size tuple (x, y)
-        :param image: An absolute path to the original source image
-        :param destination_path: An absolute path to where the image should be saved
-        :param size: An (x, y) tuple of the final size of the image in pixels
-        :return: A GalleryStatus object containing the path to the resized image, or error information
-        """
-
-        # Open the file and fetch the data, or return with error information
-        filename = os.path.basename(image)
-        result = self._open_image(image)
-        if not result:
-            return result
-        else:
-            image = result.data
-
-        # Extract necessary data
-        file_name, file_extension = os.path.splitext(filename)
-        target_width, target_height = size
-
-        # If the image should keep the aspect ratio, the size is based on the width
-        preset = gallery_settings.MODELS[self._config["preset"]]
-        if not preset["aspect_ratio"]:
-            image_width, image_height = image.size
-            scaling_factor = target_height / image_height
-            target_width = math.ceil(image_width * scaling_factor)
-
-        try:
-            image = ImageOps.fit(image, (target_width, target_height), Image.ANTIALIAS)
-        except IOError as io_error:
-            self._log.error(
-                "Critical error while resizing %s to %s (Image truncation)"
-                % (filename, size)
-            )
-            return GalleryStatus(
-                False, "Image source is truncated (%s)" % io_error, io_error
-            )
-
-        quality = gallery_settings.RESPONSIVE_IMAGE_QUALITY
-        try:
-            image.save(
-                destination_path,
-                file_extension.replace(".", ""),
-                quality=quality,
-                optimize=True,
-            )
-            self._log.debug(
-                "Successsfully resized %s to %s"
-                % (filename, (target_width, target_height))
-            )
-        except IOError as io_error:
-            self._log.error(
-                "Critical error while saving image %s: %s" % (filename, io_error)
-            )
-            return GalleryStatus
-
-        return GalleryStatus(True, "success", destination_path)
-
-    def _generate_downsized_versions(self):
+    def _generate_downsized_versions(self, image):
         """
         Helper that generates the different responsive image versions from the cropped version of the UnhandledImage.
         This method also performs cleanup afterwards, deleting the UnhandledImage containing the original
         uploaded image, after all ResponsiveImage versions have been generated.
+        :param image: The cropped PIL.Image object returned by _crop_image
         :return: A GalleryStatus object
         """
 
@@ -601,35 +551,20 @@ class ResponsiveImageHandler(BaseImageHandler):
         )
 
         # Resize the images based on bootstrap breakpoint sizes for each preset type
-        wide = self._resize_image(
-            source_path,
-            wide_destination_path,
-            gallery_settings.MODELS[self._config["preset"]]["sizes"]["lg"],
-        )
-        lg = self._resize_image(
-            source_path,
-            lg_destination_path,
-            gallery_settings.MODELS[self._config["preset"]]["sizes"]["lg"],
-        )
-        md = self._resize_image(
-            source_path,
-            md_destination_path,
-            gallery_settings.MODELS[self._config["preset"]]["sizes"]["md"],
-        )
-        sm = self._resize_image(
-            source_path,
-            sm_destination_path,
-            gallery_settings.MODELS[self._config["preset"]]["sizes"]["sm"],
-        )
-        xs = self._resize_image(
-            source_path,
-            xs_destination_path,
-            gallery_settings.MODELS[self._config["preset"]]["sizes"]["xs"],
+        preset = gallery_settings.MODELS[self._config["preset"]]
+        sizes = preset["sizes"]
+        self.status = generate_image_variants(
+            image,
+            [
+                (wide_destination_path, sizes["lg"]),
+                (lg_destination_path, sizes["lg"]),
+                (md_destination_path, sizes["md"]),
+                (sm_destination_path, sizes["sm"]),
+                (xs_destination_path, sizes["xs"]),
+            ],
+            keep_aspect_ratio=not preset["aspect_ratio"],
         )
 
-        # Aggregate statuses
-        self.status = wide and lg and md and sm and xs
-
         # Create responsive thumbnail
         self.create_thumbnail()
 
@@ -728,6 +663,129 @@ class ResponsiveImageHandler(BaseImageHandler):
 # Support functions
 
 
+def get_image_format(path):
+    """
+    Translate the extension of an image path to the format name PIL expects, e.g. ".jpg"
+    to "JPEG".
+    :param path: A path to an image file
+    :return: A PIL format name
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    return Image.registered_extensions().get(extension, extension.replace(".", ""))
+
+
+def _get_variant_size(image_size, size, keep_aspect_ratio):
+    """
+    The final size of a variant. Presets without a fixed aspect ratio are scaled to the
+    height of the size.
+    """
+
+    if not keep_aspect_ratio:
+        return size
+
+    image_width, image_height = image_size
+    target_width, target_height = size
+    scaling_factor = target_height / image_height
+    return math.ceil(image_width * scaling_factor), target_height
+
+
+def _reduce_for_size(image, size):
+    """
+    Shrink an image by an integer factor with cheap box reduction, while keeping it at
+    least RESPONSIVE_IMAGE_REDUCING_GAP times larger than the given size so the final
+    resampling stays sharp.
+    """
+
+    gap = gallery_settings.RESPONSIVE_IMAGE_REDUCING_GAP
+    target_width, target_height = size
+    factor = int(
+        min(image.width / (target_width * gap), image.height / (target_height * gap))
+    )
+    if factor < 2:
+        return image
+    return image.reduce(factor)
+
+
+def _save_image_variant(image, size, destination_paths):
+    """
+    Fit an image to a size and save it to every destination path.
+    :return: A GalleryStatus object containing the destination paths, or error info
+    """
+
+    try:
+        variant = ImageOps.fit(image, size, Image.LANCZOS)
+    except IOError as io_error:
+        logger.error("Critical error while resizing to %s (Image truncation)" % (size,))
+        return GalleryStatus(
+            False, "Image source is truncated (%s)" % io_error, io_error
+        )
+
+    destination_path, *copies = destination_paths
+    try:
+        variant.save(
+            destination_path,
+            get_image_format(destination_path),
+            quality=gallery_settings.RESPONSIVE_IMAGE_QUALITY,
+            optimize=True,
+        )
+    except IOError as io_error:
+        logger.error(
+            "Critical error while saving image %s: %s" % (destination_path, io_error)
+        )
+        return GalleryStatus(False, "Could not save %s" % destination_path, io_error)
+
+    for path in copies:
+        status = BaseImageHandler._copy_file(destination_path, path)
+        if not status:
+            return status
+
+    logger.debug("Successfully resized image to %s" % (size,))
+    return GalleryStatus(True, "success", destination_paths)
+
+
+def generate_image_variants(image, variants, keep_aspect_ratio=False):
+    """
+    Generate downsized versions of an already decoded image.
+
+    Variants sharing a size are only resized and encoded once. Every variant is
+    resampled from a box reduced intermediate of the previous (larger) one instead of
+    the full source, and the resampling and encoding runs in parallel, as PIL releases
+    the GIL for both.
+
+    :param image: A PIL.Image object
+    :param variants: A list of (destination_path, (width, height)) tuples
+    :param keep_aspect_ratio: Scale every variant to its height, keeping aspect ratio
+    :return: A GalleryStatus object containing all destination paths, or error info
+    """
+
+    image.load()
+
+    destinations = OrderedDict()
+    for destination_path, size in variants:
+        size = _get_variant_size(image.size, size, keep_aspect_ratio)
+        destinations.setdefault(size, []).append(destination_path)
+
+    jobs = []
+    intermediate = image
+    for size in sorted(destinations, key=lambda s: s[0] * s[1], reverse=True):
+        intermediate = _reduce_for_size(intermediate, size)
+        jobs.append((intermediate, size, destinations[size]))
+
+    with ThreadPoolExecutor(
+        max_workers=gallery_settings.RESPONSIVE_IMAGE_WORKERS
+    ) as executor:
+        results = list(executor.map(lambda job: _save_image_variant(*job), jobs))
+
+    for result in results:
+        if not result:
+            return result
+
+    return GalleryStatus(
+        True, "success", [path for result in results for path in result.data]
+    )
+
+
 def check_crop_bounds(crop_anchor, crop_size, min_size, max_size):
     """
     Check whether or not the crop bounds exceed the image size
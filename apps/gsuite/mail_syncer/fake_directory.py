@@ -0,0 +1,302 @@
+"""
+A small in-memory stand-in for the parts of the G Suite Directory API used by the mail
+syncer.
+Used to test and benchmark group reconciliation without talking to Google.
+"""
+import json
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, unquote, urlparse
+
+import httplib2
+from googleapiclient.discovery import Resource, build_from_document
+
+SERVICE_PATH = "admin/directory/v1/"
+BATCH_PATH = "batch/admin/directory_v1"
+
+
+def _parameter(location: str, required: bool = False, type_: str = "string"):
+    return {"type": type_, "location": location, "required": required}
+
+
+def discovery_document(root_url: str) -> dict:
+    """
+    A minimal discovery document describing the member and group endpoints of the
+    Directory API.
+    """
+    member_ref = {"$ref": "Member"}
+    paging = {
+        "maxResults": _parameter("query", type_="integer"),
+        "pageToken": _parameter("query"),
+    }
+    return {
+        "kind": "discovery#restDescription",
+        "discoveryVersion": "v1",
+        "id": "admin:directory_v1",
+        "name": "admin",
+        "version": "directory_v1",
+        "rootUrl": root_url,
+        "servicePath": SERVICE_PATH,
+        "batchPath": BATCH_PATH,
+        "parameters": {},
+        "schemas": {
+            "Member": {
+                "id": "Member",
+                "type": "object",
+                "properties": {"email": {"type": "string"}, "role": {"type": "string"}},
+            },
+            "Members": {"id": "Members", "type": "object", "properties": {}},
+            "Groups": {"id": "Groups", "type": "object", "properties": {}},
+        },
+        "resources": {
+            "members": {
+                "methods": {
+                    "list": {
+                        "id": "directory.members.list",
+                        "path": "groups/{groupKey}/members",
+                        "httpMethod": "GET",
+                        "parameters": {
+                            "groupKey": _parameter("path", required=True),
+                            **paging,
+                        },
+                        "parameterOrder": ["groupKey"],
+                        "response": {"$ref": "Members"},
+                    },
+                    "insert": {
+                        "id": "directory.members.insert",
+                        "path": "groups/{groupKey}/members",
+                        "httpMethod": "POST",
+                        "parameters": {"groupKey": _parameter("path", required=True)},
+                        "parameterOrder": ["groupKey"],
+                        "request": member_ref,
+                        "response": member_ref,
+                    },
+                    "delete": {
+                        "id": "directory.members.delete",
+                        "path": "groups/{groupKey}/members/{memberKey}",
+                        "httpMethod": "DELETE",
+                        "parameters": {
+                            "groupKey": _parameter("path", required=True),
+                            "memberKey": _parameter("path", required=True),
+                        },
+                        "parameterOrder": ["groupKey", "memberKey"],
+                    },
+                }
+            },
+            "groups": {
+                "methods": {
+                    "list": {
+                        "id": "directory.groups.list",
+                        "path": "groups",
+                        "httpMethod": "GET",
+                        "parameters": {"userKey": _parameter("query"), **paging},
+                        "response": {"$ref": "Groups"},
+                    }
+                }
+            },
+        },
+    }
+
+
+def _error(status: int, message: str, reason: str = None):
+    error = {"code": status, "message": message}
+    if reason:
+        error["errors"] = [{"reason": reason}]
+    return status, {"error": error}
+
+
+class FakeDirectory:
+    """
+    Group memberships kept in memory, with optional latency and rate limiting
+    to exercise retries.
+    """
+
+    def __init__(self, latency: float = 0.0, rate_limit_every: int = 0):
+        self.groups: Dict[str, List[str]] = {}
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.request_count = 0
+        self.operation_count = 0
+        self._lock = threading.Lock()
+
+    def add_group(self, group_key: str, emails: List[str]):
+        self.groups[group_key.lower()] = [email.lower() for email in emails]
+
+    def _rate_limited(self) -> bool:
+        with self._lock:
+            self.operation_count += 1
+            return (
+                bool(self.rate_limit_every)
+                and self.operation_count % self.rate_limit_every == 0
+            )
+
+    def handle(self, method: str, path: str, query: dict, body: bytes):
+        """
+        Handle a single API call, returning a (status, json body) tuple.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        parts = [unquote(part) for part in path[len("/" + SERVICE_PATH) :].split("/")]
+        if parts[0] != "groups":
+            return _error(404, "Not Found")
+
+        if len(parts) == 1 and method == "GET":
+            return self._list_groups(query)
+
+        group_key = parts[1].lower()
+        if group_key not in self.groups:
+            return _error(404, "Resource Not Found")
+
+        if method == "GET":
+            return self._list_members(group_key, query)
+        if self._rate_limited():
+            return _error(403, "Rate limit exceeded", reason="rateLimitExceeded")
+        if method == "POST":
+            return self._insert_member(group_key, body)
+        if method == "DELETE":
+            return self._delete_member(group_key, parts[3])
+        return _error(405, "Method Not Allowed")
+
+    def _list_members(self, group_key: str, query: dict):
+        members = self.groups[group_key]
+        start = int(query.get("pageToken", ["0"])[0] or 0)
+        size = int(query.get("maxResults", ["200"])[0])
+        response = {
+            "members": [{"email": email} for email in members[start : start + size]]
+        }
+        if start + size < len(members):
+            response["nextPageToken"] = str(start + size)
+        return 200, response
+
+    def _insert_member(self, group_key: str, body: bytes):
+        email = json.loads(body or b"{}").get("email", "").lower()
+        with self._lock:
+            if email in self.groups[group_key]:
+                return _error(409, "Member already exists.")
+            self.groups[group_key].append(email)
+        return 200, {"email": email, "role": "MEMBER"}
+
+    def _delete_member(self, group_key: str, email: str):
+        with self._lock:
+            if email.lower() not in self.groups[group_key]:
+                return _error(404, "Resource Not Found")
+            self.groups[group_key].remove(email.lower())
+        return 204, None
+
+    def _list_groups(self, query: dict):
+        user_key = query.get("userKey", [""])[0].lower()
+        groups = [
+            {"email": group_key, "name": group_key.split("@")[0]}
+            for group_key, members in self.groups.items()
+            if user_key in members
+        ]
+        return 200, {"groups": groups}
+
+
+def _make_handler(directory: FakeDirectory):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _respond(self, status: int, payload, content_type="application/json"):
+            if isinstance(payload, bytes):
+                content = payload
+            else:
+                content = json.dumps(payload).encode() if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def _handle(self):
+            with directory._lock:
+                directory.request_count += 1
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            url = urlparse(self.path)
+
+            if url.path == "/" + BATCH_PATH:
+                self._handle_batch(body)
+                return
+
+            status, payload = directory.handle(
+                self.command, url.path, parse_qs(url.query), body
+            )
+            self._respond(status, payload)
+
+        def _handle_batch(self, body: bytes):
+            content_type = self.headers.get("Content-Type")
+            message = BytesParser().parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode() + body
+            )
+            boundary = uuid.uuid4().hex
+            parts = []
+            for part in message.get_payload():
+                request = part.get_payload()
+                request_line, rest = request.split("\n", 1)
+                method, target, _ = request_line.split(" ", 2)
+                request_body = rest.split("\n\n", 1)[1] if "\n\n" in rest else ""
+                url = urlparse(target)
+                status, payload = directory.handle(
+                    method,
+                    url.path,
+                    parse_qs(url.query),
+                    request_body.strip().encode(),
+                )
+                content = json.dumps(payload) if payload is not None else ""
+                content_id = part["Content-ID"][1:-1]
+                parts.append(
+                    f"--{boundary}\r\n"
+                    "Content-Type: application/http\r\n"
+                    f"Content-ID: <response-{content_id}>\r\n\r\n"
+                    f"HTTP/1.1 {status} Fake\r\n"
+                    "Content-Type: application/json\r\n\r\n"
+                    f"{content}\r\n"
+                )
+            payload = "".join(parts) + f"--{boundary}--\r\n"
+            self._respond(
+                200, payload.encode(), f"multipart/mixed; boundary={boundary}"
+            )
+
+        do_GET = do_POST = do_DELETE = _handle
+
+    return Handler
+
+
+class FakeDirectoryServer:
+    """
+    Serves a FakeDirectory on a local port in a background thread.
+    """
+
+    def __init__(self, directory: FakeDirectory = None):
+        self.directory = directory or FakeDirectory()
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), _make_handler(self.directory)
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def root_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/"
+
+    def build_client(self) -> Resource:
+        return build_from_document(
+            discovery_document(self.root_url), http=httplib2.Http()
+        )
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
@@ -2,14 +2,13 @@ import logging
 from typing import Dict, List
 
 from django.conf import settings
+from googleapiclient.errors import HttpError
 
 from apps.authentication.models import OnlineUser as User
+from apps.gsuite.mail_syncer.reconciliation import GroupReconciler, ReconciliationResult
 from apps.gsuite.mail_syncer.utils import (
+    get_appropriate_g_suite_group_names_for_user,
     get_excess_groups_for_user,
-    get_excess_users_in_g_suite,
-    get_g_suite_users_for_group,
-    get_missing_g_suite_group_names_for_user,
-    get_missing_ow4_users_for_g_suite,
     get_ow4_users_for_group,
     insert_ow4_user_into_g_suite_group,
     remove_g_suite_user_from_group,
@@ -105,32 +104,63 @@ def cleanup_groups_for_user(
         )
 
 
+def _raise_http_errors(result: ReconciliationResult, suppress_http_errors: bool):
+    if result.errors and not suppress_http_errors:
+        raise result.errors[0]
+
+
 def update_g_suite_user(
-    domain: str, ow4_user: User, suppress_http_errors: bool = False
+    domain: str,
+    ow4_user: User,
+    suppress_http_errors: bool = False,
+    reconciler: GroupReconciler = None,
 ):
     """
     Finds missing and excess groups and adds and removes the user to/from them, respectively.
     :param domain: The domain in which to update a users group memberships.
     :param ow4_user: The user to update group memberships for.
     :param suppress_http_errors: Whether or not to suppress HttpErrors happening during execution.
+    :param reconciler: An optional GroupReconciler to reuse the API client of.
     """
-    cleanup_groups_for_user(domain, ow4_user, suppress_http_errors=suppress_http_errors)
-    insert_ow4_user_into_groups(
-        domain,
-        ow4_user,
-        get_missing_g_suite_group_names_for_user(domain, ow4_user),
-        suppress_http_errors=suppress_http_errors,
-    )
+    if not ow4_user.online_mail:
+        logger.error(
+            f"OW4 User '{ow4_user}' ({ow4_user.pk}) missing Online email address! "
+            f"(current: '{ow4_user.online_mail}')",
+            extra={"user": ow4_user},
+        )
+        return
+
+    try:
+        reconciler = reconciler or GroupReconciler(domain)
+        result = reconciler.reconcile_user(
+            ow4_user.get_online_mail(),
+            get_appropriate_g_suite_group_names_for_user(domain, ow4_user),
+        )
+    except HttpError as err:
+        logger.error(
+            f"HttpError when updating G Suite groups for {ow4_user}: {err}",
+            extra={"suppress_http_error": suppress_http_errors},
+        )
+        if not suppress_http_errors:
+            raise err
+        return
+
+    _raise_http_errors(result, suppress_http_errors)
+    return result
 
 
 def update_g_suite_group(
-    domain: str, group_name: str, suppress_http_errors: bool = False
+    domain: str,
+    group_name: str,
+    suppress_http_errors: bool = False,
+    reconciler: GroupReconciler = None,
 ):
     """
     Finds missing and excess users and adds and removes the users to/from them, respectively.
     :param domain: The domain in which to find a group's user lists.
     :param group_name: The name of the group to get group membership status for.
     :param suppress_http_errors: Whether or not to suppress HttpErrors happening during execution.
+    :param reconciler: An optional GroupReconciler to reuse the API client of.
     """
 
     if group_name.lower() not in settings.OW4_GSUITE_SYNC.get("GROUPS", {}).keys():
@@ -139,18 +169,27 @@ def update_g_suite_group(
         )
         return
 
-    g_suite_users = get_g_suite_users_for_group(
-        domain, group_name, suppress_http_errors=suppress_http_errors
-    )
-    ow4_users = get_ow4_users_for_group(group_name)
-
-    excess_users = get_excess_users_in_g_suite(g_suite_users, ow4_users)
-    missing_users = get_missing_ow4_users_for_g_suite(g_suite_users, ow4_users)
+    ow4_emails = [
+        user.get_online_mail()
+        for user in get_ow4_users_for_group(group_name).exclude(online_mail=None)
+    ]
+
+    try:
+        reconciler = reconciler or GroupReconciler(domain)
+        result = reconciler.reconcile_group(group_name, ow4_emails)
+    except HttpError as err:
+        logger.error(
+            f"HttpError when updating G Suite group {group_name}: {err}",
+            extra={"suppress_http_error": suppress_http_errors},
+        )
+        if not suppress_http_errors:
+            raise err
+        return
 
-    # @ToDo: Look into bulk updates
-    insert_ow4_users_into_g_suite(
-        domain, group_name, missing_users, suppress_http_errors=suppress_http_errors
-    )
-    remove_excess_g_suite_users(
-        domain, group_name, excess_users, suppress_http_errors=suppress_http_errors
+    logger.info(
+        f"G Suite group '{group_name}' reconciled: {len(result.inserted)} inserted, "
+        f"{len(result.removed)} removed, {len(result.failed)} failed.",
+        extra={"group": group_name},
     )
+    _raise_http_errors(result, suppress_http_errors)
+    return result
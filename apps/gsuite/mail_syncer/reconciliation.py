@@ -0,0 +1,343 @@
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, NamedTuple, Optional, Set
+
+import httplib2
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from google.auth.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import Resource
+from googleapiclient.errors import HttpError
+
+from apps.gsuite.mail_syncer.utils import (
+    get_group_key,
+    get_user_key,
+    setup_g_suite_client,
+    setup_g_suite_credentials,
+)
+
+logger = logging.getLogger(__name__)
+
+INSERT = "insert"
+REMOVE = "remove"
+
+# Statuses and reasons the Directory API uses for rate limiting and transient errors
+RETRIABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRIABLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "backendError"}
+
+
+class MembershipChange(NamedTuple):
+    action: str
+    group_key: str
+    email: str
+
+
+class ReconciliationResult(NamedTuple):
+    inserted: List[MembershipChange]
+    removed: List[MembershipChange]
+    failed: List[MembershipChange]
+    errors: List[HttpError]
+
+
+def _get_error_reason(err: HttpError) -> str:
+    try:
+        error = json.loads(err.content.decode()).get("error", {})
+    except (ValueError, AttributeError):
+        return ""
+    reasons = [detail.get("reason", "") for detail in error.get("errors", [])]
+    return reasons[0] if reasons else error.get("message", "")
+
+
+def _is_retriable(err: Exception) -> bool:
+    if not isinstance(err, HttpError):
+        # Connection errors and timeouts for the batch as a whole
+        return True
+    if err.resp.status in RETRIABLE_STATUSES:
+        return True
+    return err.resp.status == 403 and _get_error_reason(err) in RETRIABLE_REASONS
+
+
+def _is_already_applied(change: MembershipChange, err: HttpError) -> bool:
+    """
+    Inserting an existing member or removing a missing one leaves the group as we want
+    it.
+    """
+    if change.action == INSERT:
+        return err.resp.status == 409
+    return err.resp.status == 404
+
+
+class GroupReconciler:
+    """
+    Reconciles G Suite group memberships with OW4 using a single authenticated
+    Directory API client.
+
+    Members are listed page by page, the differences are computed with sets, and
+    the changes are sent through the batch endpoint of the API. Several batches may
+    be in flight at once, and changes failing with rate limiting or transient errors
+    are retried with exponential backoff. Batches are sent over connections
+    authorized with the credentials the client was built with.
+    """
+
+    def __init__(
+        self,
+        domain: str,
+        directory: Optional[Resource] = None,
+        credentials: Optional[Credentials] = None,
+        http_factory: Optional[Callable[[], httplib2.Http]] = None,
+        batch_size: int = None,
+        max_concurrency: int = None,
+        max_retries: int = None,
+        backoff: float = None,
+    ):
+        sync_settings = settings.OW4_GSUITE_SYNC
+        self.domain = domain
+        if directory is None:
+            credentials = credentials or setup_g_suite_credentials()
+            directory = setup_g_suite_client(credentials=credentials)
+        self.directory = directory
+        self.credentials = credentials
+        self.http_factory = http_factory or self._authorized_http
+        self.batch_size = batch_size or sync_settings.get("BATCH_SIZE", 50)
+        self.max_concurrency = max_concurrency or sync_settings.get(
+            "MAX_CONCURRENCY", 4
+        )
+        self.max_retries = (
+            max_retries
+            if max_retries is not None
+            else sync_settings.get("MAX_RETRIES", 5)
+        )
+        self.backoff = backoff if backoff is not None else 1.0
+        self._local = threading.local()
+
+    def _authorized_http(self) -> httplib2.Http:
+        # httplib2 connections are not thread safe, so every worker thread gets its own
+        if self.credentials is None:
+            raise ImproperlyConfigured(
+                "GroupReconciler needs credentials or an http_factory to send batches."
+            )
+        return AuthorizedHttp(self.credentials, http=httplib2.Http())
+
+    def _get_http(self) -> httplib2.Http:
+        if not hasattr(self._local, "http"):
+            self._local.http = self.http_factory()
+        return self._local.http
+
+    def _protected_emails(self) -> Set[str]:
+        # Not removing these guys from any lists.
+        return {f"leder@{self.domain}", f"nestleder@{self.domain}"}
+
+    def list_group_members(self, group_name: str) -> List[dict]:
+        """
+        Get all members of a G Suite group, following every page of the member list.
+        """
+        group_key = get_group_key(self.domain, group_name)
+        members = []
+        page_token = None
+        while True:
+            response = (
+                self.directory.members()
+                .list(groupKey=group_key, maxResults=200, pageToken=page_token)
+                .execute()
+            )
+            members.extend(response.get("members") or [])
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return members
+
+    def list_user_groups(self, user_email: str) -> List[dict]:
+        """
+        Get all G Suite groups a user is a member of, following every page of the group
+        list.
+        """
+        user_key = get_user_key(self.domain, user_email)
+        groups = []
+        page_token = None
+        while True:
+            response = (
+                self.directory.groups()
+                .list(userKey=user_key, maxResults=200, pageToken=page_token)
+                .execute()
+            )
+            groups.extend(response.get("groups") or [])
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return groups
+
+    def group_changes(
+        self, group_name: str, desired_emails: Iterable[str]
+    ) -> List[MembershipChange]:
+        """
+        The insertions and removals needed for a G Suite group to contain exactly the
+        desired emails.
+        """
+        group_key = get_group_key(self.domain, group_name)
+        current = {
+            member.get("email", "").lower()
+            for member in self.list_group_members(group_name)
+        }
+        desired = {email.lower() for email in desired_emails if email}
+
+        changes = [
+            MembershipChange(INSERT, group_key, email)
+            for email in sorted(desired - current)
+        ]
+        changes += [
+            MembershipChange(REMOVE, group_key, email)
+            for email in sorted(current - desired - self._protected_emails())
+        ]
+        return changes
+
+    def user_changes(
+        self, user_email: str, desired_group_names: Iterable[str]
+    ) -> List[MembershipChange]:
+        """
+        The insertions and removals needed for a user to be in exactly the desired
+        synced G Suite groups.
+        """
+        user_key = get_user_key(self.domain, user_email).lower()
+        synced_groups = set(settings.OW4_GSUITE_SYNC.get("GROUPS", {}).keys())
+        current = {
+            group.get("name", "").lower() for group in self.list_user_groups(user_key)
+        }
+        desired = {name.lower() for name in desired_group_names}
+
+        changes = [
+            MembershipChange(INSERT, get_group_key(self.domain, name), user_key)
+            for name in sorted(desired - current)
+        ]
+        if user_key not in self._protected_emails():
+            changes += [
+                MembershipChange(REMOVE, get_group_key(self.domain, name), user_key)
+                for name in sorted((current & synced_groups) - desired)
+            ]
+        return changes
+
+    def _allowed(self, change: MembershipChange) -> bool:
+        setting = "ENABLE_INSERT" if change.action == INSERT else "ENABLE_DELETE"
+        if settings.OW4_GSUITE_SYNC.get(setting, False):
+            return True
+        logger.debug(
+            f'Skipping {change.action} of "{change.email}" in "{change.group_key}" '
+            f"since {setting} is False."
+        )
+        return False
+
+    def _build_request(self, change: MembershipChange):
+        members = self.directory.members()
+        if change.action == INSERT:
+            return members.insert(
+                groupKey=change.group_key,
+                body={"email": change.email, "role": "MEMBER"},
+            )
+        return members.delete(groupKey=change.group_key, memberKey=change.email)
+
+    def _execute_batch(self, changes: List[MembershipChange]):
+        """
+        Send one batch request, returning the succeeded, retriable and failed changes.
+        """
+        outcomes = {}
+
+        def callback(request_id, response, exception):
+            outcomes[int(request_id)] = exception
+
+        batch = self.directory.new_batch_http_request(callback=callback)
+        for index, change in enumerate(changes):
+            batch.add(self._build_request(change), request_id=str(index))
+
+        try:
+            batch.execute(http=self._get_http())
+        except Exception as err:
+            logger.warning(f"G Suite batch request failed: {err}")
+            return [], list(changes), []
+
+        succeeded, retriable, failed = [], [], []
+        for index, change in enumerate(changes):
+            err = outcomes.get(index)
+            if err is None or _is_already_applied(change, err):
+                succeeded.append(change)
+            elif _is_retriable(err):
+                retriable.append(change)
+            else:
+                failed.append((change, err))
+        return succeeded, retriable, failed
+
+    def apply(self, changes: List[MembershipChange]) -> ReconciliationResult:
+        """
+        Apply membership changes through batch requests with bounded concurrency and
+        backoff.
+        """
+        pending = [change for change in changes if self._allowed(change)]
+        succeeded, failures = [], []
+
+        attempt = 0
+        while pending:
+            batches = [
+                pending[index : index + self.batch_size]
+                for index in range(0, len(pending), self.batch_size)
+            ]
+            pending = []
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                for batch_succeeded, retriable, batch_failed in executor.map(
+                    self._execute_batch, batches
+                ):
+                    succeeded += batch_succeeded
+                    pending += retriable
+                    failures += batch_failed
+
+            if not pending:
+                break
+            if attempt >= self.max_retries:
+                logger.error(
+                    f"Giving up on {len(pending)} G Suite membership changes "
+                    f"after {attempt} retries.",
+                    extra={"changes": pending},
+                )
+                failures += [(change, None) for change in pending]
+                break
+
+            delay = self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+            logger.info(
+                f"Retrying {len(pending)} G Suite membership changes "
+                f"in {delay:.1f} seconds."
+            )
+            time.sleep(delay)
+            attempt += 1
+
+        for change, err in failures:
+            if err:
+                logger.error(
+                    f'HttpError on {change.action} of "{change.email}" '
+                    f'in G Suite group "{change.group_key}": {err}'
+                )
+
+        return ReconciliationResult(
+            inserted=[change for change in succeeded if change.action == INSERT],
+            removed=[change for change in succeeded if change.action == REMOVE],
+            failed=[change for change, err in failures],
+            errors=[err for change, err in failures if err],
+        )
+
+    def reconcile_group(
+        self, group_name: str, desired_emails: Iterable[str]
+    ) -> ReconciliationResult:
+        changes = self.group_changes(group_name, desired_emails)
+        logger.info(
+            f"Reconciling G Suite group '{group_name}' with {len(changes)} changes."
+        )
+        return self.apply(changes)
+
+    def reconcile_user(
+        self, user_email: str, desired_group_names: Iterable[str]
+    ) -> ReconciliationResult:
+        changes = self.user_changes(user_email, desired_group_names)
+        logger.info(
+            f"Reconciling G Suite groups for '{user_email}' "
+            f"with {len(changes)} changes."
+        )
+        return self.apply(changes)
@@ -0,0 +1,125 @@
+from unittest import mock
+
+import httplib2
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+from django_dynamic_fixture import G
+
+from apps.authentication.models import OnlineUser as User
+from apps.gsuite.mail_syncer.fake_directory import FakeDirectory, FakeDirectoryServer
+from apps.gsuite.mail_syncer.main import update_g_suite_group, update_g_suite_user
+from apps.gsuite.mail_syncer.reconciliation import GroupReconciler
+
+
+class GroupReconcilerTestCase(TestCase):
+    def setUp(self):
+        self.domain = settings.OW4_GSUITE_SYNC.get("DOMAIN")
+        self.group_name = list(settings.OW4_GSUITE_SYNC.get("GROUPS").keys())[0]
+        self.group_key = f"{self.group_name}@{self.domain}"
+
+        self.ow4_gsuite_sync = settings.OW4_GSUITE_SYNC.copy()
+        # Avoid running the syncer from signals while setting up groups
+        self.ow4_gsuite_sync["ENABLED"] = False
+        self.ow4_gsuite_sync["ENABLE_INSERT"] = True
+        self.ow4_gsuite_sync["ENABLE_DELETE"] = True
+
+        self.fake_directory = FakeDirectory()
+        self.server = FakeDirectoryServer(self.fake_directory).__enter__()
+        self.addCleanup(self.server.__exit__)
+
+    def get_reconciler(self, **kwargs):
+        return GroupReconciler(
+            self.domain,
+            directory=self.server.build_client(),
+            http_factory=httplib2.Http,
+            backoff=0,
+            **kwargs,
+        )
+
+    def test_batches_are_authorized_with_the_given_credentials(self):
+        credentials = mock.Mock()
+        reconciler = GroupReconciler(
+            self.domain, directory=self.server.build_client(), credentials=credentials
+        )
+
+        self.assertIs(reconciler._authorized_http().credentials, credentials)
+
+    def email(self, username):
+        return f"{username}@{self.domain}"
+
+    def test_reconcile_group_pages_through_members_and_applies_diff(self):
+        current = [self.email(f"current{index}") for index in range(450)]
+        self.fake_directory.add_group(self.group_key, current + [self.email("leder")])
+        desired = current[50:] + [self.email("new1"), self.email("new2")]
+
+        with override_settings(OW4_GSUITE_SYNC=self.ow4_gsuite_sync):
+            result = self.get_reconciler(batch_size=20).reconcile_group(
+                self.group_name, desired
+            )
+
+        self.assertEqual(len(result.inserted), 2)
+        self.assertEqual(len(result.removed), 50)
+        self.assertEqual(result.failed, [])
+        self.assertEqual(
+            set(self.fake_directory.groups[self.group_key]),
+            set(desired + [self.email("leder")]),
+        )
+
+    def test_rate_limited_changes_are_retried(self):
+        self.fake_directory.rate_limit_every = 3
+        self.fake_directory.add_group(self.group_key, [])
+        desired = [self.email(f"user{index}") for index in range(30)]
+
+        with override_settings(OW4_GSUITE_SYNC=self.ow4_gsuite_sync):
+            result = self.get_reconciler(batch_size=10).reconcile_group(
+                self.group_name, desired
+            )
+
+        self.assertEqual(len(result.inserted), 30)
+        self.assertEqual(set(self.fake_directory.groups[self.group_key]), set(desired))
+
+    def test_nothing_is_changed_when_unsafe_calls_are_disabled(self):
+        self.fake_directory.add_group(self.group_key, [self.email("excess")])
+        self.ow4_gsuite_sync["ENABLE_INSERT"] = False
+        self.ow4_gsuite_sync["ENABLE_DELETE"] = False
+
+        with override_settings(OW4_GSUITE_SYNC=self.ow4_gsuite_sync):
+            result = self.get_reconciler().reconcile_group(
+                self.group_name, [self.email("missing")]
+            )
+
+        self.assertEqual(result.inserted, [])
+        self.assertEqual(result.removed, [])
+        self.assertEqual(
+            self.fake_directory.groups[self.group_key], [self.email("excess")]
+        )
+
+    def test_update_g_suite_group_syncs_ow4_members(self):
+        group = G(Group, name=self.group_name)
+        member = G(User, online_mail="member")
+        self.fake_directory.add_group(self.group_key, [self.email("excess")])
+
+        with override_settings(OW4_GSUITE_SYNC=self.ow4_gsuite_sync):
+            group.user_set.add(member)
+            update_g_suite_group(
+                self.domain, self.group_name, reconciler=self.get_reconciler()
+            )
+
+        self.assertEqual(
+            self.fake_directory.groups[self.group_key], [self.email("member")]
+        )
+
+    def test_update_g_suite_user_only_touches_synced_groups(self):
+        user = G(User, online_mail="member")
+        other_group_key = f"not-synced@{self.domain}"
+        self.fake_directory.add_group(self.group_key, [self.email("member")])
+        self.fake_directory.add_group(other_group_key, [self.email("member")])
+
+        with override_settings(OW4_GSUITE_SYNC=self.ow4_gsuite_sync):
+            update_g_suite_user(self.domain, user, reconciler=self.get_reconciler())
+
+        self.assertEqual(self.fake_directory.groups[self.group_key], [])
+        self.assertEqual(
+            self.fake_directory.groups[other_group_key], [self.email("member")]
+        )
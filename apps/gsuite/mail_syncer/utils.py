@@ -3,11 +3,16 @@ from typing import Dict, List, Optional, Union
 
 from django.conf import settings
 from django.db.models import QuerySet
+from google.auth.credentials import Credentials
 from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
 
 from apps.authentication.models import OnlineUser as User
-from apps.gsuite.auth import build_and_authenticate_g_suite_service
+from apps.gsuite.auth import (
+    build_and_authenticate_g_suite_service,
+    build_g_suite_service,
+    generate_g_suite_credentials,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +25,22 @@ scopes = [
 ]
 
 
-def setup_g_suite_client() -> Optional[Resource]:
+def setup_g_suite_credentials() -> Credentials:
+    """
+    Creates the service account credentials used by the API client.
+    :return: Credentials for the directory API scopes
+    """
+    return generate_g_suite_credentials(
+        json_keyfile_name=settings.OW4_GSUITE_SETTINGS.get("CREDENTIALS"),
+        scopes=scopes,
+    )
+
+
+def setup_g_suite_client(credentials: Credentials = None) -> Optional[Resource]:
     """
     Sets up a working API client towards the Google Developers API.
     Requires various Django settings to be set to function properly.
+    :param credentials: Credentials to build the client with instead of new ones.
     :return: Google API Client
     """
     if not settings.OW4_GSUITE_SYNC.get("ENABLED", False):
@@ -44,6 +61,8 @@ def setup_g_suite_client() -> Optional[Resource]:
             'Neither "ENABLE_INSERT" nor "ENABLE_DELETE" are enabled.'
         )
 
+    if credentials:
+        return build_g_suite_service("admin", "directory_v1", credentials)
     return build_and_authenticate_g_suite_service("admin", "directory_v1", scopes)
 
 
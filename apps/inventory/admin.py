@@ -21,5 +21,8 @@ class ItemAdmin(admin.ModelAdmin):
         "price",
     ]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_inventory_summary()
+
 
 admin.site.register(Item, ItemAdmin)
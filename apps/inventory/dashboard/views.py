@@ -28,7 +28,9 @@ def index(request):
     # Create the base context needed for the sidebar
     context = get_base_context(request)
     # Select all items that are available for purchase
-    context["items"] = Item.objects.filter(available=True).order_by("name")
+    context["items"] = (
+        Item.objects.filter(available=True).with_inventory_summary().order_by("name")
+    )
 
     return render(request, "inventory/dashboard/index.html", context)
 
@@ -42,7 +44,9 @@ def discontinued(request):
     # Create the base context needed for the sidebar
     context = get_base_context(request)
     # Select all items that are not available for purchase
-    context["items"] = Item.objects.filter(available=False).order_by("name")
+    context["items"] = (
+        Item.objects.filter(available=False).with_inventory_summary().order_by("name")
+    )
 
     return render(request, "inventory/dashboard/discontinued.html", context)
 
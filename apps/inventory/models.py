@@ -3,6 +3,8 @@
 from django.conf import settings
 from django.core.mail import EmailMessage
 from django.db import models
+from django.db.models import Max, Min, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
@@ -22,8 +24,24 @@ class ItemCategory(models.Model):
         default_permissions = ("add", "change", "delete")
 
 
+class ItemQuerySet(models.QuerySet):
+    def with_inventory_summary(self):
+        """
+        Annotate the total amount, oldest expiration date and last added date of the
+        batches of each item, so lists of items can show their inventory without a query
+        per item.
+        """
+        return self.annotate(
+            batch_total_amount=Coalesce(Sum("batches__amount"), 0),
+            batch_oldest_expiration_date=Min("batches__expiration_date"),
+            batch_last_added=Max("batches__date_added"),
+        )
+
+
 class Item(models.Model):
 
+    objects = ItemQuerySet.as_manager()
+
     name = models.CharField(_("Varetype"), max_length=50)
     description = models.CharField(
         _("Beskrivelse"), max_length=50, null=True, blank=True
@@ -47,69 +65,52 @@ class Item(models.Model):
 
     @property
     def oldest_expiration_date(self):
-        batches = self.batches.all().order_by("expiration_date")
-        if batches:
-            return batches[0].expiration_date
-        else:
-            return None
+        if hasattr(self, "batch_oldest_expiration_date"):
+            return self.batch_oldest_expiration_date
+        return self.batches.aggregate(oldest=Min("expiration_date"))["oldest"]
 
     @property
     def last_added(self):
-        batches = self.batches.all().order_by("-date_added")
-        if batches:
-            return batches[0].date_added
-        else:
-            return None
+        if hasattr(self, "batch_last_added"):
+            return self.batch_last_added
+        return self.batches.aggregate(last_added=Max("date_added"))["last_added"]
 
     def oldest_batch(self):
-        batches = self.batches.filter(amount__gt=0).order_by("date_added")
-        if batches:
-            return batches[0]
-        else:
-            return None
+        return self.batches.filter(amount__gt=0).order_by("date_added", "pk").first()
 
     @property
     def total_amount(self):
-        return sum([batch.amount for batch in self.batches.all()])
+        if hasattr(self, "batch_total_amount"):
+            return self.batch_total_amount
+        return self.batches.aggregate(total=Coalesce(Sum("amount"), 0))["total"]
 
     @property
     def has_expired_batch(self):
-        if (
-            self.oldest_expiration_date
-            and timezone.now().date() >= self.oldest_expiration_date
-        ):
-            return True
-        return False
+        oldest_expiration_date = self.oldest_expiration_date
+        return bool(
+            oldest_expiration_date and timezone.now().date() >= oldest_expiration_date
+        )
 
     def reduce_stock(self, amount):
         """
         Makes an assumption that the oldest batches are sold first and reduce them first.
         """
+        from apps.inventory.utils import reduce_stock
 
-        oldest_batch = self.oldest_batch()
-
-        if oldest_batch:
-            if oldest_batch.amount > amount:
-                oldest_batch.amount = oldest_batch.amount - amount
-                oldest_batch.save()
-            else:
-                diff = amount - oldest_batch.amount
-                oldest_batch.amount = 0
-                oldest_batch.save()
-                self.reduce_stock(diff)
-
-        self.handle_notifications(amount)
+        reduce_stock({self: amount})
 
-    def handle_notifications(self, amount):
+    def handle_notifications(self, amount, total_amount=None):
+        if total_amount is None:
+            total_amount = self.total_amount
 
         # Send one notification when the stock goes to or below 10
         if (
-            self.total_amount <= self.low_stock_treshold
-            and self.total_amount + amount > self.low_stock_treshold
+            total_amount <= self.low_stock_treshold
+            and total_amount + amount > self.low_stock_treshold
         ):
             message = (
                 "Det er kun "
-                + str(self.total_amount)
+                + str(total_amount)
                 + " igjen av "
                 + str(self.name)
                 + " på kontoret.\n\n"
@@ -1 +1,60 @@
-# Create your tests here.
+from django.test import TestCase
+from django.utils import timezone
+from django_dynamic_fixture import G
+
+from apps.inventory.models import Batch, Item
+from apps.inventory.utils import reduce_stock
+
+
+class ItemStockTestCase(TestCase):
+    def setUp(self):
+        self.item: Item = G(Item, low_stock_treshold=0)
+
+    def _amounts(self):
+        return list(
+            Batch.objects.filter(item=self.item)
+            .order_by("pk")
+            .values_list("amount", flat=True)
+        )
+
+    def test_reduce_stock_takes_from_oldest_batches_first(self):
+        G(Batch, item=self.item, amount=2)
+        G(Batch, item=self.item, amount=-1)
+        G(Batch, item=self.item, amount=5)
+
+        self.item.reduce_stock(4)
+
+        self.assertEqual(self._amounts(), [0, -1, 3])
+
+    def test_reduce_stock_of_several_items_in_a_constant_number_of_queries(self):
+        other_item: Item = G(Item, low_stock_treshold=0)
+        for _ in range(3):
+            G(Batch, item=self.item, amount=1)
+            G(Batch, item=other_item, amount=1)
+
+        # Savepoint, item locks, batches, batch update and savepoint release
+        with self.assertNumQueries(5):
+            reduce_stock({self.item: 2, other_item: 3})
+
+        self.assertEqual(self._amounts(), [0, 0, 1])
+        self.assertEqual(other_item.total_amount, 0)
+
+    def test_inventory_summary_matches_properties(self):
+        today = timezone.now().date()
+        G(Batch, item=self.item, amount=3, expiration_date=today)
+        G(Batch, item=self.item, amount=4, expiration_date=None)
+        G(Item)
+
+        for annotated in Item.objects.with_inventory_summary():
+            item = Item.objects.get(pk=annotated.pk)
+            self.assertEqual(annotated.total_amount, item.total_amount)
+            self.assertEqual(
+                annotated.oldest_expiration_date, item.oldest_expiration_date
+            )
+            self.assertEqual(annotated.last_added, item.last_added)
+            self.assertEqual(annotated.has_expired_batch, item.has_expired_batch)
+
+        annotated = Item.objects.with_inventory_summary().get(pk=self.item.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(annotated.total_amount, 7)
+            self.assertTrue(annotated.has_expired_batch)
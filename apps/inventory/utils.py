@@ -0,0 +1,62 @@
+from typing import Dict
+
+from django.db import transaction
+from django.db.models import F, Sum, Window
+from django.db.models.functions import Greatest
+
+from apps.inventory.models import Batch, Item
+
+
+@transaction.atomic
+def reduce_stock(quantities: Dict[Item, int]):
+    """
+    Reduce the stock of several items at once, taking from the oldest batches of each
+    item first.
+
+    A single query finds, with window functions, how much is in stock before each batch
+    and in total for each item, and the changed batches are saved in one query. The
+    items are locked first, since PostgreSQL can't lock rows read together with window
+    functions.
+    """
+    demand = {item.pk: amount for item, amount in quantities.items()}
+    # Items are locked in the same order as in OrderLine.pay, to avoid deadlocks
+    list(
+        Item.objects.select_for_update()
+        .filter(pk__in=demand)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    batches = (
+        Batch.objects.filter(item_id__in=demand)
+        .annotate(
+            stock=Window(Sum("amount"), partition_by=[F("item_id")]),
+            # Batches with a negative amount have nothing to take from
+            running_stock=Window(
+                Sum(Greatest("amount", 0)),
+                partition_by=[F("item_id")],
+                order_by=[F("date_added").asc(), F("pk").asc()],
+            ),
+        )
+        .order_by("item_id", "date_added", "pk")
+    )
+
+    stock = {}
+    taken = {pk: 0 for pk in demand}
+    changed_batches = []
+    for batch in batches:
+        stock[batch.item_id] = batch.stock
+        available = max(batch.amount, 0)
+        stock_before = batch.running_stock - available
+        amount = min(available, max(demand[batch.item_id] - stock_before, 0))
+        if amount:
+            batch.amount -= amount
+            taken[batch.item_id] += amount
+            changed_batches.append(batch)
+
+    Batch.objects.bulk_update(changed_batches, ["amount"])
+
+    for item, amount in quantities.items():
+        item.handle_notifications(
+            amount, total_amount=stock.get(item.pk, 0) - taken[item.pk]
+        )
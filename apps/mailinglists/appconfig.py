@@ -11,6 +11,14 @@ class MailinglistsConfig(AppConfig):
 
         import apps.mailinglists.signals  # noqa: F401
         from apps.mailinglists.models import MailEntity, MailGroup
+        from utils import search
 
         watson.register(MailGroup)
         watson.register(MailEntity)
+        search.register(
+            MailGroup,
+            fields=[("email_local_part", "A"), ("name", "A"), ("description", "C")],
+        )
+        search.register(
+            MailEntity, fields=[("email", "A"), ("name", "A"), ("description", "C")]
+        )
@@ -1,22 +1,16 @@
 import logging
 
-from django_filters import filters, filterset
-from watson import search as watson_search
+from django_filters import filterset
+
+from utils.search import SearchFilter
 
 from .models import MailEntity, MailGroup
 
 logger = logging.getLogger(__name__)
 
 
-class WatsonFilter(filters.CharFilter):
-    def filter(self, queryset, value):
-        if value and value != "":
-            queryset = watson_search.filter(queryset, value)
-        return queryset
-
-
 class MailGroupFilter(filterset.FilterSet):
-    query = WatsonFilter()
+    query = SearchFilter()
 
     class Meta:
         model = MailGroup
@@ -24,7 +18,7 @@ class MailGroupFilter(filterset.FilterSet):
 
 
 class MailEntityFilter(filterset.FilterSet):
-    query = WatsonFilter()
+    query = SearchFilter()
 
     class Meta:
         model = MailEntity
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from utils.search import AddSearchVector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mailinglists", "0001_initial"),
+    ]
+
+    operations = [
+        AddSearchVector(
+            model_name="mailgroup",
+            fields=[("email_local_part", "A"), ("name", "A"), ("description", "C"),],
+            config="simple",
+        ),
+        AddSearchVector(
+            model_name="mailentity",
+            fields=[("email", "A"), ("name", "A"), ("description", "C"),],
+            config="simple",
+        ),
+    ]
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
 from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import groupby
+from typing import Iterable
 
 from django.conf import settings
 from django.db import models
@@ -101,10 +104,29 @@ class Mark(models.Model):
         super(Mark, self).save(*args, **kwargs)
 
     def delete(self, **kwargs):
-        given_to = [mu.user for mu in self.given_to.all()]
+        given_to = list(self.given_to.values_list("user_id", flat=True))
         super(Mark, self).delete()
-        for user in given_to:
-            _fix_mark_history(user)
+        _fix_mark_histories(given_to)
+
+    def give_to(self, users: Iterable) -> list:
+        """
+        Give this mark to many users at once, skipping users who already have it.
+        Expiration dates for all the users are recalculated in a single pass afterwards.
+        Returns the users given the mark.
+        """
+        existing_user_ids = set(self.given_to.values_list("user_id", flat=True))
+        new_users = {
+            user.pk: user for user in users if user.pk not in existing_user_ids
+        }
+        today = timezone.now().date()
+        MarkUser.objects.bulk_create(
+            [
+                MarkUser(mark=self, user=user, expiration_date=today)
+                for user in new_users.values()
+            ]
+        )
+        _fix_mark_histories(new_users.keys())
+        return list(new_users.values())
 
     class Meta:
         verbose_name = _("Prikk")
@@ -149,6 +171,14 @@ class MarkUser(models.Model):
 def _fix_mark_history(user):
     """
     Goes through a users complete mark history and resets all expiration dates.
+    """
+    _fix_mark_histories([user.pk])
+
+
+def _fix_mark_histories(user_ids: Iterable[int]):
+    """
+    Goes through the complete mark history of the given users and resets all expiration
+    dates.
 
     The reasons for doing it this way is that the mark rules now insist on marks building
     on previous expiration dates if such exists. Instead of having the entire mark database
@@ -159,34 +189,52 @@ def _fix_mark_history(user):
      * a new MarkUser entry is made
      * an existing MarkUser entry is deleted
     """
-    markusers = MarkUser.objects.filter(user=user).order_by("mark__added_date")
-    last_expiry_date = None
-    for entry in markusers:
-        # If there's a last_expiry date, it means a mark has been processed already.
-        # If that expiration date is within a DURATION of this added date, build on it.
-        if (
-            last_expiry_date
-            and entry.mark.added_date - timedelta(days=DURATION) < last_expiry_date
-        ):
-            entry.expiration_date = _get_with_duration_and_vacation(last_expiry_date)
-        # If there is no last_expiry_date or the last expiry date is over a DURATION old
-        # we add DURATIION days from the added date of the mark.
-        else:
-            entry.expiration_date = _get_with_duration_and_vacation(
-                entry.mark.added_date
-            )
-        entry.save()
-        last_expiry_date = entry.expiration_date
-
-
-def _get_with_duration_and_vacation(added_date=timezone.now()):
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+
+    markusers = (
+        MarkUser.objects.filter(user_id__in=user_ids)
+        .select_related("mark")
+        .order_by("user_id", "mark__added_date", "id")
+    )
+    changed = []
+    for _user_id, entries in groupby(markusers, key=lambda entry: entry.user_id):
+        last_expiry_date = None
+        for entry in entries:
+            # If there's a last_expiry date, it means a mark has been processed already.
+            # If that expiry date is within a DURATION of this added date, build on it.
+            if (
+                last_expiry_date
+                and entry.mark.added_date - timedelta(days=DURATION) < last_expiry_date
+            ):
+                expiration_date = _get_with_duration_and_vacation(last_expiry_date)
+            # If there is no last_expiry_date or the last expiry date is over a DURATION
+            # old we add DURATIION days from the added date of the mark.
+            else:
+                expiration_date = _get_with_duration_and_vacation(entry.mark.added_date)
+            if entry.expiration_date != expiration_date:
+                entry.expiration_date = expiration_date
+                changed.append(entry)
+            last_expiry_date = expiration_date
+
+    MarkUser.objects.bulk_update(changed, ["expiration_date"], batch_size=500)
+
+
+def _get_with_duration_and_vacation(added_date=None):
     """
     Checks whether the span of a marks duration needs to have vacation durations added.
     """
-
+    if added_date is None:
+        added_date = timezone.now().date()
     if type(added_date) == datetime:
         added_date = added_date.date()
 
+    return _get_expiry_date(added_date)
+
+
+@lru_cache(maxsize=1024)
+def _get_expiry_date(added_date: date) -> date:
     # Add the duration
     expiry_date = added_date + timedelta(days=DURATION)
     # Set up the summer and winter vacations
@@ -80,6 +80,49 @@ class MarksTest(TestCase):
         self.assertEqual(date(2013, 9, 14), _get_with_duration_and_vacation(d))
 
 
+class GiveMarksTest(TestCase):
+    def setUp(self):
+        self.users = G(User, n=5)
+        self.first_mark = G(Mark, added_date=date(2013, 2, 1))
+        self.second_mark = G(Mark, added_date=date(2013, 2, 20))
+
+    def test_give_to_gives_mark_to_every_user_once(self):
+        self.first_mark.give_to(self.users[:2])
+
+        given_to = self.first_mark.give_to(self.users)
+
+        self.assertEqual(given_to, self.users[2:])
+        self.assertEqual(self.first_mark.given_to.count(), 5)
+
+    def test_give_to_builds_on_previous_expiration_dates(self):
+        self.first_mark.give_to(self.users)
+        self.second_mark.give_to(self.users)
+
+        for user in self.users:
+            first, second = MarkUser.objects.filter(user=user).order_by(
+                "mark__added_date"
+            )
+            self.assertEqual(first.expiration_date, date(2013, 3, 3))
+            self.assertEqual(second.expiration_date, date(2013, 4, 2))
+
+    def test_give_to_uses_constant_number_of_queries(self):
+        self.first_mark.give_to(self.users)
+        users = G(User, n=20)
+
+        # Existing entries, insert, history lookup and bulk update
+        with self.assertNumQueries(4):
+            self.second_mark.give_to(self.users + users)
+
+    def test_deleting_mark_fixes_history(self):
+        self.first_mark.give_to(self.users)
+        self.second_mark.give_to(self.users)
+
+        self.first_mark.delete()
+
+        entry = MarkUser.objects.get(user=self.users[0])
+        self.assertEqual(entry.expiration_date, date(2013, 3, 22))
+
+
 class MarkRuleSetTest(TestCase):
     def setUp(self):
         self.rule_set: MarkRuleSet = G(MarkRuleSet, version="1.0.0")
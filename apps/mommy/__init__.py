@@ -33,11 +33,21 @@ def run(**kwargs):
     """
     imports appscheduler, registers scheduled jobs, runs the scheduler
     """
+    from apscheduler.executors.pool import ThreadPoolExecutor
     from apscheduler.schedulers.blocking import BlockingScheduler
+    from django.conf import settings
+
+    from .runner import dispatch_task
 
-    sched = BlockingScheduler(**kwargs)
+    sched = BlockingScheduler(
+        executors={"default": ThreadPoolExecutor(settings.MOMMY_WORKERS)},
+        job_defaults={"coalesce": True, "max_instances": 1},
+        **kwargs,
+    )
 
     for task, kwargs in schedule.tasks.items():
-        sched.add_job(task.run, trigger="cron", name=task.__name__, **kwargs)
+        sched.add_job(
+            dispatch_task, args=[task], trigger="cron", name=task.__name__, **kwargs
+        )
 
     sched.start()  # main loop
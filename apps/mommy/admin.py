@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from apps.mommy.models import TaskRun
+
+
+class TaskRunAdmin(admin.ModelAdmin):
+    model = TaskRun
+    ordering = ["-started_at"]
+    list_display = [
+        "task_name",
+        "started_at",
+        "duration",
+        "status",
+        "query_count",
+        "row_count",
+    ]
+    list_filter = ["task_name", "status"]
+
+
+admin.site.register(TaskRun, TaskRunAdmin)
@@ -1,4 +1,7 @@
-from django.core.management.base import BaseCommand
+import cProfile
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
 
 from apps import mommy
 
@@ -12,6 +15,19 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("job", help="name of job", choices=Command.job_names())
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="run the job under cProfile and print the slowest functions",
+        )
+        parser.add_argument(
+            "--sort",
+            default="cumulative",
+            help="sort order of the profile, as accepted by pstats",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=30, help="number of profile lines to print"
+        )
 
     @staticmethod
     def job_names():
@@ -21,12 +37,26 @@ class Command(BaseCommand):
         return possible_jobs
 
     def handle(self, *args, **options):
+        from apps.mommy.runner import run_task
+
         mommy.autodiscover()
 
-        # run shit
         do_name = options["job"]
-        for task, _ in mommy.schedule.tasks.items():
-            if task.__name__ == do_name:
-                task.run()
-                return
-        print("could not find job:" + do_name)
+        task = mommy.schedule.get_task(do_name)
+        if not task:
+            raise CommandError("could not find job: " + do_name)
+
+        profiler = cProfile.Profile() if options["profile"] else None
+        run = run_task(task, profiler=profiler)
+        if not run:
+            raise CommandError(f"{do_name} is already running")
+
+        self.stdout.write(
+            f"{run.task_name} {run.status} in {run.duration:.2f} seconds with "
+            f"{run.query_count} queries and {run.row_count} rows"
+        )
+        if profiler:
+            stats = pstats.Stats(profiler, stream=self.stdout)
+            stats.sort_stats(options["sort"]).print_stats(options["limit"])
+        if run.error:
+            raise CommandError(run.error)
@@ -0,0 +1,67 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskRun",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "task_name",
+                    models.CharField(
+                        db_index=True, max_length=128, verbose_name="oppgave"
+                    ),
+                ),
+                ("started_at", models.DateTimeField(verbose_name="startet")),
+                ("duration", models.FloatField(verbose_name="varighet (sekunder)")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("succeeded", "Fullført"),
+                            ("failed", "Feilet"),
+                            ("timed_out", "Tidsavbrutt"),
+                        ],
+                        max_length=16,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "query_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="antall spørringer"
+                    ),
+                ),
+                (
+                    "row_count",
+                    models.PositiveIntegerField(default=0, verbose_name="antall rader"),
+                ),
+                (
+                    "error",
+                    models.TextField(
+                        blank=True, default="", verbose_name="feilmelding"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "oppgavekjøring",
+                "verbose_name_plural": "oppgavekjøringer",
+                "ordering": ("-started_at",),
+                "default_permissions": ("add", "change", "delete", "view"),
+            },
+        )
+    ]
@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class TaskRun(models.Model):
+    """
+    A single run of a scheduled mommy task, with timing and database activity.
+    """
+
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    STATUS_CHOICES = (
+        (SUCCEEDED, "Fullført"),
+        (FAILED, "Feilet"),
+        (TIMED_OUT, "Tidsavbrutt"),
+    )
+
+    task_name = models.CharField("oppgave", max_length=128, db_index=True)
+    started_at = models.DateTimeField("startet")
+    duration = models.FloatField("varighet (sekunder)")
+    status = models.CharField("status", max_length=16, choices=STATUS_CHOICES)
+    query_count = models.PositiveIntegerField("antall spørringer", default=0)
+    row_count = models.PositiveIntegerField("antall rader", default=0)
+    error = models.TextField("feilmelding", blank=True, default="")
+
+    def __str__(self):
+        return f"{self.task_name} ({self.started_at:%Y-%m-%d %H:%M})"
+
+    class Meta:
+        verbose_name = "oppgavekjøring"
+        verbose_name_plural = "oppgavekjøringer"
+        ordering = ("-started_at",)
+        default_permissions = ("add", "change", "delete", "view")
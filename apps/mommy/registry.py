@@ -21,8 +21,13 @@ class Schedule(object):
     def __init__(self):
         self._task_names = []
         self._tasks = {}
+        self._timeouts = {}
 
-    def register(self, task, **kwargs):
+    def register(self, task, timeout=None, **kwargs):
+        """
+        Register a task to be run with the given cron arguments.
+        A timeout in seconds can be given to override MOMMY_DEFAULT_TIMEOUT.
+        """
         if task in self._tasks:
             raise ValueError("Could not register %s, already registered", task.__name__)
         if task.__name__ in self._tasks:
@@ -31,7 +36,17 @@ class Schedule(object):
             )
 
         self._tasks[task] = kwargs
+        self._timeouts[task] = timeout
 
     @property
     def tasks(self):
         return self._tasks
+
+    def get_task(self, name):
+        for task in self._tasks:
+            if task.__name__ == name:
+                return task
+        return None
+
+    def get_timeout(self, task):
+        return self._timeouts.get(task)
@@ -0,0 +1,122 @@
+"""
+Runs mommy tasks while preventing overlapping runs, and records the duration and
+database activity of every run as a TaskRun.
+"""
+import logging
+import time
+import traceback
+import uuid
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from apps.mommy import schedule
+from apps.mommy.models import TaskRun
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "mommy:lock:{}"
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting queries and the rows reported by the database.
+    """
+
+    def __init__(self):
+        self.query_count = 0
+        self.row_count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        self.query_count += 1
+        rowcount = context["cursor"].rowcount
+        if rowcount and rowcount > 0:
+            self.row_count += rowcount
+        return result
+
+
+def get_timeout(task) -> int:
+    return schedule.get_timeout(task) or settings.MOMMY_DEFAULT_TIMEOUT
+
+
+def _release_lock(lock_key: str, token: str):
+    # The lock may have expired and been taken by another run if this one overran
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def run_task(task, profiler=None):
+    """
+    Run a task unless another run of it is in progress, and record the run.
+    The lock preventing overlapping runs expires after the timeout of the task.
+    If a cProfile.Profile is given, the task is run under it.
+    Returns the recorded TaskRun, or None if the task was skipped.
+    """
+    name = task.__name__
+    timeout = get_timeout(task)
+    lock_key = LOCK_KEY.format(name)
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, timeout=timeout):
+        logger.warning(f"Skipping mommy task {name}, another run is in progress")
+        return None
+
+    counter = QueryCounter()
+    started_at = timezone.now()
+    start = time.monotonic()
+    status, error = TaskRun.SUCCEEDED, ""
+    try:
+        with connection.execute_wrapper(counter):
+            if profiler:
+                profiler.runcall(task.run)
+            else:
+                task.run()
+    except SoftTimeLimitExceeded:
+        status, error = TaskRun.TIMED_OUT, f"Stopped after {timeout} seconds"
+    except Exception:
+        logger.exception(f"Mommy task {name} failed")
+        status, error = TaskRun.FAILED, traceback.format_exc()
+    finally:
+        _release_lock(lock_key, token)
+    duration = time.monotonic() - start
+
+    if status == TaskRun.SUCCEEDED and duration > timeout:
+        logger.warning(f"Mommy task {name} overran its timeout of {timeout} seconds")
+    logger.info(
+        f"Mommy task {name} {status} in {duration:.2f} seconds with "
+        f"{counter.query_count} queries and {counter.row_count} rows"
+    )
+    return TaskRun.objects.create(
+        task_name=name,
+        started_at=started_at,
+        duration=duration,
+        status=status,
+        query_count=counter.query_count,
+        row_count=counter.row_count,
+        error=error,
+    )
+
+
+def dispatch_task(task):
+    """
+    Run a scheduled task according to MOMMY_EXECUTOR, either right away on the worker
+    pool of the scheduler or by sending it to celery.
+    """
+    if settings.MOMMY_EXECUTOR == "celery":
+        from apps.mommy.tasks import run_scheduled_task
+
+        timeout = get_timeout(task)
+        run_scheduled_task.apply_async(
+            args=[task.__name__], soft_time_limit=timeout, time_limit=timeout + 60
+        )
+        return
+
+    # Scheduler threads are long lived, so stale connections are cleaned up manually
+    close_old_connections()
+    try:
+        run_task(task)
+    finally:
+        close_old_connections()
@@ -0,0 +1,19 @@
+import logging
+
+from apps import mommy
+from apps.mommy.runner import run_task
+from onlineweb4.celery import app
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(ignore_result=True)
+def run_scheduled_task(task_name: str):
+    if not mommy.schedule.tasks:
+        mommy.autodiscover()
+
+    task = mommy.schedule.get_task(task_name)
+    if not task:
+        logger.error(f"Could not find mommy task {task_name}")
+        return
+    run_task(task)
@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from apps.authentication.models import OnlineUser as User
+from apps.mommy.models import TaskRun
+from apps.mommy.registry import Task
+from apps.mommy.runner import LOCK_KEY, run_task
+
+
+class CountUsers(Task):
+    @staticmethod
+    def run():
+        list(User.objects.all())
+
+
+class FailingTask(Task):
+    @staticmethod
+    def run():
+        raise ValueError("Something went wrong")
+
+
+class RunTaskTestCase(TestCase):
+    def setUp(self):
+        G(User, n=3)
+
+    def test_run_is_recorded_with_query_count(self):
+        run = run_task(CountUsers)
+
+        self.assertEqual(run, TaskRun.objects.get())
+        self.assertEqual(run.task_name, "CountUsers")
+        self.assertEqual(run.status, TaskRun.SUCCEEDED)
+        self.assertEqual(run.query_count, 1)
+
+    def test_failing_task_is_recorded_as_failed(self):
+        run = run_task(FailingTask)
+
+        self.assertEqual(run.status, TaskRun.FAILED)
+        self.assertIn("Something went wrong", run.error)
+
+    def test_task_is_skipped_while_another_run_is_in_progress(self):
+        cache.set(LOCK_KEY.format("CountUsers"), "another-run")
+        self.addCleanup(cache.delete, LOCK_KEY.format("CountUsers"))
+
+        self.assertIsNone(run_task(CountUsers))
+        self.assertFalse(TaskRun.objects.exists())
+
+    def test_lock_is_released_after_run(self):
+        run_task(FailingTask)
+
+        self.assertIsNone(cache.get(LOCK_KEY.format("FailingTask")))
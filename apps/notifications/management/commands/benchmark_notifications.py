@@ -0,0 +1,52 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.authentication.models import OnlineUser as User
+from apps.notifications.constants import PermissionType
+from apps.notifications.utils import send_message_to_users
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure queries and time used by send_message_to_users for many recipients. "
+        "Everything is rolled back afterwards, so no notifications are dispatched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        count = options["recipients"]
+        prefix = f"notification-benchmark-{uuid.uuid4().hex[:8]}"
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(
+                    [User(username=f"{prefix}-{index}") for index in range(count)]
+                )
+                recipients = User.objects.filter(username__startswith=prefix)
+
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    send_message_to_users(
+                        title="Benchmark",
+                        content="Benchmark av varsler",
+                        recipients=recipients,
+                        permission_type=PermissionType.DEFAULT,
+                    )
+                    duration = time.perf_counter() - start
+
+                self.stdout.write(
+                    f"{count} recipients: {len(queries)} queries in {duration:.2f} s"
+                )
+                raise Rollback
+        except Rollback:
+            pass
@@ -1,4 +1,5 @@
 import logging
+from typing import Iterable
 
 from django.db import models
 
@@ -145,17 +146,33 @@ class UserPermission(models.Model):
         """
         Create permission settings for user if they don't all exists.
         """
-        user_permissions_count = UserPermission.objects.filter(user=user).count()
-        permission_count = Permission.objects.all().count()
-        if user_permissions_count != permission_count:
-            for permission in Permission.objects.all():
-                user_permission, created = cls.objects.get_or_create(
-                    permission=permission, user=user
-                )
-                if created:
-                    user_permission.allow_email = permission.default_value_email
-                    user_permission.allow_push = permission.default_value_push
-                    user_permission.save()
+        cls.create_all_for_users([user])
+
+    @classmethod
+    def create_all_for_users(cls, users: Iterable[User]):
+        """
+        Create the missing permission settings for many users at once.
+        """
+        user_ids = {user.id for user in users}
+        permissions = list(Permission.objects.all())
+        existing = set(
+            cls.objects.filter(user_id__in=user_ids).values_list(
+                "user_id", "permission_id"
+            )
+        )
+        missing = [
+            cls(
+                user_id=user_id,
+                permission=permission,
+                allow_email=permission.default_value_email,
+                allow_push=permission.default_value_push,
+            )
+            for user_id in user_ids
+            for permission in permissions
+            if (user_id, permission.id) not in existing
+        ]
+        # Conflicts can only happen if the settings are created concurrently
+        cls.objects.bulk_create(missing, ignore_conflicts=True)
 
     def __str__(self):
         return f"{self.permission} - {self.user}"
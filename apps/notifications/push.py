@@ -0,0 +1,219 @@
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from py_vapid import Vapid
+from pywebpush import WebPusher, WebPushException
+from requests.adapters import HTTPAdapter
+
+from .models import Subscription
+
+logger = logging.getLogger(__name__)
+
+VAPID_CLAIMS = {
+    "sub": "mailto:dotkom@online.ntnu.no",
+}
+
+# Push services answer with these codes when a subscription has expired or been removed
+EXPIRED_SUBSCRIPTION_STATUS_CODES = (404, 410)
+
+PUSH_MAX_WORKERS = 16
+PUSH_TIMEOUT = 10
+PUSH_STATISTICS_CACHE_KEY = "notifications:push:statistics:{service}:{metric}"
+PUSH_SERVICES_CACHE_KEY = "notifications:push:services"
+# Latency is counted in whole milliseconds, so every metric is an integer counter
+PUSH_STATISTICS_METRICS = ("sent", "failed", "expired", "latency_ms")
+
+
+class PushResult:
+    def __init__(
+        self,
+        subscription: Subscription,
+        status_code: Optional[int],
+        latency: float,
+        error: str = "",
+    ):
+        self.subscription = subscription
+        self.status_code = status_code
+        self.latency = latency
+        self.error = error
+
+    @property
+    def success(self) -> bool:
+        return self.status_code is not None and self.status_code <= 202
+
+    @property
+    def expired(self) -> bool:
+        return self.status_code in EXPIRED_SUBSCRIPTION_STATUS_CODES
+
+    @property
+    def push_service(self) -> str:
+        return urlparse(self.subscription.endpoint).netloc
+
+
+class PushDeliveryEngine:
+    """
+    Sends web push messages to many subscriptions concurrently over pooled connections.
+
+    Subscriptions which the push service reports as gone are deleted, and the latency
+    and failures of each push service are added to the statistics in the cache.
+    """
+
+    def __init__(
+        self,
+        vapid_private_key: Union[Vapid, str] = None,
+        max_workers: int = PUSH_MAX_WORKERS,
+        timeout: float = PUSH_TIMEOUT,
+    ):
+        vapid_private_key = vapid_private_key or settings.WEB_PUSH_PRIVATE_KEY
+        if isinstance(vapid_private_key, Vapid):
+            self.vapid = vapid_private_key
+        else:
+            self.vapid = Vapid.from_string(private_key=vapid_private_key)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _vapid_headers(self, endpoint: str) -> dict:
+        url = urlparse(endpoint)
+        claims = {
+            **VAPID_CLAIMS,
+            "aud": f"{url.scheme}://{url.netloc}",
+            # Signatures are valid for 12 hours
+            "exp": int(time.time()) + 12 * 60 * 60,
+        }
+        return self.vapid.sign(claims)
+
+    def _send_one(self, delivery: Tuple[Subscription, dict]) -> PushResult:
+        subscription, data = delivery
+        start = time.perf_counter()
+        try:
+            response = WebPusher(
+                subscription.to_vapid_format(), requests_session=self.session
+            ).send(
+                json.dumps(data),
+                headers=self._vapid_headers(subscription.endpoint),
+                timeout=self.timeout,
+            )
+        except (
+            requests.RequestException,
+            WebPushException,
+            ValueError,
+            TypeError,
+        ) as error:
+            return PushResult(
+                subscription, None, time.perf_counter() - start, str(error)
+            )
+
+        result = PushResult(
+            subscription, response.status_code, time.perf_counter() - start
+        )
+        if not result.success:
+            result.error = response.text
+        return result
+
+    def send(self, deliveries: Iterable[Tuple[Subscription, dict]]) -> List[PushResult]:
+        """
+        Send each message to its subscription, and return the results in the same order
+        """
+        deliveries = list(deliveries)
+        if not deliveries:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._send_one, deliveries))
+
+        for result in results:
+            if not result.success:
+                logger.error(
+                    f"Push to {result.subscription.endpoint} failed with "
+                    f"{result.status_code}: {result.error}"
+                )
+
+        self._prune_expired_subscriptions(results)
+        record_push_statistics(results)
+        return results
+
+    @staticmethod
+    def _prune_expired_subscriptions(results: List[PushResult]):
+        expired_ids = {result.subscription.id for result in results if result.expired}
+        if expired_ids:
+            logger.info(f"Deleting {len(expired_ids)} expired push subscriptions")
+            Subscription.objects.filter(pk__in=expired_ids).delete()
+
+
+def _statistics_key(service: str, metric: str) -> str:
+    return PUSH_STATISTICS_CACHE_KEY.format(service=service, metric=metric)
+
+
+def _increment(key: str, delta: int):
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # The counter was evicted between add and incr
+        cache.set(key, delta, timeout=None)
+
+
+def _register_push_services(services: set):
+    known_services = cache.get(PUSH_SERVICES_CACHE_KEY, [])
+    new_services = services.difference(known_services)
+    if new_services:
+        # A lost update is repaired by the next batch to the same service
+        cache.set(
+            PUSH_SERVICES_CACHE_KEY,
+            sorted(new_services.union(known_services)),
+            timeout=None,
+        )
+
+
+def record_push_statistics(results: List[PushResult]):
+    """
+    Add sent, failed and total latency per push service to the counters in the cache.
+    Every metric has its own counter, so concurrent workers do not lose updates.
+    """
+    totals = {}
+    for result in results:
+        service = totals.setdefault(
+            result.push_service, dict.fromkeys(PUSH_STATISTICS_METRICS, 0)
+        )
+        service["sent"] += 1
+        service["failed"] += 0 if result.success else 1
+        service["expired"] += 1 if result.expired else 0
+        service["latency_ms"] += round(result.latency * 1000)
+
+    _register_push_services(set(totals))
+    for service, metrics in totals.items():
+        for metric, value in metrics.items():
+            if value:
+                _increment(_statistics_key(service, metric), value)
+
+
+def get_push_statistics() -> dict:
+    """
+    Statistics per push service, with the average latency in seconds
+    """
+    services = cache.get(PUSH_SERVICES_CACHE_KEY, [])
+    keys = {
+        (service, metric): _statistics_key(service, metric)
+        for service in services
+        for metric in PUSH_STATISTICS_METRICS
+    }
+    counters = cache.get_many(keys.values())
+    statistics = {}
+    for (service, metric), key in keys.items():
+        statistics.setdefault(service, {})[metric] = counters.get(key, 0)
+    for values in statistics.values():
+        values["average_latency"] = (
+            values["latency_ms"] / 1000 / values["sent"] if values["sent"] else 0
+        )
+    return statistics
@@ -1,12 +1,12 @@
-import json
 import logging
+from typing import List
 
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.core.mail import send_mail
-from pywebpush import WebPushException, webpush
+from django.core.mail import get_connection, send_mail
 from rest_framework import serializers
 
+from apps.authentication.models import Email
 from onlineweb4.celery import app as celery_app
 
 from .constants import (
@@ -16,44 +16,12 @@ from .constants import (
     NOTIFICATION_VIBRATION_PATTERN,
 )
 from .models import Notification
+from .push import PushDeliveryEngine
 
 logger = logging.getLogger(__name__)
 
-VAPID_PRIVATE_KEY = settings.WEB_PUSH_PRIVATE_KEY
 WEB_PUSH_ENABLED = settings.WEB_PUSH_ENABLED
 
-VAPID_CLAIMS = {
-    "sub": "mailto:dotkom@online.ntnu.no",
-}
-
-
-def _send_webpush(subscription_info: dict, data: dict) -> bool:
-    """
-    Send a webpush message asynchronously
-    """
-    if not WEB_PUSH_ENABLED:
-        return False
-
-    json_data = json.dumps(data)
-
-    try:
-        webpush(
-            subscription_info=subscription_info,
-            data=json_data,
-            vapid_private_key=VAPID_PRIVATE_KEY,
-            vapid_claims=VAPID_CLAIMS,
-        )
-        return True
-    except WebPushException as error:
-        logger.error(error)
-        # Mozilla returns additional information in the body of the response.
-        if error.response and error.response.json():
-            logger.error(error.response.json())
-        return False
-    except TypeError as error:
-        logger.error(error)
-        raise error
-
 
 class NotificationDataSerializer(serializers.ModelSerializer):
     """
@@ -110,6 +78,32 @@ class NotificationDataSerializer(serializers.ModelSerializer):
         )
 
 
+def _dispatch_push_notifications(notifications: List[Notification]) -> List[int]:
+    """
+    Send the notifications to all push subscriptions of their recipients at once.
+    Returns the ids of the notifications which reached at least one subscription.
+    """
+    if not WEB_PUSH_ENABLED:
+        return []
+
+    deliveries = []
+    for notification in notifications:
+        notification_data = NotificationDataSerializer(notification).data
+        for subscription in notification.recipient.notification_subscriptions.all():
+            deliveries.append((notification, subscription, notification_data))
+
+    results = PushDeliveryEngine().send(
+        (subscription, data) for _, subscription, data in deliveries
+    )
+    return list(
+        {
+            notification.id
+            for (notification, _, _), result in zip(deliveries, results)
+            if result.success
+        }
+    )
+
+
 @celery_app.task(
     bind=True,
     autoretry_for=(ObjectDoesNotExist,),
@@ -117,20 +111,26 @@ class NotificationDataSerializer(serializers.ModelSerializer):
 )
 def dispatch_push_notification_task(_, notification_id: int):
     notification = Notification.objects.get(pk=notification_id)
-    user = notification.recipient
-    notification_data = NotificationDataSerializer(notification).data
-
-    results = []
-    for subscription in user.notification_subscriptions.all():
-        subscription_info = subscription.to_vapid_format()
-        result = _send_webpush(subscription_info, data=notification_data)
-        results.append(result)
 
-    did_any_message_succeed = any(results)
-    notification.sent_push = did_any_message_succeed
+    sent_ids = _dispatch_push_notifications([notification])
+    notification.sent_push = notification.id in sent_ids
     notification.save()
 
 
+@celery_app.task(bind=True)
+def dispatch_push_notifications_task(_, notification_ids: List[int]):
+    """
+    Send push messages for a batch of notifications
+    """
+    notifications = list(
+        Notification.objects.filter(pk__in=notification_ids)
+        .select_related("recipient", "image")
+        .prefetch_related("recipient__notification_subscriptions")
+    )
+    sent_ids = _dispatch_push_notifications(notifications)
+    Notification.objects.filter(pk__in=sent_ids).update(sent_push=True)
+
+
 @celery_app.task(
     bind=True,
     autoretry_for=(ObjectDoesNotExist,),
@@ -150,3 +150,47 @@ def dispatch_email_notification_task(_, notification_id: int):
 
     notification.sent_email = True
     notification.save()
+
+
+@celery_app.task(bind=True)
+def dispatch_email_notifications_task(_, notification_ids: List[int]):
+    """
+    Send emails for a batch of notifications over a single connection to the mail server
+    """
+    notifications = list(Notification.objects.filter(pk__in=notification_ids))
+    primary_emails = dict(
+        Email.objects.filter(
+            user_id__in=[notification.recipient_id for notification in notifications],
+            primary=True,
+        ).values_list("user_id", "email")
+    )
+
+    sent_ids = []
+    try:
+        with get_connection() as connection:
+            for notification in notifications:
+                email = primary_emails.get(notification.recipient_id)
+                if not email:
+                    logger.warning(
+                        f"Not sending email notification {notification.id}, "
+                        f"user {notification.recipient_id} has no primary email"
+                    )
+                    continue
+                try:
+                    send_mail(
+                        subject=notification.title,
+                        message=notification.body,
+                        from_email=notification.from_email,
+                        recipient_list=[email],
+                        fail_silently=False,
+                        connection=connection,
+                    )
+                except Exception:
+                    logger.exception(
+                        f"Failed to send email notification {notification.id}"
+                    )
+                    continue
+                sent_ids.append(notification.id)
+    finally:
+        # Mails which went out are marked even if the connection fails later on
+        Notification.objects.filter(pk__in=sent_ids).update(sent_email=True)
@@ -0,0 +1,95 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from django.test import TestCase
+from django_dynamic_fixture import G
+from py_vapid import Vapid
+
+from apps.authentication.models import OnlineUser as User
+from apps.notifications.models import Subscription
+from apps.notifications.push import PushDeliveryEngine, get_push_statistics
+
+from .utils import NotificationTestMixin
+
+
+class FakePushServiceHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(410 if self.path.startswith("/gone") else 201)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class PushDeliveryEngineTestCase(NotificationTestMixin, TestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), FakePushServiceHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        vapid = Vapid()
+        vapid.generate_keys()
+        self.engine = PushDeliveryEngine(vapid_private_key=vapid, max_workers=4)
+        self.user = G(User)
+
+    def create_subscription(self, path: str) -> Subscription:
+        host, port = self.server.server_address
+        info = self._gen_subscription_info(endpoint=f"http://{host}:{port}{path}")
+        return G(
+            Subscription,
+            user=self.user,
+            endpoint=info["endpoint"],
+            auth=info["keys"]["auth"].decode("utf-8"),
+            p256dh=info["keys"]["p256dh"].decode("utf-8"),
+        )
+
+    def test_messages_are_delivered(self):
+        subscriptions = [self.create_subscription(f"/ok/{i}") for i in range(3)]
+
+        results = self.engine.send(
+            (subscription, {"title": "Hei"}) for subscription in subscriptions
+        )
+
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(
+            [result.subscription for result in results], subscriptions,
+        )
+
+    def test_expired_subscriptions_are_deleted(self):
+        active = self.create_subscription("/ok")
+        expired = self.create_subscription("/gone")
+
+        results = self.engine.send(
+            [(active, {"title": "Hei"}), (expired, {"title": "Hei"})]
+        )
+
+        self.assertTrue(results[0].success)
+        self.assertTrue(results[1].expired)
+        self.assertTrue(Subscription.objects.filter(pk=active.pk).exists())
+        self.assertFalse(Subscription.objects.filter(pk=expired.pk).exists())
+
+    def test_invalid_subscription_keys_fail_only_their_message(self):
+        active = self.create_subscription("/ok")
+        invalid = self.create_subscription("/ok/invalid")
+        invalid.p256dh = "invalid"
+        invalid.save()
+
+        results = self.engine.send(
+            [(active, {"title": "Hei"}), (invalid, {"title": "Hei"})]
+        )
+
+        self.assertTrue(results[0].success)
+        self.assertFalse(results[1].success)
+        self.assertIn("p256dh", results[1].error)
+
+    def test_statistics_are_recorded_per_push_service(self):
+        subscription = self.create_subscription("/gone")
+        host, port = self.server.server_address
+        before = get_push_statistics().get(f"{host}:{port}", {}).get("failed", 0)
+
+        self.engine.send([(subscription, {"title": "Hei"})])
+
+        statistics = get_push_statistics()[f"{host}:{port}"]
+        self.assertEqual(statistics["failed"], before + 1)
@@ -0,0 +1,112 @@
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from apps.authentication.models import Email
+from apps.authentication.models import OnlineUser as User
+from apps.notifications.constants import PermissionType
+from apps.notifications.models import Notification, Permission, UserPermission
+from apps.notifications.tasks import dispatch_email_notifications_task
+from apps.notifications.utils import send_message_to_users
+
+
+class SendMessageToUsersTestCase(TestCase):
+    def setUp(self):
+        self.permission: Permission = G(
+            Permission,
+            permission_type=PermissionType.DEFAULT,
+            allow_email=True,
+            allow_push=True,
+            force_email=False,
+            force_push=False,
+            default_value_email=True,
+            default_value_push=False,
+        )
+        G(Permission, permission_type=PermissionType.WAIT_LIST_BUMP)
+        self.users = [G(User, username=f"user{index}") for index in range(5)]
+
+    def send(self, **kwargs):
+        send_message_to_users(
+            title="Tittel",
+            content="Innhold",
+            recipients=self.users,
+            permission_type=PermissionType.DEFAULT,
+            **kwargs,
+        )
+
+    def test_missing_user_permissions_are_created_for_all_recipients(self):
+        self.send()
+
+        self.assertEqual(
+            UserPermission.objects.filter(user__in=self.users).count(),
+            len(self.users) * Permission.objects.count(),
+        )
+
+    def test_notification_is_created_for_each_recipient(self):
+        self.send()
+
+        self.assertEqual(
+            set(Notification.objects.values_list("recipient_id", flat=True)),
+            {user.id for user in self.users},
+        )
+
+    def test_recipients_without_permission_get_no_notification(self):
+        UserPermission.create_all_for_users(self.users)
+        UserPermission.objects.filter(
+            user=self.users[0], permission=self.permission
+        ).update(allow_email=False)
+
+        self.send()
+
+        self.assertFalse(Notification.objects.filter(recipient=self.users[0]).exists())
+        self.assertEqual(Notification.objects.count(), len(self.users) - 1)
+
+    def test_no_notifications_when_all_methods_are_overridden(self):
+        self.send(
+            force_override_dont_send_email=True, force_override_dont_send_push=True
+        )
+
+        self.assertEqual(Notification.objects.count(), 0)
+
+
+class DispatchEmailNotificationsTestCase(TestCase):
+    def setUp(self):
+        self.users = [G(User, username=f"user{index}") for index in range(3)]
+        for user in self.users[:2]:
+            G(Email, user=user, email=f"{user.username}@example.com", primary=True)
+        permission: Permission = G(Permission, permission_type=PermissionType.DEFAULT)
+        self.notifications = [
+            G(Notification, recipient=user, permission=permission, sent_email=False)
+            for user in self.users
+        ]
+
+    def dispatch(self):
+        dispatch_email_notifications_task(
+            [notification.id for notification in self.notifications]
+        )
+
+    def sent_notifications(self):
+        return set(
+            Notification.objects.filter(sent_email=True).values_list(
+                "recipient_id", flat=True
+            )
+        )
+
+    def test_users_without_primary_email_are_skipped(self):
+        self.dispatch()
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            self.sent_notifications(), {self.users[0].id, self.users[1].id}
+        )
+
+    def test_failing_mail_does_not_stop_the_batch(self):
+        send_mail = mock.Mock(side_effect=[SMTPException("Refused"), 1])
+        with mock.patch("apps.notifications.tasks.send_mail", send_mail):
+            self.dispatch()
+
+        self.assertEqual(send_mail.call_count, 2)
+        self.assertEqual(len(self.sent_notifications()), 1)
@@ -1,7 +1,9 @@
-from typing import Iterable
+from functools import partial
+from typing import Iterable, List
 
 from django.conf import settings
 from django.core.mail import send_mail
+from django.db import connection, transaction
 from django.db.transaction import on_commit
 
 from apps.authentication.models import OnlineGroup as Group
@@ -9,7 +11,10 @@ from apps.authentication.models import OnlineUser as User
 
 from .constants import PermissionType
 from .models import Notification, Permission, UserPermission
-from .tasks import dispatch_email_notification_task, dispatch_push_notification_task
+from .tasks import dispatch_email_notifications_task, dispatch_push_notifications_task
+
+# Number of notifications created per query and dispatched per task
+NOTIFICATION_BATCH_SIZE = 100
 
 
 def send_message_to_users(
@@ -27,14 +32,23 @@ def send_message_to_users(
     permission, created = Permission.objects.get_or_create(
         permission_type=permission_type
     )
-    for recipient in recipients:
-        # Make sure all permissions exists for the user before sending anything.
-        # Available permissions might have changed since the user last loaded their permission dashboard.
-        UserPermission.create_all_for_user(recipient)
-
-        user_permission = UserPermission.objects.get(
-            user=recipient, permission=permission
+    recipients = list(recipients)
+    # Make sure all permissions exists for the users before sending anything.
+    # Available permissions might have changed since the users last loaded their
+    # permission dashboard.
+    UserPermission.create_all_for_users(recipients)
+    user_permissions = {
+        user_permission.user_id: user_permission
+        for user_permission in UserPermission.objects.filter(
+            permission=permission, user__in=[recipient.id for recipient in recipients]
         )
+    }
+
+    notifications = []
+    push_notifications = []
+    email_notifications = []
+    for recipient in recipients:
+        user_permission = user_permissions[recipient.id]
 
         has_push_permission = permission.allow_push and (
             (permission.force_push or user_permission.allow_push)
@@ -49,7 +63,7 @@ def send_message_to_users(
             # Don't create notification at all if permission for none of the types is given
             continue
 
-        notification = Notification.objects.create(
+        notification = Notification(
             title=title,
             body=content,
             recipient=recipient,
@@ -59,20 +73,47 @@ def send_message_to_users(
             url=url,
             tag=tag,
         )
-
+        notifications.append(notification)
         if has_push_permission:
-            on_commit(
-                lambda: dispatch_push_notification_task.delay(
-                    notification_id=notification.id
-                )
+            push_notifications.append(notification)
+        if has_email_permission:
+            email_notifications.append(notification)
+
+    _create_notifications(notifications)
+
+    for batch in _batches(push_notifications):
+        on_commit(
+            partial(
+                dispatch_push_notifications_task.delay,
+                notification_ids=[notification.id for notification in batch],
             )
+        )
 
-        if has_email_permission:
-            on_commit(
-                lambda: dispatch_email_notification_task.delay(
-                    notification_id=notification.id
-                )
+    for batch in _batches(email_notifications):
+        on_commit(
+            partial(
+                dispatch_email_notifications_task.delay,
+                notification_ids=[notification.id for notification in batch],
             )
+        )
+
+
+def _create_notifications(notifications: List[Notification]):
+    # Only some databases return the ids of rows created in bulk, which are needed to
+    # dispatch them.
+    if connection.features.can_return_rows_from_bulk_insert:
+        Notification.objects.bulk_create(
+            notifications, batch_size=NOTIFICATION_BATCH_SIZE
+        )
+    else:
+        with transaction.atomic():
+            for notification in notifications:
+                notification.save()
+
+
+def _batches(notifications: List[Notification]):
+    for index in range(0, len(notifications), NOTIFICATION_BATCH_SIZE):
+        yield notifications[index : index + NOTIFICATION_BATCH_SIZE]
 
 
 def send_message_to_group(
@@ -92,7 +133,7 @@ def send_message_to_group(
         fail_silently=False,
     )
 
-    recipients = [member.user for member in group.members.all()]
+    recipients = [member.user for member in group.members.select_related("user")]
 
     send_message_to_users(
         title=title,
@@ -0,0 +1 @@
+default_app_config = "apps.online_oidc_provider.apps.OnlineOidcProviderConfig"
@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 
 class OnlineOidcProviderConfig(AppConfig):
-    name = "online_oidc_provider"
+    name = "apps.online_oidc_provider"
+
+    def ready(self):
+        super().ready()
+
+        import apps.online_oidc_provider.signals  # noqa: F401
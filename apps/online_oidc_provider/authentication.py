@@ -1,7 +1,79 @@
+"""
+Bearer token authentication for the API using access tokens issued by oidc_provider.
+
+Verified tokens are cached under a hash of the access token, together with a snapshot of
+the user they belong to, so that authenticating a request does not need to touch the
+database. Cache entries never outlive the token, and are invalidated when the token or
+user changes.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 from oidc_provider.lib.utils.oauth2 import extract_access_token
 from oidc_provider.models import Token
 from rest_framework import authentication, exceptions
 
+TOKEN_CACHE_KEY = "oidc:token:{}"
+TOKEN_USER_CACHE_KEY = "oidc:token_user:{}"
+
+
+def _get_cache_timeout() -> int:
+    return getattr(settings, "OW4_OIDC_TOKEN_CACHE_TIMEOUT", 0)
+
+
+def get_token_cache_key(access_token: str) -> str:
+    digest = hashlib.sha256(access_token.encode()).hexdigest()
+    return TOKEN_CACHE_KEY.format(digest)
+
+
+def get_token_user_cache_key(user_id: int) -> str:
+    return TOKEN_USER_CACHE_KEY.format(user_id)
+
+
+def invalidate_cached_token(access_token: str):
+    cache.delete(get_token_cache_key(access_token))
+
+
+def invalidate_cached_token_user(user_id: int):
+    cache.delete(get_token_user_cache_key(user_id))
+
+
+def _cache_token(access_token: str, token: Token):
+    seconds_left = int((token.expires_at - timezone.now()).total_seconds())
+    timeout = min(_get_cache_timeout(), seconds_left)
+    if timeout <= 0:
+        return
+    cache.set_many(
+        {
+            get_token_cache_key(access_token): {
+                "user_id": token.user_id,
+                "expires_at": token.expires_at,
+                "scope": token.scope,
+            },
+            get_token_user_cache_key(token.user_id): token.user,
+        },
+        timeout=timeout,
+    )
+
+
+def _get_cached_token(access_token: str):
+    """
+    The cached user and scopes for an access token, or None if they are not both cached.
+    """
+    token_key = get_token_cache_key(access_token)
+    cached_token = cache.get(token_key)
+    if cached_token is None:
+        return None
+    if timezone.now() >= cached_token["expires_at"]:
+        cache.delete(token_key)
+        raise exceptions.AuthenticationFailed("The oauth2 token has expired")
+    user = cache.get(get_token_user_cache_key(cached_token["user_id"]))
+    if user is None:
+        return None
+    return user, cached_token["scope"]
+
 
 class OidcOauth2Auth(authentication.BaseAuthentication):
     def authenticate(self, request):
@@ -10,13 +82,24 @@ class OidcOauth2Auth(authentication.BaseAuthentication):
         if not access_token:
             # not this kind of auth
             return None
+
+        if _get_cache_timeout():
+            cached = _get_cached_token(access_token)
+            if cached is not None:
+                return cached
+
         oauth2_token = None
         try:
-            oauth2_token = Token.objects.get(access_token=access_token)
+            oauth2_token = Token.objects.select_related("user").get(
+                access_token=access_token
+            )
         except Token.DoesNotExist:
             raise exceptions.AuthenticationFailed("The oauth2 token is invalid")
 
         if oauth2_token.has_expired():
             raise exceptions.AuthenticationFailed("The oauth2 token has expired")
 
-        return oauth2_token.user, None
+        if _get_cache_timeout() and oauth2_token.user_id:
+            _cache_token(access_token, oauth2_token)
+
+        return oauth2_token.user, oauth2_token.scope
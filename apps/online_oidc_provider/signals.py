@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from oidc_provider.models import Token
+
+from apps.online_oidc_provider.authentication import (
+    invalidate_cached_token,
+    invalidate_cached_token_user,
+)
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token_cache(sender, instance: Token, **kwargs):
+    invalidate_cached_token(instance.access_token)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_token_user_cache(sender, instance: User, **kwargs):
+    invalidate_cached_token_user(instance.pk)
@@ -0,0 +1,53 @@
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework import exceptions
+
+from apps.online_oidc_provider.authentication import OidcOauth2Auth
+from apps.online_oidc_provider.test import OIDCTestCase
+
+
+class OidcOauth2AuthTestCase(OIDCTestCase):
+    def setUp(self):
+        self.authentication = OidcOauth2Auth()
+
+    def authenticate(self):
+        request = RequestFactory().get("/", **self.headers)
+        return self.authentication.authenticate(request)
+
+    def test_authenticates_user_with_scopes(self):
+        user, scope = self.authenticate()
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(scope, ["openid", "profile"])
+
+    def test_cached_token_authenticates_without_queries(self):
+        self.authenticate()
+
+        with self.assertNumQueries(0):
+            user, scope = self.authenticate()
+
+        self.assertEqual(user, self.user)
+
+    def test_deleted_token_is_rejected(self):
+        self.authenticate()
+        self.token.delete()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate()
+
+    def test_expired_token_is_rejected(self):
+        self.authenticate()
+        self.token.expires_at = timezone.now() - timezone.timedelta(minutes=1)
+        self.token.save()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate()
+
+    def test_changes_to_user_are_seen(self):
+        self.authenticate()
+        self.user.first_name = "Changed"
+        self.user.save()
+
+        user, scope = self.authenticate()
+
+        self.assertEqual(user.first_name, "Changed")
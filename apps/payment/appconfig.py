@@ -8,4 +8,9 @@ class PaymentConfig(AppConfig):
     def ready(self):
         super(PaymentConfig, self).ready()
 
+        import stripe
+        from django.conf import settings
+
         import apps.payment.signals  # noqa: F401
+
+        stripe.api_base = settings.STRIPE_API_BASE
@@ -0,0 +1,212 @@
+"""
+A small in-memory stand-in for the parts of the Stripe API used for payment intents.
+Used to test and load test payment processing without talking to Stripe.
+
+Intents behave like the Stripe test payment methods with the same ids:
+"pm_card_visa" succeeds, "pm_card_threeDSecure2Required" requires authentication
+before it can be confirmed, and "pm_card_chargeDeclined" is declined.
+"""
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+SUCCEEDING_PAYMENT_METHOD = "pm_card_visa"
+AUTHENTICATION_REQUIRED_PAYMENT_METHOD = "pm_card_threeDSecure2Required"
+DECLINED_PAYMENT_METHOD = "pm_card_chargeDeclined"
+
+Response = Tuple[int, dict]
+
+
+def _error(status: int, error_type: str, message: str, code: str = None) -> Response:
+    error = {"type": error_type, "message": message}
+    if code:
+        error["code"] = code
+    return status, {"error": error}
+
+
+def _not_found(object_name: str, object_id: str, status: int = 404) -> Response:
+    return _error(
+        status,
+        "invalid_request_error",
+        f"No such {object_name}: '{object_id}'",
+        code="resource_missing",
+    )
+
+
+class FakeStripe:
+    """
+    Payment intents kept in memory, with optional latency to simulate the round trip to
+    Stripe.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.intents: Dict[str, dict] = {}
+        self.latency = latency
+        self.request_count = 0
+        self._idempotent_responses: Dict[str, Response] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, method: str, path: str, params: dict, idempotency_key: str = None):
+        """
+        Handle a single API call, returning a (status, json body) tuple.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.request_count += 1
+            if idempotency_key in self._idempotent_responses:
+                return self._idempotent_responses[idempotency_key]
+
+            response = self._route(method, path.strip("/").split("/"), params)
+            if idempotency_key:
+                self._idempotent_responses[idempotency_key] = response
+            return response
+
+    def _route(self, method: str, parts: list, params: dict) -> Response:
+        if parts[:2] == ["v1", "payment_intents"]:
+            if len(parts) == 2 and method == "POST":
+                return self._create_intent(params)
+            intent = self.intents.get(parts[2]) if len(parts) > 2 else None
+            if intent is None:
+                return _not_found("payment_intent", parts[-1])
+            if len(parts) == 3 and method == "GET":
+                return 200, intent
+            if len(parts) == 4 and parts[3] == "confirm":
+                return self._confirm_intent(intent)
+            if len(parts) == 4 and parts[3] == "cancel":
+                intent.update(status="canceled", next_action=None)
+                return 200, intent
+        if parts[:2] == ["v1", "charges"] and len(parts) == 4 and parts[3] == "refund":
+            return self._refund_charge(parts[2])
+        return _error(404, "invalid_request_error", "Unrecognized request URL")
+
+    def _create_intent(self, params: dict) -> Response:
+        payment_method = params.get("payment_method")
+        if payment_method not in (
+            SUCCEEDING_PAYMENT_METHOD,
+            AUTHENTICATION_REQUIRED_PAYMENT_METHOD,
+            DECLINED_PAYMENT_METHOD,
+        ):
+            return _not_found("PaymentMethod", payment_method, status=400)
+        if payment_method == DECLINED_PAYMENT_METHOD:
+            return _error(
+                402, "card_error", "Your card was declined.", code="card_declined"
+            )
+
+        intent_id = f"pi_{uuid.uuid4().hex[:24]}"
+        intent = {
+            "id": intent_id,
+            "object": "payment_intent",
+            "amount": int(params.get("amount", 0)),
+            "currency": params.get("currency"),
+            "description": params.get("description"),
+            "payment_method": payment_method,
+            "client_secret": f"{intent_id}_secret_{uuid.uuid4().hex[:24]}",
+            "status": "requires_confirmation",
+            "next_action": None,
+            "charges": {"object": "list", "data": []},
+        }
+        self.intents[intent_id] = intent
+
+        if str(params.get("confirm")).lower() == "true":
+            if payment_method == AUTHENTICATION_REQUIRED_PAYMENT_METHOD:
+                intent.update(
+                    status="requires_action", next_action={"type": "use_stripe_sdk"},
+                )
+            else:
+                self._succeed(intent)
+        return 200, intent
+
+    def _confirm_intent(self, intent: dict) -> Response:
+        if intent["status"] == "succeeded":
+            return _error(
+                400,
+                "invalid_request_error",
+                "This PaymentIntent has already succeeded.",
+                code="payment_intent_unexpected_state",
+            )
+        self._succeed(intent)
+        return 200, intent
+
+    @staticmethod
+    def _succeed(intent: dict):
+        charge = {
+            "id": f"ch_{uuid.uuid4().hex[:24]}",
+            "object": "charge",
+            "amount": intent["amount"],
+            "refunded": False,
+        }
+        intent.update(status="succeeded", next_action=None)
+        intent["charges"]["data"] = [charge]
+
+    def _refund_charge(self, charge_id: str) -> Response:
+        for intent in self.intents.values():
+            for charge in intent["charges"]["data"]:
+                if charge["id"] == charge_id:
+                    charge["refunded"] = True
+                    return 200, charge
+        return _not_found("charge", charge_id)
+
+
+def _make_handler(stripe: FakeStripe):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _handle(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode() if length else ""
+            url = urlparse(self.path)
+            params = {
+                key: values[0]
+                for key, values in parse_qs(f"{url.query}&{body}").items()
+            }
+
+            status, payload = stripe.handle(
+                self.command, url.path, params, self.headers.get("Idempotency-Key")
+            )
+            content = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("Request-Id", f"req_{uuid.uuid4().hex[:14]}")
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_DELETE = _handle
+
+    return Handler
+
+
+class FakeStripeServer:
+    """
+    Serves a FakeStripe on a local port in a background thread.
+    Point stripe.api_base at api_base to use it.
+    """
+
+    def __init__(self, stripe: FakeStripe = None, port: int = 0):
+        self.stripe = stripe or FakeStripe()
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", port), _make_handler(self.stripe)
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def api_base(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
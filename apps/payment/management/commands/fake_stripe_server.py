@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.payment.fake_stripe import FakeStripe, FakeStripeServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a local stand-in for the Stripe payment intent API, to load test "
+        "payments without Stripe. Point OW4_DJANGO_STRIPE_API_BASE at the printed "
+        "address."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=12111)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.3,
+            help="Seconds the fake API spends on every call",
+        )
+
+    def handle(self, *args, **options):
+        stripe = FakeStripe(latency=options["latency"])
+        with FakeStripeServer(stripe, port=options["port"]) as server:
+            self.stdout.write(f"Serving fake Stripe API on {server.api_base}")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
+        self.stdout.write(
+            f"Handled {stripe.request_count} requests, "
+            f"created {len(stripe.intents)} payment intents"
+        )
@@ -0,0 +1,56 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_wallet_balances(apps, schema_editor):
+    PaymentTransaction = apps.get_model("payment", "PaymentTransaction")
+    WalletBalance = apps.get_model("payment", "WalletBalance")
+    ledger = (
+        PaymentTransaction.objects.filter(status="done")
+        .order_by()
+        .values("user_id")
+        .annotate(coins=Sum("amount"))
+        .values_list("user_id", "coins")
+    )
+    WalletBalance.objects.bulk_create(
+        [
+            WalletBalance(user_id=user_id, balance=coins or 0)
+            for user_id, coins in ledger
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("payment", "0036_auto_20200525_1421"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WalletBalance",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="wallet_balance",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("balance", models.IntegerField(default=0, verbose_name="saldo")),
+            ],
+            options={
+                "verbose_name": "saldo",
+                "verbose_name_plural": "saldoer",
+                "default_permissions": ("add", "change", "delete"),
+            },
+        ),
+        migrations.RunPython(backfill_wallet_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payment", "0037_walletbalance"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="paymentrelation",
+            name="payment_method_id",
+            field=models.CharField(blank=True, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="paymentrelation",
+            name="processing_error",
+            field=models.CharField(blank=True, default="", max_length=512),
+        ),
+        migrations.AlterField(
+            model_name="paymentrelation",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("processing", "processing"),
+                    ("pending", "pending"),
+                    ("succeeded", "succeeded"),
+                    ("done", "done"),
+                    ("refunded", "refunded"),
+                    ("removed", "removed"),
+                    ("failed", "failed"),
+                ],
+                default="succeeded",
+                max_length=30,
+            ),
+        ),
+        migrations.AddField(
+            model_name="paymenttransaction",
+            name="payment_method_id",
+            field=models.CharField(blank=True, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="paymenttransaction",
+            name="processing_error",
+            field=models.CharField(blank=True, default="", max_length=512),
+        ),
+        migrations.AlterField(
+            model_name="paymenttransaction",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("processing", "processing"),
+                    ("pending", "pending"),
+                    ("succeeded", "succeeded"),
+                    ("done", "done"),
+                    ("refunded", "refunded"),
+                    ("removed", "removed"),
+                    ("failed", "failed"),
+                ],
+                default="succeeded",
+                max_length=30,
+            ),
+        ),
+    ]
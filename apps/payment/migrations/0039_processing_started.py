@@ -0,0 +1,23 @@
+# Generated by Django 3.0.10 on 2026-10-17 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payment", "0038_stripe_processing"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="paymentrelation",
+            name="processing_started",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="paymenttransaction",
+            name="processing_started",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
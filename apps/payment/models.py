@@ -2,17 +2,18 @@
 
 import logging
 import uuid
-from typing import List
+from typing import Dict, List
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from apps.authentication.user_cache import invalidate_user_facts
 from apps.marks.models import Suspension
 from apps.notifications.constants import PermissionType
 from apps.notifications.utils import send_message_to_users
@@ -224,6 +225,12 @@ class StripeMixin(models.Model):
     stripe_id = models.CharField(max_length=128, null=True, blank=True)
     payment_intent_secret = models.CharField(max_length=200, null=True, blank=True)
     """ Stripe payment intent secret key for verifying pending transactions/intents """
+    payment_method_id = models.CharField(max_length=128, null=True, blank=True)
+    """ Stripe payment method the intent is created with, while processing """
+    processing_error = models.CharField(max_length=512, blank=True, default="")
+    """ Reason for a failed payment, shown to the user """
+    processing_started = models.DateTimeField(null=True, blank=True, editable=False)
+    """ When the payment last started processing, used to find lost payment tasks """
 
     class Meta:
         abstract = True
@@ -329,6 +336,18 @@ class TransactionManager(models.Manager):
         )
         return value if value is not None else 0
 
+    def aggregate_coins_by_user(self) -> Dict[int, int]:
+        """
+        :return: The aggregated amount of coins in the wallet of each user, by user id.
+        """
+        return dict(
+            self.filter(status=status.DONE)
+            .order_by()
+            .values("user_id")
+            .annotate(coins=models.Sum("amount"))
+            .values_list("user_id", "coins")
+        )
+
 
 class PaymentTransaction(ReceiptMixin, StripeMixin, models.Model):
     """
@@ -349,6 +368,30 @@ class PaymentTransaction(ReceiptMixin, StripeMixin, models.Model):
     def used_stripe(self):
         return self.source == TransactionSource.STRIPE
 
+    @property
+    def coins(self) -> int:
+        """The amount this transaction adds to the wallet of the user"""
+        return (self.amount or 0) if self.status == status.DONE else 0
+
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        # Statuses are changed by pre_save signals, so the wallet balance is updated
+        # after saving
+        previous = None
+        if not self._state.adding:
+            previous = (
+                PaymentTransaction.objects.select_for_update()
+                .filter(pk=self.pk)
+                .only("user_id", "amount", "status")
+                .first()
+            )
+        super().save(*args, **kwargs)
+
+        if previous and previous.coins:
+            WalletBalance.objects.add_coins(previous.user_id, -previous.coins)
+        if self.coins:
+            WalletBalance.objects.add_coins(self.user_id, self.coins)
+
     def get_receipt_timestamp(self) -> timezone.datetime:
         return self.datetime
 
@@ -400,6 +443,79 @@ class PaymentTransaction(ReceiptMixin, StripeMixin, models.Model):
         default_permissions = ("add", "change", "delete")
 
 
+class WalletBalanceManager(models.Manager):
+    def get_balance(self, user_id: int) -> int:
+        balance = self.filter(pk=user_id).values_list("balance", flat=True).first()
+        return balance if balance is not None else 0
+
+    def lock(self, user_id: int) -> "WalletBalance":
+        """
+        Lock the wallet balance of a user until the end of the current database
+        transaction. Changes to the wallet of the user from other database transactions
+        wait for the lock.
+        """
+        self.get_or_create(pk=user_id)
+        return self.select_for_update().get(pk=user_id)
+
+    def add_coins(self, user_id: int, coins: int):
+        updated = self.filter(pk=user_id).update(balance=models.F("balance") + coins)
+        if not updated:
+            self.get_or_create(pk=user_id)
+            self.filter(pk=user_id).update(balance=models.F("balance") + coins)
+
+    def reconcile(self) -> List[int]:
+        """
+        Correct wallet balances differing from the sum of the transactions of the user,
+        which happens when transactions are changed without saving them one by one.
+        :return: The ids of the users whose balance was corrected.
+        """
+        ledger = PaymentTransaction.objects.aggregate_coins_by_user()
+        balances = dict(self.values_list("user_id", "balance"))
+        mismatched = [
+            user_id
+            for user_id in ledger.keys() | balances.keys()
+            if (ledger.get(user_id) or 0) != balances.get(user_id, 0)
+        ]
+
+        corrected = []
+        for user_id in mismatched:
+            with transaction.atomic():
+                wallet_balance = self.lock(user_id)
+                coins = PaymentTransaction.objects.aggregate_coins(user_id)
+                if wallet_balance.balance != coins:
+                    logger.warning(
+                        f"Correcting wallet balance of user {user_id} "
+                        f"from {wallet_balance.balance} to {coins}"
+                    )
+                    wallet_balance.balance = coins
+                    wallet_balance.save(update_fields=["balance"])
+                    corrected.append(user_id)
+        invalidate_user_facts(*corrected)
+        return corrected
+
+
+class WalletBalance(models.Model):
+    """
+    The sum of the completed transactions of a user, kept up to date as transactions are
+    saved.
+    """
+
+    objects = WalletBalanceManager()
+
+    user = models.OneToOneField(
+        User, primary_key=True, related_name="wallet_balance", on_delete=models.CASCADE,
+    )
+    balance = models.IntegerField(_("saldo"), default=0)
+
+    def __str__(self):
+        return f"{self.user} - {self.balance}"
+
+    class Meta:
+        verbose_name = _("saldo")
+        verbose_name_plural = _("saldoer")
+        default_permissions = ("add", "change", "delete")
+
+
 class PaymentReceipt(models.Model):
     """Transaction receipt"""
 
@@ -15,7 +15,8 @@ from apps.events.models import AttendanceEvent, Attendee
 from apps.marks.models import Mark, MarkUser, Suspension
 from apps.mommy import schedule
 from apps.mommy.registry import Task
-from apps.payment.models import Payment, PaymentDelay
+from apps.payment.models import Payment, PaymentDelay, WalletBalance
+from apps.payment.processing import fail_stale_payments
 
 
 class PaymentReminder(Task):
@@ -163,11 +164,7 @@ class PaymentReminder(Task):
         )
         mark.save()
 
-        for user in PaymentReminder.not_paid(payment):
-            user_entry = MarkUser()
-            user_entry.user = user
-            user_entry.mark = mark
-            user_entry.save()
+        mark.give_to(PaymentReminder.not_paid(payment))
 
     @staticmethod
     def unattend(payment):
@@ -324,5 +321,21 @@ class PaymentDelayHandler(Task):
         ).delete()
 
 
+class ReconcileWalletBalances(Task):
+    @staticmethod
+    def run():
+        logger = logging.getLogger(__name__)
+        corrected = WalletBalance.objects.reconcile()
+        logger.info(f"Reconciled wallet balances, corrected {len(corrected)}")
+
+
+class FailStalePayments(Task):
+    @staticmethod
+    def run():
+        fail_stale_payments()
+
+
 schedule.register(PaymentReminder, day_of_week="mon-sun", hour=7, minute=30)
 schedule.register(PaymentDelayHandler, day_of_week="mon-sun", hour=7, minute=45)
+schedule.register(ReconcileWalletBalances, day_of_week="mon-sun", hour=4, minute=0)
+schedule.register(FailStalePayments, minute="*/15")
@@ -0,0 +1,194 @@
+"""
+Stripe payment intents for payment relations and transactions, run by Celery workers.
+
+Payments are created with the PROCESSING status, and a worker creates and confirms
+the payment intent. The intent decides the next status: PENDING when the bank
+requires the user to authenticate the payment with the intent secret, SUCCEEDED
+when the charge went through, and FAILED when Stripe declined it. Intents are
+created with an idempotency key for the payment, so retried tasks never charge
+twice. Payments whose task was lost are recovered from Stripe, or failed, by
+'fail_stale_payments' after PROCESSING_TIMEOUT.
+"""
+import logging
+from typing import Union
+
+import stripe
+from django.conf import settings
+from django.utils import timezone
+
+from apps.payment import status
+from apps.payment.models import PaymentRelation, PaymentTransaction
+
+logger = logging.getLogger(__name__)
+
+StripePayment = Union[PaymentRelation, PaymentTransaction]
+
+# Errors which may succeed if the request is sent again
+RETRIABLE_ERRORS = (stripe.error.APIConnectionError, stripe.error.RateLimitError)
+
+REQUIRES_ACTION_STATUSES = ("requires_action", "requires_source_action")
+
+# Retried tasks give up long before this, so payments still processing have been lost
+PROCESSING_TIMEOUT = timezone.timedelta(hours=1)
+# Stripe returns the response of the first request with an idempotency key for 24 hours
+IDEMPOTENCY_KEY_LIFETIME = timezone.timedelta(hours=24)
+STALE_PAYMENT_ERROR = "Betalingen ble ikke behandlet i tide, prøv igjen"
+
+
+def _get_api_key(payment: StripePayment) -> str:
+    if isinstance(payment, PaymentRelation):
+        return payment.payment.stripe_private_key
+    # Use Trikom key for additions to user saldo
+    return settings.STRIPE_PRIVATE_KEYS["trikom"]
+
+
+def _get_intent_details(payment: StripePayment):
+    if isinstance(payment, PaymentRelation):
+        amount = payment.payment_price.price
+        description = f"{payment.payment.description()} - {payment.user.email}"
+    else:
+        amount = payment.amount
+        description = f"Saldo deposit - {payment.user.email}"
+    # Price is multiplied with 100 because the amount is in øre
+    return amount * 100, description
+
+
+def fail(payment: StripePayment, error: str):
+    logger.error(f"Stripe payment for {payment} failed: {error}")
+    payment.status = status.FAILED
+    payment.processing_error = error[:512]
+    payment.payment_method_id = None
+    payment.save()
+
+
+def _apply_intent(payment: StripePayment, intent):
+    if (
+        intent.status in REQUIRES_ACTION_STATUSES
+        and intent.next_action.type == "use_stripe_sdk"
+    ):
+        # The payment needs more validation by Stripe or the bank
+        payment.status = status.PENDING
+        payment.payment_intent_secret = intent.client_secret
+    elif intent.status == "succeeded":
+        payment.status = status.SUCCEEDED
+    else:
+        fail(payment, f"Payment intent returned an invalid status: {intent.status}")
+        return
+
+    payment.payment_method_id = None
+    payment.save()
+
+
+def _handle_stripe_error(payment: StripePayment, err: stripe.error.StripeError):
+    if isinstance(err, RETRIABLE_ERRORS):
+        raise err
+    if isinstance(err, stripe.error.CardError):
+        error = err.json_body.get("error", {})
+        fail(payment, error.get("message") or str(err))
+    else:
+        fail(payment, str(err))
+
+
+def create_intent(payment: StripePayment):
+    """
+    Create and confirm the payment intent of a processing payment.
+    Errors which may be retried are raised, other errors fail the payment.
+    """
+    if payment.status != status.PROCESSING:
+        return
+
+    amount, description = _get_intent_details(payment)
+    try:
+        intent = stripe.PaymentIntent.create(
+            payment_method=payment.payment_method_id,
+            amount=amount,
+            currency="nok",
+            confirmation_method="manual",
+            confirm=True,
+            description=description,
+            api_key=_get_api_key(payment),
+            idempotency_key=f"{payment._meta.model_name}-{payment.pk}-create",
+        )
+    except stripe.error.StripeError as err:
+        _handle_stripe_error(payment, err)
+        return
+
+    payment.stripe_id = intent.id
+    _apply_intent(payment, intent)
+
+
+def confirm_intent(payment: StripePayment, payment_intent_id: str):
+    """
+    Confirm the payment intent of a payment the user has authenticated.
+    """
+    if payment.status != status.PROCESSING:
+        return
+
+    try:
+        # Confirming an intent twice does not charge twice, so no key is needed
+        intent = stripe.PaymentIntent.confirm(
+            payment_intent_id, api_key=_get_api_key(payment)
+        )
+    except stripe.error.StripeError as err:
+        _handle_stripe_error(payment, err)
+        return
+
+    _apply_intent(payment, intent)
+
+
+def _recover_stale_payment(payment: StripePayment):
+    """
+    Apply the payment intent of a payment whose task was lost. The payment is only
+    failed when Stripe has no succeeded intent or intent requiring action for it.
+    """
+    if payment.stripe_id:
+        try:
+            intent = stripe.PaymentIntent.retrieve(
+                payment.stripe_id, api_key=_get_api_key(payment)
+            )
+        except stripe.error.StripeError as err:
+            _handle_stripe_error(payment, err)
+            return
+        if intent.status == "requires_confirmation":
+            # The user authenticated the payment, but the confirmation was lost
+            confirm_intent(payment, intent.id)
+        elif intent.status == "succeeded" or intent.status in REQUIRES_ACTION_STATUSES:
+            _apply_intent(payment, intent)
+        else:
+            fail(payment, STALE_PAYMENT_ERROR)
+    elif payment.processing_started > timezone.now() - IDEMPOTENCY_KEY_LIFETIME:
+        # The intent may have been created without being saved. Creating it again
+        # with the same idempotency key returns that intent instead of charging twice.
+        create_intent(payment)
+    else:
+        fail(payment, STALE_PAYMENT_ERROR)
+
+
+def fail_stale_payments() -> int:
+    """
+    Recover payments which switched to processing longer than PROCESSING_TIMEOUT ago
+    from Stripe, and fail those without a usable payment intent.
+    Returns the number of failed payments.
+    """
+    processing_before = timezone.now() - PROCESSING_TIMEOUT
+    stale_querysets = (
+        PaymentRelation.objects.select_related("payment", "payment_price", "user"),
+        PaymentTransaction.objects.select_related("user"),
+    )
+    failed = 0
+    for queryset in stale_querysets:
+        stale_payments = queryset.filter(
+            status=status.PROCESSING, processing_started__lt=processing_before
+        )
+        for payment in stale_payments:
+            try:
+                _recover_stale_payment(payment)
+            except RETRIABLE_ERRORS as err:
+                # The payment is still processing, and is tried again on the next run
+                logger.warning(f"Could not recover stale payment {payment}: {err}")
+                continue
+            if payment.status == status.FAILED:
+                failed += 1
+    if failed:
+        logger.warning(f"Failed {failed} payments which were stuck in processing")
+    return failed
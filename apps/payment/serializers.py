@@ -1,7 +1,5 @@
 import logging
 
-import stripe
-from django.conf import settings
 from rest_framework import serializers
 from rest_framework.serializers import ValidationError
 
@@ -13,6 +11,12 @@ from apps.payment.models import (
     PaymentRelation,
     PaymentTransaction,
 )
+from apps.payment.tasks import (
+    confirm_payment_relation_intent,
+    confirm_payment_transaction_intent,
+    create_payment_relation_intent,
+    create_payment_transaction_intent,
+)
 
 from .transaction_constants import TransactionSource
 
@@ -110,7 +114,7 @@ class PaymentRelationCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """
-        Overwrite create to handle the stripe charge before the relation is created.
+        Overwrite create to check access, and to let a worker handle the Stripe charge.
         """
         request = self.context.get("request")
         user = request.user
@@ -123,66 +127,28 @@ class PaymentRelationCreateSerializer(serializers.ModelSerializer):
                 "Du har ikke tilgang til å betale for denne betalingen"
             )
 
-        """ Get stripe token and remove it from the data that from the create data """
-        payment_method_id = validated_data.pop("payment_method_id")
+        has_processing_payment = PaymentRelation.objects.filter(
+            payment=payment, user=user, status=status.PROCESSING
+        ).exists()
+        if has_processing_payment:
+            raise serializers.ValidationError(
+                "Du har allerede en betaling for denne betalingen som behandles"
+            )
 
         payment_relation: PaymentRelation = super().create(
-            {**validated_data, "status": status.PENDING}
+            {**validated_data, "status": status.PROCESSING}
         )
 
         logger.info(
             f"Set up Stripe for payment:{payment.id}, user:{request.user.id}, "
             f"price: {payment_price.price} kr"
         )
-        try:
-            """ Validate and make the Intent with the Stripe payment method """
-            intent = stripe.PaymentIntent.create(
-                payment_method=payment_method_id,
-                amount=payment_price.price
-                * 100,  # Price is multiplied with 100 because the amount is in øre
-                currency="nok",
-                confirmation_method="manual",
-                confirm=True,
-                description=f"{payment.description()} - {request.user.email}",
-                api_key=payment.stripe_private_key,
-            )
+        create_payment_relation_intent.delay(payment_relation.id)
 
-            # If the payment needs more validation by Stripe or the bank
-            if (
-                intent.status == "requires_source_action"
-                and intent.next_action.type == "use_stripe_sdk"
-            ):
-                payment_relation.status = status.PENDING
-                payment_relation.payment_intent_secret = intent.client_secret
-
-            elif intent.status == "succeeded":
-                payment_relation.status = status.SUCCEEDED
-
-            else:
-                logger.error(
-                    f"Payment intent returned an invalid status: {intent.status}"
-                )
-                raise ValidationError(
-                    "Det skjedde noe galt under behandlingen av betalingen "
-                )
-
-            payment_relation.stripe_id = intent.id
-            payment_relation.save()
-
-            return payment_relation
-
-        except stripe.error.CardError as err:
-            error = err.json_body.get("error", {})
-            logger.error(
-                f"Stripe charge for {request.user} failed with card_error: {error}"
-            )
-            raise serializers.ValidationError(error)
-
-        except stripe.error.StripeError as error:
-            logger.error(f"An error occurred during the Stripe charge: {error}")
-            raise serializers.ValidationError(error)
-
-        return None
+        # The intent is created by a worker, the client follows the status of the
+        # relation from here
+        payment_relation.refresh_from_db()
+        return payment_relation
 
     class Meta:
         model = PaymentRelation
@@ -194,10 +160,16 @@ class PaymentRelationCreateSerializer(serializers.ModelSerializer):
             "user",
             "status",
             "payment_intent_secret",
+            "processing_error",
             "is_refundable",
             "is_refundable_reason",
         )
-        read_only_fields = ("id", "payment_intent_secret", "status")
+        read_only_fields = (
+            "id",
+            "payment_intent_secret",
+            "status",
+            "processing_error",
+        )
 
 
 class PaymentRelationUpdateSerializer(serializers.ModelSerializer):
@@ -214,42 +186,13 @@ class PaymentRelationUpdateSerializer(serializers.ModelSerializer):
         # Remove data, as we only want to use it to potentially write data derived from it
         payment_intent_id = validated_data.pop("payment_intent_id")
 
-        try:
-            stripe.api_key = instance.payment.stripe_private_key
-            intent = stripe.PaymentIntent.confirm(payment_intent_id)
-
-            # If the status is still not confirmed we update the transaction with a new secret key to handle.
-            if (
-                intent.status == "requires_source_action"
-                and intent.next_action.type == "use_stripe_sdk"
-            ):
-                return super().update(
-                    instance,
-                    {**validated_data, "payment_intent_secret": intent.client_secret},
-                )
-            # If the payment is successfully confirmed we update the status of the transaction to SUCCEEDED.
-            elif intent.status == "succeeded":
-                return super().update(
-                    instance, {**validated_data, "status": status.SUCCEEDED}
-                )
-
-            else:
-                logger.error(
-                    f"Payment intent returned an invalid status: {intent.status}"
-                )
-                raise ValidationError(
-                    "Det skjedde noe galt under behandlingen av betalingsbekreftelsen "
-                )
-
-        except stripe.error.CardError as error:
-            logger.error(
-                f"An error occurred during confirmation of "
-                f"PyamentRelation: {instance.id} by user: {instance.user}",
-                error,
-            )
-            raise ValidationError(
-                "Det skjedde en feil under bekreftelsen av betalingen."
-            )
+        instance = super().update(
+            instance, {**validated_data, "status": status.PROCESSING}
+        )
+        confirm_payment_relation_intent.delay(instance.id, payment_intent_id)
+
+        instance.refresh_from_db()
+        return instance
 
     class Meta:
         model = PaymentRelation
@@ -315,65 +258,18 @@ class PaymentTransactionCreateSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
 
         amount = validated_data.get("amount")
-        payment_method_id = validated_data.pop("payment_method_id")
 
         logger.info(f"User: {request.user} attempting to add {amount} to saldo")
 
         transaction: PaymentTransaction = super().create(
-            {**validated_data, "status": status.PENDING}
+            {**validated_data, "status": status.PROCESSING}
         )
+        create_payment_transaction_intent.delay(transaction.id)
 
-        try:
-            """ Use Trikom key for additions to user saldo """
-            stripe_private_key = settings.STRIPE_PRIVATE_KEYS["trikom"]
-
-            intent = stripe.PaymentIntent.create(
-                payment_method=payment_method_id,
-                amount=amount
-                * 100,  # Price is multiplied with 100 because the amount is in øre
-                currency="nok",
-                confirmation_method="manual",
-                confirm=True,
-                description=f"Saldo deposit - {request.user.email}",
-                api_key=stripe_private_key,
-            )
-
-            # If the payment needs more validation by Stripe or the bank
-            if (
-                intent.status == "requires_source_action"
-                and intent.next_action.type == "use_stripe_sdk"
-            ):
-                transaction.status = status.PENDING
-                transaction.payment_intent_secret = intent.client_secret
-
-            elif intent.status == "succeeded":
-                transaction.status = status.SUCCEEDED
-
-            else:
-                logger.error(
-                    f"Payment intent returned an invalid status: {intent.status}"
-                )
-                raise ValidationError(
-                    "Det skjedde noe galt under behandlingen av betalingen "
-                )
-
-            transaction.stripe_id = intent.id
-            transaction.save()
-
-            return transaction
-
-        except stripe.error.CardError as err:
-            error = err.json_body.get("error", {})
-            logger.error(
-                f"Stripe charge for {request.user} failed with card_error: {error}"
-            )
-            raise ValidationError(error)
-
-        except stripe.error.StripeError as error:
-            logger.error(f"An error occurred during the Stripe charge: {error}")
-            raise ValidationError(error)
-
-        return None
+        # The intent is created by a worker, the client follows the status of the
+        # transaction from here
+        transaction.refresh_from_db()
+        return transaction
 
     class Meta:
         model = PaymentTransaction
@@ -385,10 +281,17 @@ class PaymentTransactionCreateSerializer(serializers.ModelSerializer):
             "used_stripe",
             "user",
             "status",
+            "processing_error",
             "datetime",
             "source",
         )
-        read_only_fields = ("id", "payment_intent_secret", "status", "datetime")
+        read_only_fields = (
+            "id",
+            "payment_intent_secret",
+            "status",
+            "processing_error",
+            "datetime",
+        )
 
 
 class PaymentTransactionUpdateSerializer(serializers.ModelSerializer):
@@ -405,44 +308,13 @@ class PaymentTransactionUpdateSerializer(serializers.ModelSerializer):
         # Remove data, as we only want to use it to potentially write data derived from it
         payment_intent_id = validated_data.pop("payment_intent_id")
 
-        try:
-            """ Use Trikom key for additions to user saldo """
-            stripe.api_key = settings.STRIPE_PRIVATE_KEYS["trikom"]
-
-            intent = stripe.PaymentIntent.confirm(payment_intent_id)
-
-            # If the status is still not confirmed we update the transaction with a new secret key to handle.
-            if (
-                intent.status == "requires_source_action"
-                and intent.next_action.type == "use_stripe_sdk"
-            ):
-                return super().update(
-                    instance,
-                    {**validated_data, "payment_intent_secret": intent.client_secret},
-                )
-            # If the payment is successfully confirmed we update the status of the transaction to SUCCEEDED.
-            elif intent.status == "succeeded":
-                return super().update(
-                    instance, {**validated_data, "status": status.SUCCEEDED}
-                )
-
-            else:
-                logger.error(
-                    f"Payment intent returned an invalid status: {intent.status}"
-                )
-                raise ValidationError(
-                    "Det skjedde noe galt under behandlingen av betalingsbekreftelsen "
-                )
-
-        except stripe.error.CardError as error:
-            logger.error(
-                f"An error occurred during confirmation of "
-                f"PaymentTransaction: {instance.id} by user: {instance.user}",
-                error,
-            )
-            raise ValidationError(
-                "Det skjedde en feil under bekreftelsen av betalingen."
-            )
+        instance = super().update(
+            instance, {**validated_data, "status": status.PROCESSING}
+        )
+        confirm_payment_transaction_intent.delay(instance.id, payment_intent_id)
+
+        instance.refresh_from_db()
+        return instance
 
     class Meta:
         model = PaymentTransaction
@@ -465,3 +337,15 @@ class PaymentTransactionUpdateSerializer(serializers.ModelSerializer):
             "datetime",
             "source",
         )
+
+
+class PaymentStatusSerializer(serializers.Serializer):
+    """
+    The processing state of a payment relation or transaction, polled by clients
+    while it is processed.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    payment_intent_secret = serializers.CharField(read_only=True)
+    processing_error = serializers.CharField(read_only=True)
@@ -1,12 +1,27 @@
 from typing import Union
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
-from django.db.models.signals import post_save, pre_save
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.authentication.user_cache import invalidate_user_facts
 
 from . import status
-from .models import PaymentReceipt, PaymentRelation, PaymentTransaction
+from .models import PaymentReceipt, PaymentRelation, PaymentTransaction, WalletBalance
+
+
+@receiver(signal=pre_save, sender=PaymentRelation)
+@receiver(signal=pre_save, sender=PaymentTransaction)
+def set_processing_started(
+    sender, instance: Union[PaymentRelation, PaymentTransaction], **kwargs
+):
+    # Every switch to PROCESSING starts the timeout of fail_stale_payments anew
+    if instance.status != status.PROCESSING:
+        instance.processing_started = None
+    elif instance.processing_started is None:
+        instance.processing_started = timezone.now()
 
 
 @receiver(signal=pre_save, sender=PaymentRelation)
@@ -54,3 +69,19 @@ def send_receipt_after_payment(
     if should_send_receipt:
         receipt = PaymentReceipt(object_id=instance.id, content_type=content_type)
         receipt.save()
+
+
+@receiver(signal=post_save, sender=PaymentTransaction)
+@receiver(signal=post_delete, sender=PaymentTransaction)
+def invalidate_cached_saldo(sender, instance: PaymentTransaction, **kwargs):
+    invalidate_user_facts(instance.user_id)
+
+
+@receiver(signal=post_delete, sender=PaymentTransaction)
+def remove_deleted_transaction_from_wallet_balance(
+    sender, instance: PaymentTransaction, **kwargs
+):
+    # The balance is not created again if it was deleted along with the user
+    WalletBalance.objects.filter(pk=instance.user_id).update(
+        balance=F("balance") - instance.coins
+    )
@@ -3,6 +3,11 @@ Handling orders from Stripe results in needed to keep track of the status of the
 The status of a payment follows the following lifecycle.
 """
 
+"""
+When a payment has been requested, and is waiting for a worker to create or confirm the
+Stripe intent.
+"""
+PROCESSING = "processing"
 """
 When a payment has been intended, but not yet completed.
 In some cases this case can be skipped. Stripe charges/intents can be successful on first try.
@@ -24,7 +29,12 @@ Changes made when completing the charge (when going from SUCCEEDED to DONE) shou
 REFUNDED = "refunded"
 """ When the payment is no longer relevant, and all side effects have been removed """
 REMOVED = "removed"
+"""
+When Stripe declined the payment, or it could not be processed.
+The reason is kept with the payment.
+"""
+FAILED = "failed"
 
-PAYMENT_STATUSES = [PENDING, SUCCEEDED, DONE, REFUNDED, REMOVED]
+PAYMENT_STATUSES = [PROCESSING, PENDING, SUCCEEDED, DONE, REFUNDED, REMOVED, FAILED]
 
 PAYMENT_STATUS_CHOICES = [(status, status) for status in PAYMENT_STATUSES]
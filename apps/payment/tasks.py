@@ -0,0 +1,59 @@
+import logging
+
+from apps.payment import processing
+from apps.payment.models import PaymentRelation, PaymentTransaction
+from onlineweb4.celery import app
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 5
+
+
+def _process(task, payment, process, *args):
+    try:
+        process(payment, *args)
+    except processing.RETRIABLE_ERRORS as err:
+        if task.request.retries >= task.max_retries:
+            processing.fail(payment, "Kunne ikke kontakte Stripe, prøv igjen senere")
+            return
+        logger.warning(f"Retrying Stripe request for {payment}: {err}")
+        raise task.retry(exc=err, countdown=2 ** task.request.retries)
+
+
+def _get_relation(relation_id: int) -> PaymentRelation:
+    return PaymentRelation.objects.select_related(
+        "payment", "payment_price", "user"
+    ).get(pk=relation_id)
+
+
+def _get_transaction(transaction_id: int) -> PaymentTransaction:
+    return PaymentTransaction.objects.select_related("user").get(pk=transaction_id)
+
+
+@app.task(bind=True, ignore_result=True, max_retries=MAX_RETRIES)
+def create_payment_relation_intent(self, relation_id: int):
+    _process(self, _get_relation(relation_id), processing.create_intent)
+
+
+@app.task(bind=True, ignore_result=True, max_retries=MAX_RETRIES)
+def confirm_payment_relation_intent(self, relation_id: int, payment_intent_id: str):
+    _process(
+        self, _get_relation(relation_id), processing.confirm_intent, payment_intent_id
+    )
+
+
+@app.task(bind=True, ignore_result=True, max_retries=MAX_RETRIES)
+def create_payment_transaction_intent(self, transaction_id: int):
+    _process(self, _get_transaction(transaction_id), processing.create_intent)
+
+
+@app.task(bind=True, ignore_result=True, max_retries=MAX_RETRIES)
+def confirm_payment_transaction_intent(
+    self, transaction_id: int, payment_intent_id: str
+):
+    _process(
+        self,
+        _get_transaction(transaction_id),
+        processing.confirm_intent,
+        payment_intent_id,
+    )
@@ -210,9 +210,11 @@ class PaymentRelationTestCase(OIDCTestCase):
             **self.headers,
         )
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json().get("status"), payment_status.FAILED)
         self.assertIn(
-            f"No such PaymentMethod: '{fake_payment_method_id}'", response.json()[0]
+            f"No such PaymentMethod: '{fake_payment_method_id}'",
+            response.json().get("processing_error"),
         )
 
     def test_user_cannot_pay_for_event_with_wrong_payment_price(self):
@@ -658,9 +660,11 @@ class PaymentTransactionTestCase(OIDCTestCase):
             **self.headers,
         )
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json().get("status"), payment_status.FAILED)
         self.assertIn(
-            f"No such PaymentMethod: '{fake_payment_method_id}'", response.json()[0]
+            f"No such PaymentMethod: '{fake_payment_method_id}'",
+            response.json().get("processing_error"),
         )
 
     def test_user_cannot_delete_transactions(self):
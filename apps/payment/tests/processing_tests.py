@@ -0,0 +1,233 @@
+from unittest import mock
+
+import stripe
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django_dynamic_fixture import G
+from rest_framework import status
+
+from apps.authentication.models import OnlineUser as User
+from apps.events.tests.utils import generate_user
+from apps.online_oidc_provider.test import OIDCTestCase
+from apps.payment import processing
+from apps.payment import status as payment_status
+from apps.payment.fake_stripe import (
+    AUTHENTICATION_REQUIRED_PAYMENT_METHOD,
+    DECLINED_PAYMENT_METHOD,
+    SUCCEEDING_PAYMENT_METHOD,
+    FakeStripe,
+    FakeStripeServer,
+)
+from apps.payment.models import PaymentTransaction
+from apps.payment.transaction_constants import TransactionSource
+
+
+class FakeStripeMixin:
+    def setUp(self):
+        super().setUp()
+        self.fake_stripe = FakeStripe()
+        self.server = FakeStripeServer(self.fake_stripe).__enter__()
+        self.addCleanup(self.server.__exit__)
+        api_base_patcher = mock.patch("stripe.api_base", self.server.api_base)
+        api_base_patcher.start()
+        self.addCleanup(api_base_patcher.stop)
+
+
+class PaymentProcessingTestCase(FakeStripeMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = G(User)
+
+    def _create_transaction(self, payment_method_id):
+        return PaymentTransaction.objects.create(
+            user=self.user,
+            amount=100,
+            source=TransactionSource.STRIPE,
+            status=payment_status.PROCESSING,
+            payment_method_id=payment_method_id,
+        )
+
+    def test_successful_intent_completes_the_transaction(self):
+        transaction = self._create_transaction(SUCCEEDING_PAYMENT_METHOD)
+
+        processing.create_intent(transaction)
+        transaction.refresh_from_db()
+
+        self.assertEqual(transaction.status, payment_status.DONE)
+        self.assertIsNone(transaction.payment_method_id)
+        self.assertEqual(self.user.saldo, 100)
+
+    def test_declined_card_fails_the_transaction(self):
+        transaction = self._create_transaction(DECLINED_PAYMENT_METHOD)
+
+        processing.create_intent(transaction)
+        transaction.refresh_from_db()
+
+        self.assertEqual(transaction.status, payment_status.FAILED)
+        self.assertEqual(transaction.processing_error, "Your card was declined.")
+        self.assertEqual(self.user.saldo, 0)
+
+    def test_retried_intent_creation_does_not_charge_twice(self):
+        transaction = self._create_transaction(SUCCEEDING_PAYMENT_METHOD)
+
+        processing.create_intent(transaction)
+        transaction.status = payment_status.PROCESSING
+        processing.create_intent(transaction)
+
+        self.assertEqual(len(self.fake_stripe.intents), 1)
+
+    def test_connection_errors_are_raised_to_be_retried(self):
+        transaction = self._create_transaction(SUCCEEDING_PAYMENT_METHOD)
+        self.server.__exit__()
+
+        with self.assertRaises(stripe.error.APIConnectionError):
+            processing.create_intent(transaction)
+        transaction.refresh_from_db()
+
+        self.assertEqual(transaction.status, payment_status.PROCESSING)
+
+    def _make_stale(self, transaction, age=processing.PROCESSING_TIMEOUT * 2):
+        PaymentTransaction.objects.filter(pk=transaction.pk).update(
+            processing_started=timezone.now() - age
+        )
+
+    def test_stale_processing_payments_are_failed(self):
+        stale = self._create_transaction(SUCCEEDING_PAYMENT_METHOD)
+        fresh = self._create_transaction(SUCCEEDING_PAYMENT_METHOD)
+        # Too old to create the intent again without risking a second charge
+        self._make_stale(stale, age=processing.IDEMPOTENCY_KEY_LIFETIME * 2)
+
+        self.assertEqual(processing.fail_stale_payments(), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+
+        self.assertEqual(stale.status, payment_status.FAILED)
+        self.assertEqual(stale.processing_error, processing.STALE_PAYMENT_ERROR)
+        self.assertIsNone(stale.payment_method_id)
+        self.assertEqual(fresh.status, payment_status.PROCESSING)
+
+    def test_stale_payment_with_an_unsaved_intent_is_completed(self):
+        transaction = self._create_transaction(SUCCEEDING_PAYMENT_METHOD)
+        # The worker dies after Stripe charged the card, before the payment is saved
+        with mock.patch("apps.payment.processing._apply_intent"):
+            processing.create_intent(transaction)
+        self._make_stale(transaction)
+
+        self.assertEqual(processing.fail_stale_payments(), 0)
+        transaction.refresh_from_db()
+
+        self.assertEqual(transaction.status, payment_status.DONE)
+        self.assertEqual(len(self.fake_stripe.intents), 1)
+        self.assertEqual(self.user.saldo, 100)
+
+    def test_stale_payment_with_a_lost_confirmation_is_confirmed(self):
+        transaction = self._create_transaction(AUTHENTICATION_REQUIRED_PAYMENT_METHOD)
+        processing.create_intent(transaction)
+        intent = self.fake_stripe.intents[transaction.stripe_id]
+        # The user authenticated the payment, but the confirm task was lost
+        intent.update(status="requires_confirmation", next_action=None)
+        transaction.status = payment_status.PROCESSING
+        transaction.save()
+        self._make_stale(transaction)
+
+        self.assertEqual(processing.fail_stale_payments(), 0)
+        transaction.refresh_from_db()
+
+        self.assertEqual(transaction.status, payment_status.DONE)
+        self.assertEqual(self.user.saldo, 100)
+
+    def test_stale_payment_with_a_canceled_intent_is_failed(self):
+        transaction = self._create_transaction(AUTHENTICATION_REQUIRED_PAYMENT_METHOD)
+        processing.create_intent(transaction)
+        self.fake_stripe.intents[transaction.stripe_id].update(
+            status="canceled", next_action=None
+        )
+        transaction.status = payment_status.PROCESSING
+        transaction.save()
+        self._make_stale(transaction)
+
+        self.assertEqual(processing.fail_stale_payments(), 1)
+        transaction.refresh_from_db()
+
+        self.assertEqual(transaction.status, payment_status.FAILED)
+        self.assertEqual(transaction.processing_error, processing.STALE_PAYMENT_ERROR)
+
+    def test_confirming_an_old_pending_payment_restarts_the_timeout(self):
+        transaction = self._create_transaction(AUTHENTICATION_REQUIRED_PAYMENT_METHOD)
+        processing.create_intent(transaction)
+        PaymentTransaction.objects.filter(pk=transaction.pk).update(
+            datetime=timezone.now() - processing.PROCESSING_TIMEOUT * 2
+        )
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.status, payment_status.PENDING)
+        self.assertIsNone(transaction.processing_started)
+
+        transaction.status = payment_status.PROCESSING
+        transaction.save()
+
+        self.assertEqual(processing.fail_stale_payments(), 0)
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.status, payment_status.PROCESSING)
+
+
+class PaymentTransactionProcessingTestCase(FakeStripeMixin, OIDCTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = generate_user(username="test_user")
+        self.token = self.generate_access_token(self.user)
+        self.headers = {**self.generate_headers(), **self.bare_headers}
+
+        self.url = reverse("payment_transactions-list")
+        self.id_url = lambda _id: self.url + str(_id) + "/"
+        self.status_url = lambda _id: self.id_url(_id) + "status/"
+
+    def _deposit(self, payment_method_id):
+        return self.client.post(
+            self.url,
+            {"amount": 100, "payment_method_id": payment_method_id},
+            **self.headers,
+        )
+
+    def test_deposit_is_processed(self):
+        response = self._deposit(SUCCEEDING_PAYMENT_METHOD)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json().get("status"), payment_status.DONE)
+        self.assertEqual(self.user.saldo, 100)
+
+    def test_deposit_requiring_authentication_can_be_confirmed(self):
+        response = self._deposit(AUTHENTICATION_REQUIRED_PAYMENT_METHOD)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json().get("status"), payment_status.PENDING)
+        self.assertIsNotNone(response.json().get("payment_intent_secret"))
+        self.assertEqual(self.user.saldo, 0)
+
+        intent_id = next(iter(self.fake_stripe.intents))
+        confirm_response = self.client.patch(
+            self.id_url(response.json().get("id")),
+            {"payment_intent_id": intent_id},
+            **self.headers,
+        )
+
+        self.assertEqual(confirm_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(confirm_response.json().get("status"), payment_status.DONE)
+        self.assertEqual(self.user.saldo, 100)
+
+    def test_status_of_a_failed_deposit(self):
+        transaction_id = self._deposit(DECLINED_PAYMENT_METHOD).json().get("id")
+
+        response = self.client.get(self.status_url(transaction_id), **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "id": transaction_id,
+                "status": payment_status.FAILED,
+                "payment_intent_secret": None,
+                "processing_error": "Your card was declined.",
+            },
+        )
+        self.assertEqual(self.user.saldo, 0)
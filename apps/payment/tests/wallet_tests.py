@@ -0,0 +1,133 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_dynamic_fixture import G
+
+from apps.authentication.models import OnlineUser as User
+from apps.payment import status
+from apps.payment.models import PaymentTransaction, WalletBalance
+from apps.payment.mommy import ReconcileWalletBalances
+from apps.payment.transaction_constants import TransactionSource
+
+
+class WalletBalanceTestCase(TestCase):
+    def setUp(self):
+        self.user = G(User)
+
+    def _create_transaction(self, amount, transaction_status=status.SUCCEEDED):
+        return PaymentTransaction.objects.create(
+            user=self.user,
+            amount=amount,
+            source=TransactionSource.CASH,
+            status=transaction_status,
+            create_receipt=False,
+        )
+
+    def test_balance_follows_completed_transactions(self):
+        self._create_transaction(100)
+        pending = self._create_transaction(50, status.PENDING)
+
+        self.assertEqual(self.user.saldo, 100)
+
+        pending.status = status.SUCCEEDED
+        pending.save()
+
+        self.assertEqual(self.user.saldo, 150)
+
+        pending.status = status.REFUNDED
+        pending.save()
+
+        self.assertEqual(self.user.saldo, 100)
+
+    def test_changing_amount_and_user_moves_coins(self):
+        other_user = G(User)
+        transaction = self._create_transaction(100)
+
+        transaction.amount = 80
+        transaction.save()
+        self.assertEqual(self.user.saldo, 80)
+
+        transaction.user = other_user
+        transaction.save()
+        self.assertEqual(self.user.saldo, 0)
+        self.assertEqual(other_user.saldo, 80)
+
+    def test_deleted_transactions_are_removed_from_balance(self):
+        self._create_transaction(100)
+        self._create_transaction(-30).delete()
+
+        self.assertEqual(self.user.saldo, 100)
+
+    def test_saldo_is_a_single_query(self):
+        self._create_transaction(100)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.user.saldo, 100)
+
+    def test_users_without_transactions_have_no_saldo(self):
+        self.assertEqual(self.user.saldo, 0)
+
+    def _create_transactions_at_different_times(self, *amounts):
+        for days, amount in enumerate(amounts):
+            transaction = self._create_transaction(amount)
+            PaymentTransaction.objects.filter(pk=transaction.pk).update(
+                datetime=timezone.now() - timezone.timedelta(days=days)
+            )
+
+    def test_coins_are_aggregated_over_all_transactions_of_a_user(self):
+        self._create_transactions_at_different_times(100, 50, -20)
+
+        self.assertEqual(
+            PaymentTransaction.objects.aggregate_coins_by_user(), {self.user.id: 130}
+        )
+
+    def test_reconcile_keeps_balances_of_users_with_several_transactions(self):
+        self._create_transactions_at_different_times(100, 50, -20)
+
+        self.assertEqual(WalletBalance.objects.reconcile(), [])
+        self.assertEqual(self.user.saldo, 130)
+
+    def test_migration_backfills_users_with_several_transactions(self):
+        self._create_transactions_at_different_times(100, 50, -20)
+        WalletBalance.objects.all().delete()
+        migration = import_module("apps.payment.migrations.0037_walletbalance")
+
+        migration.backfill_wallet_balances(apps, None)
+
+        self.assertEqual(self.user.saldo, 130)
+
+    def test_reconcile_corrects_balances_changed_without_save(self):
+        transaction = self._create_transaction(100)
+        PaymentTransaction.objects.filter(pk=transaction.pk).update(amount=40)
+        other_user = G(User)
+        WalletBalance.objects.create(user=other_user, balance=10)
+
+        corrected = WalletBalance.objects.reconcile()
+
+        self.assertEqual(set(corrected), {self.user.id, other_user.id})
+        self.assertEqual(self.user.saldo, 40)
+        self.assertEqual(other_user.saldo, 0)
+
+    @override_settings(OW4_USER_FACT_CACHE_TIMEOUT=60)
+    def test_reconcile_invalidates_cached_saldo(self):
+        self.addCleanup(cache.clear)
+        transaction = self._create_transaction(100)
+        self.assertEqual(self.user.saldo, 100)
+        PaymentTransaction.objects.filter(pk=transaction.pk).update(amount=40)
+
+        WalletBalance.objects.reconcile()
+
+        self.assertEqual(self.user.saldo, 40)
+
+    def test_reconcile_task(self):
+        transaction = self._create_transaction(100)
+        PaymentTransaction.objects.filter(pk=transaction.pk).update(amount=40)
+
+        ReconcileWalletBalances.run()
+
+        self.assertEqual(
+            PaymentTransaction.objects.aggregate_coins(self.user), self.user.saldo
+        )
@@ -5,6 +5,7 @@ import logging
 import stripe
 from django.utils.translation import gettext as _
 from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from stripe.error import InvalidRequestError, StripeError
 
@@ -22,6 +23,7 @@ from apps.payment.serializers import (
     PaymentRelationCreateSerializer,
     PaymentRelationReadOnlySerializer,
     PaymentRelationUpdateSerializer,
+    PaymentStatusSerializer,
     PaymentTransactionCreateSerializer,
     PaymentTransactionReadOnlySerializer,
     PaymentTransactionUpdateSerializer,
@@ -49,12 +51,22 @@ class PaymentRelationViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
         "read": PaymentRelationReadOnlySerializer,
         "create": PaymentRelationCreateSerializer,
         "update": PaymentRelationUpdateSerializer,
+        "processing_status": PaymentStatusSerializer,
     }
 
     def get_queryset(self):
         user = self.request.user
         return PaymentRelation.objects.filter(user=user)
 
+    @action(detail=True, methods=["get"], url_path="status")
+    def processing_status(self, request, pk=None):
+        """
+        Lightweight status of a payment relation, for clients waiting for it to be
+        processed.
+        """
+        serializer = self.get_serializer(self.get_object())
+        return Response(serializer.data)
+
     def destroy(self, request, *args, **kwargs):
         """
         Destroy logic is set in the view because serializers cannot delete.
@@ -68,6 +80,15 @@ class PaymentRelationViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if payment_relation.status in [
+            payment_status.PROCESSING,
+            payment_status.FAILED,
+        ]:
+            return Response(
+                {"message": _("Denne betalingen har ikke blitt gjennomført.")},
+                status.HTTP_400_BAD_REQUEST,
+            )
+
         try:
             """ Handle the actual refund with the stripe API """
             stripe.api_key = payment_relation.payment.stripe_private_key
@@ -127,12 +148,21 @@ class PaymentTransactionViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
         "read": PaymentTransactionReadOnlySerializer,
         "create": PaymentTransactionCreateSerializer,
         "update": PaymentTransactionUpdateSerializer,
+        "processing_status": PaymentStatusSerializer,
     }
 
     def get_queryset(self):
         user = self.request.user
         return PaymentTransaction.objects.filter(user=user)
 
+    @action(detail=True, methods=["get"], url_path="status")
+    def processing_status(self, request, pk=None):
+        """
+        Lightweight status of a transaction, for clients waiting for it to be processed.
+        """
+        serializer = self.get_serializer(self.get_object())
+        return Response(serializer.data)
+
     def destroy(self, request, *args, **kwargs):
         return Response(
             {"message": "Du kan ikke slette eksisterende transaksjoner"},
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
+from typing import List
+
 from django.db import models, transaction
+from django.db.models import F
 from django.template.defaultfilters import slugify
 from django.utils import timezone
 from taggit.managers import TaggableManager
@@ -74,11 +77,48 @@ class Album(models.Model):
         return self.photos.first()
 
     def increment_photo_counter(self) -> int:
+        return self.reserve_photo_ids(1)[0]
+
+    def reserve_photo_ids(self, count: int) -> range:
+        """
+        Reserve a range of relative ids for new photos with one update of the counter.
+        """
         with transaction.atomic():
-            self.refresh_from_db()
-            self.photo_counter += 1
-            self.save()
-            return self.photo_counter
+            Album.objects.filter(pk=self.pk).update(
+                photo_counter=F("photo_counter") + count
+            )
+            self.photo_counter = (
+                Album.objects.filter(pk=self.pk)
+                .values_list("photo_counter", flat=True)
+                .get()
+            )
+        return range(self.photo_counter - count + 1, self.photo_counter + 1)
+
+    def add_photos(
+        self, raw_images: List[UnhandledImage], **photo_fields
+    ) -> List["Photo"]:
+        """
+        Create photos for many uploaded images at once.
+        The photos are created in bulk, which skips the Photo save signals, so
+        responsive images have to be generated with
+        'apps.photoalbum.tasks.schedule_responsive_photos'.
+        """
+        relative_ids = self.reserve_photo_ids(len(raw_images))
+        photos = []
+        for relative_id, raw_image in zip(relative_ids, raw_images):
+            photo = Photo(
+                album=self, relative_id=relative_id, raw_image=raw_image, **photo_fields
+            )
+            photo.attach_missing_attributes()
+            photos.append(photo)
+
+        Photo.objects.bulk_create(photos)
+        # Not every database returns primary keys from bulk inserts
+        return list(
+            Photo.objects.filter(album=self, relative_id__in=relative_ids).order_by(
+                "relative_id"
+            )
+        )
 
     def get_next_photo(self, photo: "Photo") -> "Photo":
         ordered_photos = self.photos.order_by("created_date")
@@ -148,6 +188,22 @@ class Photo(models.Model):
         blank=True,
     )
 
+    def attach_missing_attributes(self):
+        if not self.relative_id:
+            self.relative_id = self.album.increment_photo_counter()
+
+        if not self.title:
+            self.title = f"{self.album.title} #{self.relative_id}"
+
+        if not self.description:
+            self.description = f"Bilde i fotoalbum, {self}"
+
+        if (
+            self.photographer
+            and self.photographer_name != self.photographer.get_full_name()
+        ):
+            self.photographer_name = self.photographer.get_full_name()
+
     def __str__(self):
         return self.title
 
@@ -0,0 +1,13 @@
+from rest_framework import permissions
+
+
+class UploadPhotosPermission(permissions.IsAuthenticated):
+    """
+    Uploading photos to an album requires permission to create photos, not to change the
+    album.
+    """
+
+    def has_permission(self, request, view):
+        return super().has_permission(request, view) and request.user.has_perm(
+            "photoalbum.add_photo"
+        )
@@ -153,6 +153,24 @@ class AlbumCreateOrUpdateSerializer(serializers.ModelSerializer):
         )
 
 
+class PhotoBatchUploadSerializer(serializers.Serializer):
+    raw_images = serializers.ListField(child=ImageField(), allow_empty=False)
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+    photographer = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), required=False, allow_null=True, default=None
+    )
+    photographer_name = serializers.CharField(
+        required=False, allow_blank=True, default=""
+    )
+
+
+class AlbumUploadProgressSerializer(serializers.Serializer):
+    total = serializers.IntegerField(read_only=True)
+    processed = serializers.IntegerField(read_only=True)
+    failed = serializers.IntegerField(read_only=True)
+    pending = serializers.IntegerField(read_only=True)
+
+
 class UserTagListSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserTag
@@ -12,20 +12,7 @@ logger = logging.getLogger(__name__)
 
 @receiver(pre_save, sender=Photo)
 def attach_missing_photo_attributes(sender, instance: Photo, **kwargs):
-    if not instance.relative_id:
-        instance.relative_id = instance.album.increment_photo_counter()
-
-    if not instance.title:
-        instance.title = f"{instance.album.title} #{instance.relative_id}"
-
-    if not instance.description:
-        instance.description = f"Bilde i fotoalbum, {instance}"
-
-    if (
-        instance.photographer
-        and instance.photographer_name != instance.photographer.get_full_name()
-    ):
-        instance.photographer_name = instance.photographer.get_full_name()
+    instance.attach_missing_attributes()
 
 
 @receiver(post_save, sender=Photo)
@@ -1,18 +1,21 @@
 import logging
+from typing import List
 
+from celery import group
 from PIL import Image
 
 from apps.gallery.util import ResponsiveImageHandler
 from onlineweb4.celery import app
 
-from .models import Photo
+from .models import Album, Photo
+from .utils import record_photo_processed, start_upload_progress
 
 logger = logging.getLogger(__name__)
 
+PHOTO_PROCESSING_CHUNK_SIZE = 10
 
-@app.task(bind=True)
-def create_responsive_photo_task(self, photo_id: int):
-    photo = Photo.objects.get(pk=photo_id)
+
+def create_responsive_photo(photo: Photo) -> bool:
     raw_image = photo.raw_image
 
     pillow_image = Image.open(raw_image.image.path)
@@ -49,3 +52,47 @@ def create_responsive_photo_task(self, photo_id: int):
         photo.refresh_from_db()
         photo.image = status.data
         photo.save()
+        return True
+
+    return False
+
+
+@app.task(bind=True)
+def create_responsive_photo_task(self, photo_id: int):
+    photo = Photo.objects.get(pk=photo_id)
+    create_responsive_photo(photo)
+
+
+@app.task(bind=True)
+def create_responsive_photos_task(self, photo_ids: List[int]):
+    photos = Photo.objects.filter(pk__in=photo_ids, image__isnull=True)
+    for photo in photos.select_related("album", "raw_image"):
+        if not photo.raw_image:
+            logger.error(f"Photo {photo} has no uploaded image to process")
+            record_photo_processed(photo.album_id, success=False)
+            continue
+
+        try:
+            success = create_responsive_photo(photo)
+        except Exception:
+            # One broken upload should not stop the rest of the chunk
+            logger.exception(f"Could not create responsive image for photo {photo}")
+            success = False
+        record_photo_processed(photo.album_id, success=success)
+
+
+def schedule_responsive_photos(album: Album, photos: List[Photo]):
+    """
+    Generate responsive images for photos created in bulk, as a group of tasks handling
+    a chunk of photos each.
+    """
+    photo_ids = [photo.id for photo in photos]
+    start_upload_progress(album.id, len(photo_ids))
+
+    chunks = [
+        photo_ids[index : index + PHOTO_PROCESSING_CHUNK_SIZE]
+        for index in range(0, len(photo_ids), PHOTO_PROCESSING_CHUNK_SIZE)
+    ]
+    return group(
+        create_responsive_photos_task.s(chunk) for chunk in chunks
+    ).apply_async()
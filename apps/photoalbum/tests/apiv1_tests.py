@@ -1,20 +1,47 @@
 # -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django_dynamic_fixture import G
 from rest_framework import status
 
 from apps.authentication.models import OnlineUser as User
+from apps.gallery import settings as gallery_settings
 from apps.gallery.util import create_responsive_image_from_file
 from apps.online_oidc_provider.test import OIDCTestCase
 from apps.photoalbum.models import Album, Photo, UserTag
 
 SAMPLE_IMAGE_PATH = f"{settings.PROJECT_ROOT_DIRECTORY}/files/static/img/splash_bg.jpg"
 
+# Uploaded images are written here instead of the tracked uploaded_media directory
+TEST_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def setUpModule():
+    # The gallery expects the directories of unhandled and responsive images to exist
+    for path in (
+        gallery_settings.UNHANDLED_THUMBNAIL_PATH,
+        gallery_settings.RESPONSIVE_THUMBNAIL_PATH,
+        gallery_settings.RESPONSIVE_IMAGES_WIDE_PATH,
+        gallery_settings.RESPONSIVE_IMAGES_LG_PATH,
+        gallery_settings.RESPONSIVE_IMAGES_MD_PATH,
+        gallery_settings.RESPONSIVE_IMAGES_SM_PATH,
+        gallery_settings.RESPONSIVE_IMAGES_XS_PATH,
+    ):
+        os.makedirs(os.path.join(TEST_MEDIA_ROOT, path), exist_ok=True)
+
+
+def tearDownModule():
+    shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
 
 def add_content_type_permission_to_group(group: Group, model):
     content_type = ContentType.objects.get_for_model(model)
@@ -115,6 +142,7 @@ class AlbumTestCase(OIDCTestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
 
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
 class PhotoTestCase(OIDCTestCase):
     @classmethod
     def setUpClass(cls):
@@ -274,7 +302,49 @@ class PhotoTestCase(OIDCTestCase):
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
+    def test_regular_user_cannot_upload_photos_in_bulk(self):
+        response = self.client.post(
+            self.get_upload_url(self.album),
+            {"raw_images": [self.get_uploadable_static_file()]},
+            **self.form_data_headers,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_permitted_user_can_upload_photos_in_bulk(self):
+        self.photo_group.user_set.add(self.user)
+        response = self.client.post(
+            self.get_upload_url(self.album),
+            {
+                "raw_images": [
+                    self.get_uploadable_static_file(),
+                    self.get_uploadable_static_file(),
+                ]
+            },
+            **self.form_data_headers,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.json()), 2)
+
+        self.album.refresh_from_db()
+        photos = self.album.photos.exclude(pk=self.photo.pk).order_by("relative_id")
+        self.assertEqual(
+            [photo.relative_id for photo in photos],
+            [self.album.photo_counter - 1, self.album.photo_counter],
+        )
+        for photo in photos:
+            self.assertIsNotNone(photo.image)
+
+        progress_response = self.client.get(
+            reverse("albums-upload-progress", args=[self.album.pk]), **self.headers
+        )
+        self.assertEqual(progress_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(progress_response.json().get("processed"), 2)
+        self.assertEqual(progress_response.json().get("pending"), 0)
+
 
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
 class UserTagsTestCase(OIDCTestCase):
     @classmethod
     def setUpClass(cls):
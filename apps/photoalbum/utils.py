@@ -0,0 +1,44 @@
+from django.core.cache import cache
+
+UPLOAD_PROGRESS_CACHE_KEY = "photoalbum:upload_progress:{album_id}:{counter}"
+UPLOAD_PROGRESS_TIMEOUT = 60 * 60 * 24
+UPLOAD_PROGRESS_COUNTERS = ("total", "processed", "failed")
+
+
+def _progress_key(album_id: int, counter: str) -> str:
+    return UPLOAD_PROGRESS_CACHE_KEY.format(album_id=album_id, counter=counter)
+
+
+def _increment(album_id: int, counter: str, delta: int = 1):
+    key = _progress_key(album_id, counter)
+    cache.add(key, 0, UPLOAD_PROGRESS_TIMEOUT)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # The counter expired between add and incr
+        cache.set(key, delta, UPLOAD_PROGRESS_TIMEOUT)
+
+
+def start_upload_progress(album_id: int, count: int):
+    _increment(album_id, "total", count)
+
+
+def record_photo_processed(album_id: int, success: bool):
+    _increment(album_id, "processed" if success else "failed")
+
+
+def get_upload_progress(album_id: int) -> dict:
+    """
+    Progress of the responsive image processing for photos uploaded in bulk to an album.
+    """
+    values = cache.get_many(
+        [_progress_key(album_id, counter) for counter in UPLOAD_PROGRESS_COUNTERS]
+    )
+    progress = {
+        counter: values.get(_progress_key(album_id, counter), 0)
+        for counter in UPLOAD_PROGRESS_COUNTERS
+    }
+    progress["pending"] = max(
+        progress["total"] - progress["processed"] - progress["failed"], 0
+    )
+    return progress
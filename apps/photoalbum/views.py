@@ -1,17 +1,23 @@
 # -*- coding: utf-8 -*-
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
-from rest_framework import mixins, permissions, viewsets
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from apps.authentication.models import OnlineUser as User
 from apps.common.rest_framework.mixins import MultiSerializerMixin
 
 from .filters import AlbumFilter, PhotoFilter, UserTagFilter
 from .models import Album, Photo, UserTag
+from .permissions import UploadPhotosPermission
 from .serializers import (
     AlbumCreateOrUpdateSerializer,
     AlbumListSerializer,
     AlbumRetrieveSerializer,
+    AlbumUploadProgressSerializer,
+    PhotoBatchUploadSerializer,
     PhotoCreateOrUpdateSerializer,
     PhotoListSerializer,
     PhotoRetrieveSerializer,
@@ -19,6 +25,8 @@ from .serializers import (
     UserTagListSerializer,
     UserTagRetrieveSerializer,
 )
+from .tasks import schedule_responsive_photos
+from .utils import get_upload_progress
 
 
 class AlbumViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
@@ -29,6 +37,8 @@ class AlbumViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
         "write": AlbumCreateOrUpdateSerializer,
         "retrieve": AlbumRetrieveSerializer,
         "list": AlbumListSerializer,
+        "upload": PhotoBatchUploadSerializer,
+        "upload_progress": AlbumUploadProgressSerializer,
     }
 
     def get_queryset(self):
@@ -45,6 +55,43 @@ class AlbumViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
 
         return queryset.filter(published_query)
 
+    @action(detail=True, methods=["POST"], permission_classes=(UploadPhotosPermission,))
+    def upload(self, request, pk=None):
+        """
+        Upload many photos to an album at once.
+        Responsive images are generated in the background, see 'upload-progress'.
+        """
+        album: Album = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        with transaction.atomic():
+            photos = album.add_photos(
+                data.get("raw_images"),
+                description=data.get("description"),
+                photographer=data.get("photographer"),
+                photographer_name=data.get("photographer_name"),
+            )
+        schedule_responsive_photos(album, photos)
+
+        photos = Photo.objects.filter(pk__in=[photo.id for photo in photos])
+        return Response(
+            data=PhotoListSerializer(photos, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(
+        detail=True,
+        methods=["GET"],
+        permission_classes=(UploadPhotosPermission,),
+        url_path="upload-progress",
+    )
+    def upload_progress(self, request, pk=None):
+        album: Album = self.get_object()
+        serializer = self.get_serializer(get_upload_progress(album.id))
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
 
 class PhotoViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
     permission_classes = (permissions.DjangoModelPermissionsOrAnonReadOnly,)
@@ -1,10 +1,13 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django_dynamic_fixture import G
 from rest_framework import status
 
 from apps.authentication.models import OnlineUser as User
+from apps.profiles import typeahead
 from apps.profiles.forms import ZIP_CODE_VALIDATION_ERROR, ProfileForm
+from apps.profiles.models import Privacy
 
 
 class ProfilesURLTestCase(TestCase):
@@ -68,3 +71,57 @@ class ProfileEditFormTestCase(TestCase):
         form = ProfileForm(data=data)
 
         self.assertFalse(form.is_valid())
+
+
+class TypeaheadTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.ola = G(User, first_name="Ola", last_name="Nordmann", ntnu_username="olan")
+        self.kari = G(
+            User,
+            first_name="Kari",
+            last_name="Nordmann",
+            username="kari",
+            nickname="Kaffekari",
+        )
+        self.hidden = G(User, first_name="Ola", last_name="Skjult")
+        G(Privacy, user=self.ola, visible_for_other_users=True)
+        G(Privacy, user=self.kari, visible_for_other_users=True)
+        G(Privacy, user=self.hidden, visible_for_other_users=False)
+
+    def test_every_word_is_matched_as_a_prefix(self):
+        results = typeahead.search_users("nord ol")
+
+        self.assertEqual([result["id"] for result in results], [self.ola.id])
+
+    def test_users_are_found_by_ntnu_username(self):
+        results = typeahead.search_plain_users("OLAN")
+
+        self.assertEqual(results, [{"id": self.ola.id, "value": "Ola Nordmann"}])
+
+    def test_users_are_found_by_nickname(self):
+        results = typeahead.search_users("kaffe")
+
+        self.assertEqual([result["id"] for result in results], [self.kari.id])
+
+    def test_hidden_users_are_only_found_by_plain_search(self):
+        visible = {result["id"] for result in typeahead.search_users("ola")}
+        plain = {result["id"] for result in typeahead.search_plain_users("ola")}
+
+        self.assertEqual(visible, {self.ola.id})
+        self.assertEqual(plain, {self.ola.id, self.hidden.id})
+
+    def test_results_are_limited_and_ordered_by_name(self):
+        results = typeahead.search_plain_users("nordmann", limit=1)
+
+        self.assertEqual(results, [{"id": self.kari.id, "value": "Kari Nordmann"}])
+
+    @override_settings(OW4_TYPEAHEAD_CACHE_PREFIX_LENGTH=2)
+    def test_short_prefixes_are_cached(self):
+        typeahead.search_plain_users("ka")
+        typeahead.search_plain_users("kar")
+
+        with self.assertNumQueries(0):
+            typeahead.search_plain_users("KA")
+        with self.assertNumQueries(1):
+            typeahead.search_plain_users("kar")
@@ -0,0 +1,90 @@
+"""
+Typeahead search for the user pickers, which send a request on every keystroke.
+
+Every word of the query has to be a prefix of the first name, last name, nickname,
+username or NTNU username of a user. The prefix lookups use the UPPER(...)
+text_pattern_ops indexes on those columns, and only the top results are fetched from
+the database. Short prefixes match many users and are asked for the most, so their
+results are cached for a short while.
+"""
+import hashlib
+from typing import Callable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from apps.authentication.models import OnlineUser as User
+
+TYPEAHEAD_FIELDS = ("first_name", "last_name", "nickname", "username", "ntnu_username")
+MAX_TERMS = 4
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split()[:MAX_TERMS])
+
+
+def _get_prefix_query(term: str) -> Q:
+    query = Q()
+    for field in TYPEAHEAD_FIELDS:
+        query |= Q(**{f"{field}__istartswith": term})
+    return query
+
+
+def find_users(queryset, query: str, limit: int):
+    """
+    The first users in the queryset matching every word of the query, ordered by name.
+    """
+    terms = normalize_query(query).split()
+    if not terms:
+        return queryset.none()
+    for term in terms:
+        queryset = queryset.filter(_get_prefix_query(term))
+    return queryset.order_by("first_name", "last_name", "pk")[:limit]
+
+
+def _get_cache_key(kind: str, query: str, limit: int) -> str:
+    digest = hashlib.md5(query.encode()).hexdigest()
+    return f"profiles:typeahead:{kind}:{limit}:{digest}"
+
+
+def _cached(kind: str, query: str, limit: int, get_results: Callable[[], List]):
+    query = normalize_query(query)
+    if len(query) > settings.OW4_TYPEAHEAD_CACHE_PREFIX_LENGTH:
+        return get_results()
+    return cache.get_or_set(
+        _get_cache_key(kind, query, limit),
+        get_results,
+        settings.OW4_TYPEAHEAD_CACHE_TIMEOUT,
+    )
+
+
+def search_users(query: str, limit: int = 10) -> List[dict]:
+    """
+    Users visible for other users, serialized for the user typeahead.
+    """
+
+    def get_results():
+        users = User.objects.filter(
+            privacy__visible_for_other_users=True
+        ).select_related("privacy")
+        return [user.serializable_object() for user in find_users(users, query, limit)]
+
+    return _cached("users", query, limit, get_results)
+
+
+def search_plain_users(query: str, limit: int = 10) -> List[dict]:
+    """
+    Active users, with only their id and name, for the plain user typeahead.
+    """
+
+    def get_results():
+        users = User.objects.filter(is_active=True).values_list(
+            "pk", "first_name", "last_name"
+        )
+        return [
+            {"id": pk, "value": f"{first_name} {last_name}".strip()}
+            for pk, first_name, last_name in find_users(users, query, limit)
+        ]
+
+    return _cached("plain_users", query, limit, get_results)
@@ -22,7 +22,6 @@ from django_filters.rest_framework import DjangoFilterBackend
 from googleapiclient.errors import HttpError
 from oauth2_provider.models import AccessToken
 from rest_framework import filters, mixins, permissions, response, viewsets
-from watson import search as watson
 
 from apps.approval.forms import FieldOfStudyApplicationForm
 from apps.approval.models import MembershipApproval
@@ -40,6 +39,7 @@ from apps.gsuite.accounts.main import (
 )
 from apps.marks.models import Mark, MarkRuleSet, Suspension
 from apps.payment.models import PaymentDelay, PaymentRelation, PaymentTransaction
+from apps.profiles import typeahead
 from apps.profiles.filters import PublicProfileFilter
 from apps.profiles.forms import (
     InternalServicesForm,
@@ -592,14 +592,7 @@ def search_for_users(query, limit=10):
     if not query:
         return []
 
-    results = []
-
-    for result in watson.search(
-        query, models=(User.objects.filter(privacy__visible_for_other_users=True),)
-    ):
-        results.append(result.object)
-
-    return results[:limit]
+    return typeahead.search_users(query, limit)
 
 
 @login_required
@@ -615,13 +608,7 @@ def search_for_plain_users(query, limit=10):
     if not query:
         return []
 
-    results = []
-
-    for result in watson.search(query, models=(User.objects.filter(is_active=True),)):
-        uobj = result.object
-        results.append({"id": uobj.id, "value": uobj.get_full_name()})
-
-    return results[:limit]
+    return typeahead.search_plain_users(query, limit)
 
 
 @login_required
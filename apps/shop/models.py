@@ -1,16 +1,19 @@
 # -*- coding: utf-8 -*-
 import uuid
+from collections import Counter
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.validators import MinValueValidator, ValidationError
 from django.db import models
+from django.db.transaction import atomic
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import NotAcceptable
 
 from apps.authentication.models import OnlineUser as User
 from apps.inventory.models import Item
-from apps.payment.models import PaymentTransaction
+from apps.inventory.utils import reduce_stock
+from apps.payment.models import PaymentTransaction, WalletBalance
 from apps.payment.transaction_constants import TransactionSource
 
 
@@ -66,43 +69,62 @@ class OrderLine(models.Model):
 
     def get_order_descriptions(self):
         descriptions = []
-        for order in self.orders.all():
+        for order in self.orders.prefetch_related("content_object"):
             item: Item = order.content_object
             descriptions.append(
                 {"name": item.name, "price": item.price, "quantity": order.quantity}
             )
         return descriptions
 
+    @atomic
     def pay(self):
-        if self.paid:
+        """
+        Pay for the orders from the wallet of the user in a single database transaction.
+        The wallet balance of the user is locked first, so concurrent purchases by the
+        same user are serialized and can't spend the same saldo twice. Nothing is
+        changed if the saldo is insufficient.
+        """
+        wallet_balance = WalletBalance.objects.lock(self.user_id)
+        if self.paid or OrderLine.objects.filter(pk=self.pk, paid=True).exists():
             return
 
-        subtotal = self.subtotal()
+        orders = list(self.orders.all())
+        quantities = Counter()
+        for order in orders:
+            quantities[order.object_id] += order.quantity
+        # Items are locked in the same order by every purchase, to avoid deadlocks
+        items = {
+            item.pk: item
+            for item in Item.objects.select_for_update()
+            .filter(pk__in=quantities)
+            .order_by("pk")
+        }
 
-        if subtotal > self.user.saldo:
-            self.delete()
+        # Setting price for orders in case product price changes later
+        for order in orders:
+            order.price = items[order.object_id].price * order.quantity
+        subtotal = sum(order.price for order in orders)
+
+        if subtotal > wallet_balance.balance:
             raise NotAcceptable("Insufficient funds")
 
-        # Setting price for orders in case product price changes later
-        for order in self.orders.all():
-            order.price = order.total_price()
-            order.save()
-            order.reduce_stock()
+        Order.objects.bulk_update(orders, ["price"])
+        reduce_stock({items[pk]: quantity for pk, quantity in quantities.items()})
 
         # Create the transaction for the user, which will track the actual balance of their wallet
-        transaction = PaymentTransaction.objects.create(
+        payment_transaction = PaymentTransaction.objects.create(
             source=TransactionSource.SHOP,
             amount=-subtotal,
             user=self.user,
             # Do not create receipt immediately, create after relation to order_line has been saved
             create_receipt=False,
         )
-        self.transaction = transaction
+        self.transaction = payment_transaction
         self.paid = True
         self.save()
 
-        transaction.create_receipt = True
-        transaction.save()
+        payment_transaction.create_receipt = True
+        payment_transaction.save()
 
     def clean(self):
         super().clean()
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from rest_framework import serializers
 
 from apps.authentication.models import OnlineUser as User
@@ -19,26 +21,34 @@ class OrderLineSerializer(serializers.ModelSerializer):
     orders = OrderSerializer(many=True)
 
     def validate_orders(self, orders: dict):
-        for order in orders:
-            item = Item.objects.get(pk=order.get("object_id"))
-            if not item.available:
-                raise serializers.ValidationError(
-                    "Enklte av de gitte produktene er ikke tilgjengelig"
-                )
+        item_ids = {order.get("object_id") for order in orders}
+        available_items = Item.objects.filter(pk__in=item_ids, available=True)
+        if available_items.count() != len(item_ids):
+            raise serializers.ValidationError(
+                "Enklte av de gitte produktene er ikke tilgjengelig"
+            )
 
         return orders
 
+    @transaction.atomic
     def create(self, validated_data):
         order_list = validated_data.pop("orders")
         order_line = OrderLine.objects.create(**validated_data)
-        while len(order_list) > 0:
-            order_data = order_list.pop()
-            order = Order(order_line=order_line, **order_data)
-            item = Item.objects.get(pk=order.object_id)
-            order.content_object = item
-            order.price = item.price
-            order.save()
+        items = Item.objects.in_bulk({order["object_id"] for order in order_list})
+        content_type = ContentType.objects.get_for_model(Item)
+        Order.objects.bulk_create(
+            [
+                Order(
+                    order_line=order_line,
+                    content_type=content_type,
+                    price=items[order["object_id"]].price,
+                    **order,
+                )
+                for order in order_list
+            ]
+        )
 
+        # The order line is rolled back along with the orders if the payment fails
         order_line.pay()
 
         return order_line
@@ -1,19 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 from django.core import mail
+from django.db import connection
+from django.test import TransactionTestCase, skipUnlessDBFeature
 from django.urls import reverse
 from django_dynamic_fixture import G
 from rest_framework import status
+from rest_framework.exceptions import NotAcceptable
 from rest_framework.test import APITestCase
 
 from apps.authentication.models import Email, OnlineUser
-from apps.inventory.models import Item
+from apps.inventory.models import Batch, Item
 from apps.notifications.constants import PermissionType
 from apps.notifications.models import Permission
 from apps.oauth2_provider.test import OAuth2TestCase
 from apps.payment.models import PaymentTransaction
 from apps.payment.transaction_constants import TransactionSource
-from apps.shop.models import MagicToken
+from apps.shop.models import MagicToken, OrderLine
+from apps.shop.serializers import OrderLineSerializer
 
 
 class ShopItemTestCase(APITestCase):
@@ -173,6 +178,72 @@ class ShopOrderLinesTestCase(OAuth2TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(len(mail.outbox), 2)
 
+    def test_purchase_reduces_stock_from_oldest_batches(self):
+        item: Item = G(Item, available=True, price=10)
+        oldest_batch = G(Batch, item=item, amount=2)
+        newest_batch = G(Batch, item=item, amount=5)
+        self._add_saldo_to_user(item.price * 3)
+
+        response = self._perform_purchase([{"object_id": item.id, "quantity": 3}])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        oldest_batch.refresh_from_db()
+        newest_batch.refresh_from_db()
+        self.assertEqual(oldest_batch.amount, 0)
+        self.assertEqual(newest_batch.amount, 4)
+
+    def test_failed_purchase_leaves_no_order_line(self):
+        item: Item = G(Item, available=True, price=100)
+        batch = G(Batch, item=item, amount=5)
+
+        response = self._perform_purchase([{"object_id": item.id, "quantity": 1}])
+
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertFalse(OrderLine.objects.filter(user=self.user).exists())
+        batch.refresh_from_db()
+        self.assertEqual(batch.amount, 5)
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ShopConcurrentPurchaseTestCase(TransactionTestCase):
+    def setUp(self):
+        self.user = G(OnlineUser)
+        G(Email, user=self.user, primary=True)
+        self.item = G(Item, available=True, price=100)
+        self.batch = G(Batch, item=self.item, amount=10)
+        G(
+            PaymentTransaction,
+            user=self.user,
+            amount=self.item.price,
+            source=TransactionSource.CASH,
+        )
+
+    def _purchase(self, _):
+        serializer = OrderLineSerializer(
+            data={
+                "user": self.user.id,
+                "orders": [{"object_id": self.item.id, "quantity": 1}],
+            }
+        )
+        try:
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            return True
+        except NotAcceptable:
+            return False
+        finally:
+            connection.close()
+
+    def test_concurrent_purchases_do_not_spend_the_same_saldo(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(self._purchase, range(4)))
+
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(self.user.saldo, 0)
+        self.assertEqual(OrderLine.objects.filter(user=self.user).count(), 1)
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.amount, 9)
+
 
 class ShopSetRFIDTestCase(OAuth2TestCase):
     scopes = ["shop.readwrite", "read", "write"]
@@ -0,0 +1,12 @@
+import pytest
+from django.db import connection
+
+from utils.search import add_search_vectors
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    # The test database is created without migrations, which add the search vectors
+    with django_db_blocker.unblock():
+        with connection.schema_editor() as schema_editor:
+            add_search_vectors(schema_editor)
@@ -34,6 +34,30 @@ OW4_SETTINGS = {
     }
 }
 
+# Seconds to share cached user facts like membership and saldo between requests.
+# Facts are always cached for the duration of a request, 0 disables sharing.
+OW4_USER_FACT_CACHE_TIMEOUT = config("OW4_USER_FACT_CACHE_TIMEOUT", cast=int, default=0)
+
+# Scheduled mommy tasks run on a local worker "pool" or are sent to "celery".
+# Tasks exceeding their timeout are stopped when running on celery, and only reported
+# on the pool.
+MOMMY_EXECUTOR = config("OW4_MOMMY_EXECUTOR", default="pool")
+MOMMY_WORKERS = config("OW4_MOMMY_WORKERS", cast=int, default=4)
+MOMMY_DEFAULT_TIMEOUT = config("OW4_MOMMY_DEFAULT_TIMEOUT", cast=int, default=30 * 60)
+
+# Full-text search backend, "postgres" for the tsvector columns, "watson" for
+# django-watson, or "auto" to use postgres when the database is PostgreSQL.
+OW4_SEARCH_BACKEND = config("OW4_SEARCH_BACKEND", default="auto")
+
+# User typeahead results for queries of at most this many characters are cached for
+# the timeout.
+OW4_TYPEAHEAD_CACHE_PREFIX_LENGTH = config(
+    "OW4_TYPEAHEAD_CACHE_PREFIX_LENGTH", cast=int, default=2
+)
+OW4_TYPEAHEAD_CACHE_TIMEOUT = config(
+    "OW4_TYPEAHEAD_CACHE_TIMEOUT", cast=int, default=60
+)
+
 # List of usergroups that should be listed under "Finn brukere" in user profile
 USER_SEARCH_GROUPS = [
     16,  # appkom
@@ -123,6 +147,11 @@ RECAPTCHA_USE_SSL = config("OW4_DJANGO_RECAPTCHA_USE_SSL", cast=bool, default=Tr
 # oidc_provider - OpenID Connect Provider
 OIDC_USERINFO = "apps.online_oidc_provider.claims.userinfo"
 OIDC_EXTRA_SCOPE_CLAIMS = "apps.online_oidc_provider.claims.Onlineweb4ScopeClaims"
+# Upper bound in seconds for caching verified API access tokens, 0 disables the cache.
+# Entries never outlive the token itself.
+OW4_OIDC_TOKEN_CACHE_TIMEOUT = config(
+    "OW4_OIDC_TOKEN_CACHE_TIMEOUT", cast=int, default=300
+)
 
 USE_X_FORWARDED_HOST = config("OW4_DJANGO_DEVELOPMENT_HTTPS", cast=bool, default=False)
 SECURE_PROXY_SSL_HEADER = (
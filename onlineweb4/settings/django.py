@@ -79,6 +79,13 @@ MEDIA_ROOT = config(
 )
 MEDIA_URL = "/media/"
 
+# Where exports of user data are stored. They are not public, and only served through
+# the API.
+USER_DATA_EXPORT_ROOT = config(
+    "OW4_DJANGO_USER_DATA_EXPORT_ROOT",
+    default=os.path.join(PROJECT_ROOT_DIRECTORY, "user_data_exports"),
+)
+
 # Define where static files are stored
 STATIC_ROOT = config(
     "OW4_DJANGO_STATIC_ROOT", default=os.path.join(PROJECT_ROOT_DIRECTORY, "static")
@@ -133,6 +140,7 @@ MIDDLEWARE = (
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.authentication.user_cache.UserFactCacheMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "middleware.http.Http403Middleware",
     "reversion.middleware.RevisionMiddleware",
@@ -34,6 +34,10 @@ OW4_GSUITE_SYNC = {
     "ENABLED": config("OW4_GSUITE_SYNC_ENABLED", cast=bool, default=False),
     "ENABLE_INSERT": config("OW4_GSUITE_SYNC_ENABLE_INSERT", cast=bool, default=False),
     "ENABLE_DELETE": config("OW4_GSUITE_SYNC_ENABLE_DELETE", cast=bool, default=False),
+    # Membership changes are sent in batches, with a few batches in flight at a time
+    "BATCH_SIZE": config("OW4_GSUITE_SYNC_BATCH_SIZE", cast=int, default=50),
+    "MAX_CONCURRENCY": config("OW4_GSUITE_SYNC_MAX_CONCURRENCY", cast=int, default=4),
+    "MAX_RETRIES": config("OW4_GSUITE_SYNC_MAX_RETRIES", cast=int, default=5),
     # OW4 name (lowercase) -> G Suite name (lowercase)
     "GROUPS": {
         "appkom": "appkom",
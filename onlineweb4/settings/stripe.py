@@ -26,3 +26,7 @@ STRIPE_PRIVATE_KEYS = {
         "OW4_DJANGO_STRIPE_PRIVATE_KEY_TRIKOM", default="pk_test_replace_this"
     ),
 }
+
+# Base url of the Stripe API, which can point to a local stand-in like
+# apps.payment.fake_stripe
+STRIPE_API_BASE = config("OW4_DJANGO_STRIPE_API_BASE", default="https://api.stripe.com")
@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from apps.api import benchmark
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure query count, wall time and response size of every API list endpoint "
+        "on a seeded dataset, and compare query counts and response sizes against the "
+        "baseline used by the tests. Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        for name, default in benchmark.REALISTIC_DATASET.items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}", dest=name, type=int, default=default
+            )
+        parser.add_argument(
+            "--test-dataset",
+            action="store_true",
+            help="use the small dataset of the test suite",
+        )
+        parser.add_argument(
+            "--write-baseline",
+            action="store_true",
+            help="save results on the test dataset as the baseline of the test suite",
+        )
+
+    def handle(self, *args, **options):
+        if options["test_dataset"] or options["write_baseline"]:
+            dataset = benchmark.TEST_DATASET
+        else:
+            dataset = {name: options[name] for name in benchmark.REALISTIC_DATASET}
+        # Allows requests with the test client, and keeps emails from being sent
+        setup_test_environment()
+        try:
+            with transaction.atomic():
+                results = self._run(dataset)
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            teardown_test_environment()
+
+        for name, metrics in sorted(results.items()):
+            self.stdout.write(
+                f"{name}: {metrics['status']}, {metrics['queries']} queries, "
+                f"{metrics['time'] * 1000:.1f} ms, {metrics['size']} bytes"
+            )
+
+        baseline = benchmark.load_baseline()
+        if options["write_baseline"]:
+            benchmark.write_baseline(dataset, results)
+            self.stdout.write(f"Wrote baseline to {benchmark.BASELINE_PATH}")
+        elif baseline is None:
+            self.stdout.write("Not compared, there is no baseline")
+        elif baseline["dataset"] != dataset:
+            self.stdout.write("Not compared, the baseline uses the test dataset")
+        else:
+            regressions = benchmark.compare_to_baseline(results, baseline["endpoints"])
+            for regression in regressions:
+                self.stderr.write(regression)
+            self.stdout.write(f"{len(regressions)} regressions from the baseline")
+
+    @staticmethod
+    def _run(dataset):
+        admin = benchmark.create_admin()
+        benchmark.seed_dataset(admin, **dataset)
+        client = Client()
+        client.force_login(admin)
+        return benchmark.run_benchmark(client)
@@ -0,0 +1,89 @@
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from watson import search as watson_search
+
+from apps.authentication.models import OnlineUser as User
+from utils.search import search
+
+NAMES = [
+    "Anders",
+    "Berit",
+    "Eirik",
+    "Hanne",
+    "Ingrid",
+    "Kari",
+    "Lars",
+    "Nora",
+    "Ola",
+    "Sindre",
+    "Tone",
+    "Vegard",
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure queries and time used by user search with each search backend. "
+        "Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--searches", type=int, default=50)
+
+    def handle(self, *args, **options):
+        prefix = f"search-benchmark-{uuid.uuid4().hex[:8]}"
+        backends = ["watson"]
+        if connection.vendor == "postgresql":
+            backends.append("postgres")
+
+        try:
+            with transaction.atomic():
+                self._create_users(prefix, options["users"])
+                queries = [
+                    f"{random.choice(NAMES)} {random.choice(NAMES)[:3]}"
+                    for _ in range(options["searches"])
+                ]
+                for backend in backends:
+                    self._run(backend, queries)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _create_users(self, prefix, count):
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f"{prefix}-{index}",
+                    first_name=random.choice(NAMES),
+                    last_name=random.choice(NAMES) + "sen",
+                )
+                for index in range(count)
+            ]
+        )
+        # bulk_create does not send the signals watson indexes objects with
+        engine = watson_search.default_search_engine
+        for user in User.objects.filter(username__startswith=prefix).iterator():
+            engine.update_obj_index(user)
+
+    def _run(self, backend, queries):
+        users = User.objects.filter(is_active=True)
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            for query in queries:
+                list(search(users, query, backend=backend)[:10])
+            duration = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{backend}: {len(queries)} searches, {len(captured)} queries "
+            f"in {duration:.2f} s ({duration / len(queries) * 1000:.1f} ms per search)"
+        )
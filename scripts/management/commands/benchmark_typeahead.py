@@ -0,0 +1,94 @@
+import random
+import statistics
+import string
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from apps.authentication.models import OnlineUser as User
+from apps.profiles import typeahead
+from apps.profiles.models import Privacy
+from utils.search import search
+
+SYLLABLES = ["an", "be", "da", "el", "ha", "in", "ka", "li", "mo", "no", "ra", "si"]
+
+
+class Rollback(Exception):
+    pass
+
+
+def _random_name():
+    return "".join(random.choice(SYLLABLES) for _ in range(3)).capitalize()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency of the user typeahead for prefixes of increasing length, "
+        "compared to full-text search. Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20000)
+        parser.add_argument("--searches", type=int, default=200)
+
+    def handle(self, *args, **options):
+        prefix = f"typeahead-benchmark-{uuid.uuid4().hex[:8]}"
+
+        try:
+            with transaction.atomic():
+                self._create_users(prefix, options["users"])
+                # Keystrokes typing a name, from one to five characters
+                names = [_random_name() for _ in range(options["searches"])]
+                for length in range(1, 6):
+                    queries = [name[:length] for name in names]
+                    with override_settings(OW4_TYPEAHEAD_CACHE_PREFIX_LENGTH=0):
+                        self._run(f"typeahead, {length} characters, uncached", queries)
+                    self._run(f"typeahead, {length} characters", queries)
+                self._run("full-text search", names, search_function=self._search)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _create_users(self, prefix, count):
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f"{prefix}-{index}",
+                    email=f"{prefix}-{index}@example.com",
+                    first_name=_random_name(),
+                    last_name=_random_name(),
+                    ntnu_username="".join(random.sample(string.ascii_lowercase, 6)),
+                )
+                for index in range(count)
+            ]
+        )
+        # bulk_create does not send the signal creating privacy settings
+        Privacy.objects.bulk_create(
+            [
+                Privacy(user=user)
+                for user in User.objects.filter(username__startswith=prefix)
+            ]
+        )
+
+    @staticmethod
+    def _search(query):
+        users = User.objects.filter(privacy__visible_for_other_users=True)
+        return [user.serializable_object() for user in search(users, query)[:10]]
+
+    def _run(self, name, queries, search_function=None):
+        search_function = search_function or typeahead.search_users
+        durations = []
+        for query in queries:
+            start = time.perf_counter()
+            search_function(query)
+            durations.append((time.perf_counter() - start) * 1000)
+
+        durations.sort()
+        p95 = durations[int(len(durations) * 0.95) - 1]
+        self.stdout.write(
+            f"{name}: median {statistics.median(durations):.1f} ms, "
+            f"p95 {p95:.1f} ms over {len(queries)} searches"
+        )
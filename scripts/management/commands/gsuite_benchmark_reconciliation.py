@@ -0,0 +1,75 @@
+import time
+
+import httplib2
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.test import override_settings
+
+from apps.gsuite.mail_syncer.fake_directory import FakeDirectory, FakeDirectoryServer
+from apps.gsuite.mail_syncer.reconciliation import GroupReconciler
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark G Suite group reconciliation against a local fake Directory API, "
+        "comparing one call per change with batched and concurrent requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--members", type=int, default=5000)
+        parser.add_argument("--changes", type=int, default=500)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.02,
+            help="Seconds the fake API spends on every call",
+        )
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--concurrency", type=int, default=4)
+
+    def handle(self, *args, **options):
+        sync_settings = settings.OW4_GSUITE_SYNC.copy()
+        sync_settings.update({"ENABLE_INSERT": True, "ENABLE_DELETE": True})
+
+        with override_settings(OW4_GSUITE_SYNC=sync_settings):
+            for name, batch_size, concurrency in (
+                ("One call per change", 1, 1),
+                ("Batched", options["batch_size"], 1),
+                (
+                    "Batched and concurrent",
+                    options["batch_size"],
+                    options["concurrency"],
+                ),
+            ):
+                self._run(name, batch_size, concurrency, options)
+
+    def _run(self, name, batch_size, concurrency, options):
+        domain = settings.OW4_GSUITE_SYNC.get("DOMAIN")
+        group_key = f"benchmark@{domain}"
+        members = [f"user{index}@{domain}" for index in range(options["members"])]
+        # Half of the changes are removals, the other half insertions
+        removals = options["changes"] // 2
+        desired = members[removals:] + [
+            f"new{index}@{domain}" for index in range(options["changes"] - removals)
+        ]
+
+        directory = FakeDirectory(latency=options["latency"])
+        directory.add_group(group_key, members)
+
+        with FakeDirectoryServer(directory) as server:
+            reconciler = GroupReconciler(
+                domain,
+                directory=server.build_client(),
+                http_factory=httplib2.Http,
+                batch_size=batch_size,
+                max_concurrency=concurrency,
+            )
+            start = time.perf_counter()
+            result = reconciler.reconcile_group(group_key, desired)
+            duration = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{name}: {duration:.2f} s, {directory.request_count} HTTP requests, "
+            f"{len(result.inserted)} inserted, {len(result.removed)} removed, "
+            f"{len(result.failed)} failed"
+        )
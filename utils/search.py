@@ -0,0 +1,227 @@
+"""
+Full-text search over models, with a choice of backend.
+
+The postgres backend searches tsvector columns generated from the searched fields,
+which are added to the tables of registered models by AddSearchVector migrations.
+The columns are GIN indexed, and results are ranked with ts_rank. Models without a
+search vector and databases other than PostgreSQL fall back to the watson backend,
+which uses the search index of django-watson.
+
+The backend is chosen with the OW4_SEARCH_BACKEND setting, either "postgres",
+"watson" or "auto", which uses postgres when the database is PostgreSQL.
+"""
+import re
+from types import SimpleNamespace
+
+import django_filters
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import NotSupportedError, connection
+from django.db.migrations.operations.base import Operation
+from django.db.models import F
+from django.db.models.expressions import Expression
+from watson import search as watson_search
+
+SEARCH_VECTOR_COLUMN = "search_vector"
+# Generated columns were added in PostgreSQL 12
+MIN_POSTGRES_VERSION = 120000
+
+_search_vectors = {}
+
+
+def register(model, fields, config="simple"):
+    """
+    Register a model as having a search vector built from the given fields with the
+    given text search configuration. The fields and the configuration have to match
+    the ones used in the AddSearchVector migration of the model.
+    """
+    _search_vectors[model] = (fields, config)
+
+
+def is_registered(model) -> bool:
+    return model in _search_vectors
+
+
+def add_search_vectors(schema_editor):
+    """
+    Add the search vectors of all registered models to a database created from the
+    models instead of the migrations, like the test database.
+    """
+    state = SimpleNamespace(apps=apps)
+    for model, (fields, config) in _search_vectors.items():
+        operation = AddSearchVector(model._meta.model_name, fields, config)
+        operation._add(model._meta.app_label, schema_editor, state)
+
+
+class SearchVectorColumn(Expression):
+    """
+    The generated search vector column of the model being queried. It is not a model
+    field, so it is resolved against the alias of the base table of the query.
+    """
+
+    def __init__(self):
+        super().__init__(output_field=SearchVectorField())
+
+    def as_sql(self, compiler, connection):
+        alias = compiler.query.get_initial_alias()
+        column = connection.ops.quote_name(SEARCH_VECTOR_COLUMN)
+        return f"{compiler.quote_name_unless_alias(alias)}.{column}", []
+
+
+class WatsonSearchBackend:
+    name = "watson"
+
+    def search(self, queryset, text: str):
+        return watson_search.filter(queryset, text)
+
+
+class PostgresSearchBackend:
+    name = "postgres"
+
+    @staticmethod
+    def _to_tsquery(text: str) -> str:
+        # Every word has to match, and words are matched as prefixes like in watson
+        return " & ".join(f"{term}:*" for term in re.findall(r"\w+", text))
+
+    def search(self, queryset, text: str):
+        model = queryset.model
+        if not is_registered(model):
+            return WatsonSearchBackend().search(queryset, text)
+
+        tsquery = self._to_tsquery(text)
+        if not tsquery:
+            return queryset.none()
+
+        _fields, config = _search_vectors[model]
+        query = SearchQuery(tsquery, config=config, search_type="raw")
+        return (
+            queryset.annotate(search_document=SearchVectorColumn())
+            .filter(search_document=query)
+            .annotate(search_rank=SearchRank(F("search_document"), query))
+            .order_by("-search_rank")
+        )
+
+
+BACKENDS = {
+    WatsonSearchBackend.name: WatsonSearchBackend,
+    PostgresSearchBackend.name: PostgresSearchBackend,
+}
+
+
+def get_backend(name: str = None):
+    name = name or getattr(settings, "OW4_SEARCH_BACKEND", "auto")
+    if name == "auto":
+        name = "postgres" if connection.vendor == "postgresql" else "watson"
+    return BACKENDS[name]()
+
+
+def search(queryset, text: str, backend: str = None):
+    """
+    Filter a queryset to the objects matching the search text, ordered by relevance.
+    """
+    return get_backend(backend).search(queryset, text)
+
+
+class SearchFilter(django_filters.CharFilter):
+    def filter(self, queryset, value):
+        if value:
+            queryset = search(queryset, value)
+        return queryset
+
+
+class AddSearchVector(Operation):
+    """
+    Add a tsvector column generated from text fields of a model, with a GIN index, to
+    the table of the model. `fields` is a list of (field name, weight) tuples, where
+    the weight is one of "A", "B", "C" or "D".
+
+    Generated columns require PostgreSQL 12, and NotSupportedError is raised on older
+    versions. Nothing is done on other databases.
+    PostgreSQL does not allow changing the type of a column used by a generated
+    column, so a search vector has to be removed with RemoveSearchVector before
+    altering the type of one of its fields, and added again afterwards.
+    """
+
+    reversible = True
+
+    def __init__(self, model_name, fields, config="simple"):
+        self.model_name = model_name
+        self.fields = fields
+        self.config = config
+
+    def deconstruct(self):
+        kwargs = {
+            "model_name": self.model_name,
+            "fields": self.fields,
+            "config": self.config,
+        }
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        # The column is not a model field, so the model state is unchanged
+        pass
+
+    def _add(self, app_label, schema_editor, state):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        if schema_editor.connection.pg_version < MIN_POSTGRES_VERSION:
+            raise NotSupportedError(
+                f"Adding a search vector to {self.model_name} requires generated "
+                "columns, which are only available in PostgreSQL 12 or newer. "
+                "The database is running PostgreSQL "
+                f"{schema_editor.connection.pg_version}."
+            )
+        quote_name = schema_editor.quote_name
+        model = state.apps.get_model(app_label, self.model_name)
+        table = model._meta.db_table
+        weighted_fields = " || ".join(
+            f"setweight(to_tsvector('{self.config}'::regconfig, "
+            f"coalesce({quote_name(model._meta.get_field(name).column)}, '')), "
+            f"'{weight}')"
+            for name, weight in self.fields
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {quote_name(table)} "
+            f"ADD COLUMN {quote_name(SEARCH_VECTOR_COLUMN)} "
+            f"tsvector GENERATED ALWAYS AS ({weighted_fields}) STORED"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {quote_name(f'{table}_{SEARCH_VECTOR_COLUMN}')} "
+            f"ON {quote_name(table)} USING GIN ({quote_name(SEARCH_VECTOR_COLUMN)})"
+        )
+
+    def _remove(self, app_label, schema_editor, state):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        quote_name = schema_editor.quote_name
+        table = state.apps.get_model(app_label, self.model_name)._meta.db_table
+        # The index is dropped together with the column
+        schema_editor.execute(
+            f"ALTER TABLE {quote_name(table)} "
+            f"DROP COLUMN {quote_name(SEARCH_VECTOR_COLUMN)}"
+        )
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._add(app_label, schema_editor, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._remove(app_label, schema_editor, from_state)
+
+    def describe(self):
+        return f"Add search vector to {self.model_name}"
+
+
+class RemoveSearchVector(AddSearchVector):
+    """
+    Remove a search vector added with AddSearchVector.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._remove(app_label, schema_editor, from_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._add(app_label, schema_editor, to_state)
+
+    def describe(self):
+        return f"Remove search vector from {self.model_name}"